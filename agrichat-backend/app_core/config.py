@@ -26,6 +26,24 @@ else:
 
 MONGO_URI = os.getenv("MONGO_URI")
 
+# Session store connection pool per worker and the time budget of every single Mongo operation.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_OP_TIMEOUT_MS = int(os.getenv("MONGO_OP_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+
+# How long the stream endpoint keeps the connection open for late clarification suggestions.
+CLARIFICATION_STREAM_TIMEOUT = float(os.getenv("CLARIFICATION_STREAM_TIMEOUT", "8"))
+
+# Follow-up questions see the last CONVERSATION_HISTORY_TURNS exchanges of their session, read from Mongo
+# and kept in a per-worker LRU of CONVERSATION_CACHE_SIZE sessions for CONVERSATION_CACHE_TTL seconds.
+CONVERSATION_HISTORY_TURNS = int(os.getenv("CONVERSATION_HISTORY_TURNS", "8"))
+CONVERSATION_CACHE_SIZE = int(os.getenv("CONVERSATION_CACHE_SIZE", "2048"))
+CONVERSATION_CACHE_TTL = float(os.getenv("CONVERSATION_CACHE_TTL", "1800"))
+
+# Identical concurrent questions (same state, settings and history) share one pipeline run per worker.
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT", "true").strip().lower() in {"1", "true", "yes"}
+
 
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", 
     "https://agri-annam.vercel.app,https://agrichat.annam.ai,https://8f724032057e.ngrok-free.app,https://localhost:3000,https://127.0.0.1:3000,http://localhost:3000,http://127.0.0.1:3000,*"
@@ -1,82 +1,19 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import os
 import re
 from typing import Any, Dict, List, Optional
 
-from langchain.memory import ConversationBufferWindowMemory
-
-from pipeline.llm_adapter import run_local_llm
+from pipeline.llm_adapter import arun_llm
 
 from .config import IST
-from .utils import conversation_memory_for_session, format_iso
+from .utils import format_iso
 
 logger = logging.getLogger("agrichat.app.context")
 
 
-def format_conversation_context(memory: ConversationBufferWindowMemory) -> str:
-    if not memory.chat_memory.messages:
-        return "This is the start of the conversation."
-
-    context_parts = []
-    messages = memory.chat_memory.messages[-10:]
-
-    for i in range(0, len(messages), 2):
-        if i + 1 < len(messages):
-            human_msg = messages[i]
-            ai_msg = messages[i + 1]
-
-            human_content = human_msg.content
-            ai_content = ai_msg.content[:300] + "..." if len(ai_msg.content) > 300 else ai_msg.content
-
-            context_parts.append(f"Previous Q: {human_content}")
-            context_parts.append(f"Previous A: {ai_content}")
-
-    all_content = " ".join([msg.content for msg in messages])
-    topics = extract_topics_from_context(all_content)
-
-    if topics:
-        context_parts.append(f"Main topics discussed: {', '.join(topics[:3])}")
-
-    return "\n".join(context_parts)
-
-
-def convert_langchain_memory_to_history(memory: ConversationBufferWindowMemory) -> List[Dict[str, str]]:
-    try:
-        if not memory or not memory.chat_memory or not memory.chat_memory.messages:
-            return []
-
-        conversation_history = []
-        messages = memory.chat_memory.messages
-
-        for i in range(0, len(messages), 2):
-            if i + 1 < len(messages):
-                human_msg = messages[i]
-                ai_msg = messages[i + 1]
-
-                if (
-                    hasattr(human_msg, "content")
-                    and hasattr(ai_msg, "content")
-                    and human_msg.content
-                    and ai_msg.content
-                ):
-                    conversation_history.append(
-                        {
-                            "question": str(human_msg.content),
-                            "answer": str(ai_msg.content),
-                        }
-                    )
-
-        return conversation_history
-
-    except Exception as exc:  # pragma: no cover
-        logger.error("[LANGCHAIN] Error converting memory to history: %s", exc)
-        return []
-
-
 async def enhance_answer_with_context_questions(
     question: str,
     answer: str,
@@ -331,17 +268,12 @@ Thinking steps: {_truncate_for_prompt(thinking, 400) or 'None'}
 User state: {user_state or 'Unknown'}
 """
 
-    loop = asyncio.get_event_loop()
-
-    def _call_llm() -> str:
-        return run_local_llm(
-            prompt,
-            temperature=0.2,
-            max_tokens=400,
-            model=os.getenv("OLLAMA_MODEL_REASONER", "qwen3:1.7b"),
-        )
-
-    raw_response = await loop.run_in_executor(None, _call_llm)
+    raw_response = await arun_llm(
+        prompt,
+        temperature=0.2,
+        max_tokens=400,
+        model=os.getenv("OLLAMA_MODEL_REASONER", "qwen3:1.7b"),
+    )
     parsed = _parse_llm_json_response(raw_response)
 
     if not isinstance(parsed, dict):
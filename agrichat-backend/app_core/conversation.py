@@ -0,0 +1,123 @@
+"""Conversation history for follow-up questions.
+
+History is rebuilt from the last ``CONVERSATION_HISTORY_TURNS`` messages
+persisted with the session, so a follow-up sees the same turns whichever
+worker it lands on. Rebuilt histories are kept in a small per-worker LRU keyed
+by session id and validated against the session's ``timestamp``, which every
+new message bumps: a reply written by another worker makes the cached entry
+stale and the next follow-up reads Mongo again.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from .config import CONVERSATION_CACHE_SIZE, CONVERSATION_CACHE_TTL, CONVERSATION_HISTORY_TURNS
+from .db import session_store
+
+logger = logging.getLogger("agrichat.app.conversation")
+
+History = List[Dict[str, str]]
+
+
+def history_from_messages(messages: Iterable[Dict[str, Any]]) -> History:
+    """``question``/``answer`` pairs of persisted messages, answers as markdown."""
+
+    history: History = []
+    for message in messages:
+        question = message.get("question")
+        answer = message.get("answer_markdown")
+        if not answer and message.get("answer"):
+            # Messages stored before answer_markdown was persisted only carry the rendered HTML.
+            answer = BeautifulSoup(message["answer"], "html.parser").get_text(separator=" ").strip()
+        if question and answer:
+            history.append({"question": str(question), "answer": str(answer)})
+    return history
+
+
+class ConversationHistoryCache:
+    """Size- and TTL-bounded LRU of recent histories, one entry per session."""
+
+    def __init__(self, turns: int, max_entries: int, ttl_seconds: float):
+        self.turns = max(0, turns)
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float, History]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    def get(self, session_id: str, version: Optional[str]) -> Optional[History]:
+        entry = self._entries.get(session_id)
+        if entry is None or version is None:
+            self._stats["misses"] += 1
+            return None
+        cached_version, created, history = entry
+        if cached_version != version or time.monotonic() - created > self.ttl_seconds:
+            del self._entries[session_id]
+            self._stats["stale"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(session_id)
+        self._stats["hits"] += 1
+        return list(history)
+
+    def put(self, session_id: str, version: Optional[str], history: History) -> None:
+        if version is None or not self.max_entries:
+            return
+        self._entries[session_id] = (version, time.monotonic(), history[-self.turns :] if self.turns else [])
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = dict(self._stats)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        snapshot["entries"] = len(self._entries)
+        snapshot["max_entries"] = self.max_entries
+        snapshot["ttl_seconds"] = self.ttl_seconds
+        snapshot["turns"] = self.turns
+        return snapshot
+
+
+conversation_histories = ConversationHistoryCache(
+    CONVERSATION_HISTORY_TURNS, CONVERSATION_CACHE_SIZE, CONVERSATION_CACHE_TTL
+)
+
+
+async def load_conversation_history(session: Dict[str, Any]) -> History:
+    """Recent turns of ``session`` (a document fetched without its messages)."""
+
+    session_id = session["session_id"]
+    version = session.get("timestamp")
+    history = conversation_histories.get(session_id, version)
+    if history is not None:
+        return history
+    if not conversation_histories.turns:
+        return []
+
+    document = await session_store.collection.find_one(
+        {"session_id": session_id},
+        {"_id": 0, "messages": {"$slice": -conversation_histories.turns}},
+    )
+    history = history_from_messages((document or {}).get("messages") or [])
+    conversation_histories.put(session_id, version, history)
+    return history
+
+
+def remember_session(session: Dict[str, Any]) -> None:
+    """Cache the recent turns of a full session document that was just written or re-read."""
+
+    turns = conversation_histories.turns
+    messages = session.get("messages") or []
+    history = history_from_messages(messages[-turns:] if turns else [])
+    conversation_histories.put(session["session_id"], session.get("timestamp"), history)
+
+
+def conversation_cache_stats() -> Dict[str, Any]:
+    return conversation_histories.stats()
@@ -1,69 +1,111 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import os
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi.responses import JSONResponse
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
 
-from .config import MONGO_URI
+from .config import (
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_OP_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_URI,
+)
 
 logger = logging.getLogger("agrichat.app.db")
 
+# Sidebar listings only need these fields; the title falls back to the first question for older sessions.
+SESSION_SUMMARY_PROJECTION: Dict[str, Any] = {
+    "_id": 0,
+    "session_id": 1,
+    "created_at": 1,
+    "timestamp": 1,
+    "status": 1,
+    "has_unread": 1,
+    "title": {"$ifNull": ["$title", {"$arrayElemAt": ["$messages.question", 0]}]},
+}
+
 
 class SessionStore:
-    def __init__(self) -> None:
-        self._client: Optional[MongoClient] = None
-        self._collection = None
-        self._connect()
+    """Async access to the ``agrichat.sessions`` collection.
+
+    Handlers await the collection's methods, so a slow Mongo suspends only the
+    request waiting on it instead of the worker's event loop. Every operation
+    is bounded by ``MONGO_OP_TIMEOUT_MS`` and raises once it is exceeded.
+    Clients are bound to the event loop that created them, so one pooled
+    client is kept per loop and process.
+    """
 
-    def _connect(self) -> None:
+    def __init__(self) -> None:
+        self._clients: Dict[Tuple[int, int], AsyncMongoClient] = {}
         if not MONGO_URI:
             logger.warning("[Mongo] MONGO_URI not configured; session storage disabled")
-            return
-        try:
-            self._client = MongoClient(MONGO_URI)
-            db = self._client.get_database("agrichat")
-            self._collection = db["sessions"]
-            logger.info("[Mongo] Session store connected")
-        except Exception as exc:  # pragma: no cover - defensive logging
-            logger.error("[Mongo] Failed to initialize session client: %s", exc)
-            self._client = None
-            self._collection = None
+
+    def _client(self) -> AsyncMongoClient:
+        key = (os.getpid(), id(asyncio.get_running_loop()))
+        client = self._clients.get(key)
+        if client is None:
+            client = AsyncMongoClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                timeoutMS=MONGO_OP_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            )
+            self._clients[key] = client
+        return client
 
     @property
-    def collection(self):  # type: ignore[override]
-        return self._collection
+    def collection(self) -> AsyncCollection:
+        return self._client().get_database("agrichat")["sessions"]
 
     def available(self) -> bool:
-        return self._collection is not None
+        return bool(MONGO_URI)
 
-    def ensure_indexes(self) -> None:
+    async def ensure_indexes(self) -> None:
         if not self.available():
             logger.warning("[Mongo] Skipping index creation: session collection unavailable")
             return
         try:
-            self._collection.create_index([("state", 1)])
-            self._collection.create_index([("state", 1), ("messages.question", 1)])
-            self._collection.create_index([("timestamp", -1)])
+            await self.collection.create_index([("state", 1)])
+            await self.collection.create_index([("state", 1), ("messages.question", 1)])
+            await self.collection.create_index([("timestamp", -1)])
+            await self.collection.create_index([("device_id", 1), ("created_at", -1), ("session_id", -1)])
+            await self.collection.create_index([("session_id", 1)])
             logger.info("[Mongo] Session indexes ensured")
+            # Session listings page on the immutable created_at; older sessions start from their last timestamp.
+            backfill = await self.collection.update_many(
+                {"created_at": {"$exists": False}},
+                [{"$set": {"created_at": "$timestamp"}}],
+            )
+            if backfill.modified_count:
+                logger.info("[Mongo] Backfilled created_at on %d sessions", backfill.modified_count)
         except Exception as exc:  # pragma: no cover
             logger.error("[Mongo] Failed to create indexes: %s", exc)
 
-    def health(self) -> Dict[str, Any]:
-        if self._client is None:
+    async def health(self) -> Dict[str, Any]:
+        if not self.available():
             return {"status": "down", "detail": "Mongo client not initialized"}
         try:
-            self._client.admin.command("ping")
-            status = "ok" if self.available() else "warn"
-            detail = "sessions collection missing" if status == "warn" else "connected"
-            return {"status": status, "detail": detail}
+            await self._client().admin.command("ping")
+            return {"status": "ok", "detail": "connected", "max_pool_size": MONGO_MAX_POOL_SIZE}
         except Exception as exc:  # pragma: no cover
             return {"status": "down", "detail": str(exc)}
 
+    async def aclose(self) -> None:
+        pid = os.getpid()
+        for key, client in list(self._clients.items()):
+            if key[0] == pid:
+                await client.close()
+            self._clients.pop(key, None)
+
 
 session_store = SessionStore()
-session_store.ensure_indexes()
 
 
 def sessions_db_available() -> bool:
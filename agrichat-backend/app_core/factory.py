@@ -3,11 +3,15 @@ from __future__ import annotations
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from pymongo.errors import PyMongoError
+
+from pipeline.ollama_async import async_ollama_transport
 
 from .auth import router as auth_router
 from .config import CORS_ORIGINS
+from .db import database_unavailable_response, session_store
 from .routes import chat as chat_routes
 from .routes import system as system_routes
 
@@ -16,9 +20,18 @@ logger = logging.getLogger("agrichat.app.factory")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await session_store.ensure_indexes()
     logger.info("[Startup] App initialized.")
     yield
     logger.info("[Shutdown] App shutting down...")
+    await async_ollama_transport.aclose()
+    await session_store.aclose()
+
+
+async def mongo_error_handler(request: Request, exc: PyMongoError):
+    # Mongo operations time out after MONGO_OP_TIMEOUT_MS; report that like an unavailable store.
+    logger.error("[Mongo] %s %s failed: %s", request.method, request.url.path, exc)
+    return database_unavailable_response()
 
 
 def create_app() -> FastAPI:
@@ -33,6 +46,8 @@ def create_app() -> FastAPI:
         expose_headers=["*"],
     )
 
+    app.add_exception_handler(PyMongoError, mongo_error_handler)
+
     app.include_router(system_routes.router)
     app.include_router(chat_routes.router)
     app.include_router(auth_router)
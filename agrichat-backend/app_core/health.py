@@ -2,16 +2,21 @@ import logging
 import os
 from typing import Any, Dict
 
-import requests
+from pipeline import answer_cache_stats, intent_classifier_stats, llm_generation_stats, llm_scheduler_stats
+from pipeline.llm_adapter import embedding_batcher_stats, embedding_cache_stats
+from pipeline.ollama_async import async_transport_stats
+from pipeline.ollama_transport import ollama_base_url, ollama_transport, ollama_transport_stats
 
 from .config import CHROMA_DB_PATH
+from .conversation import conversation_cache_stats
 from .db import session_store
+from .pipeline_service import single_flight_stats
 
 logger = logging.getLogger("agrichat.app.health")
 
 
-def check_mongo_health() -> Dict[str, Any]:
-    return session_store.health()
+async def check_mongo_health() -> Dict[str, Any]:
+    return await session_store.health()
 
 
 def check_chroma_health() -> Dict[str, Any]:
@@ -22,16 +27,41 @@ def check_chroma_health() -> Dict[str, Any]:
 
 
 def check_ollama_health() -> Dict[str, Any]:
-    host = os.getenv("OLLAMA_HOST", "localhost:11434")
-    if host.startswith("http://") or host.startswith("https://"):
-        base_url = host
-    else:
-        base_url = f"http://{host}"
-    url = f"{base_url}/api/tags"
+    base_url = ollama_base_url()
+    transport = {**ollama_transport_stats(), "async": async_transport_stats(), "generation": llm_generation_stats()}
     try:
-        response = requests.get(url, timeout=2)
+        # Probes must answer quickly, so they never wait on the retry backoff.
+        response = ollama_transport.get("/api/tags", profile="health", retries=0)
         if response.status_code == 200:
-            return {"status": "ok", "detail": "reachable", "endpoint": base_url}
-        return {"status": "warn", "detail": f"status {response.status_code}", "endpoint": base_url}
+            return {"status": "ok", "detail": "reachable", "endpoint": base_url, "transport": transport}
+        return {"status": "warn", "detail": f"status {response.status_code}", "endpoint": base_url, "transport": transport}
     except Exception as exc:  # pragma: no cover
-        return {"status": "down", "detail": str(exc), "endpoint": base_url}
+        return {"status": "down", "detail": str(exc), "endpoint": base_url, "transport": transport}
+
+
+def check_embedding_cache() -> Dict[str, Any]:
+    stats = embedding_cache_stats()
+    detail = "disk + memory" if stats.get("disk_enabled") else "memory only"
+    return {"status": "ok", "detail": detail, **stats, "micro_batching": embedding_batcher_stats()}
+
+
+def check_intent_classifier() -> Dict[str, Any]:
+    return {"status": "ok", "detail": "cache, dictionary, local model, llm", **intent_classifier_stats()}
+
+
+def check_answer_cache() -> Dict[str, Any]:
+    return {"status": "ok", "detail": "per worker", **answer_cache_stats()}
+
+
+def check_conversation_cache() -> Dict[str, Any]:
+    return {"status": "ok", "detail": "per worker, rebuilt from Mongo", **conversation_cache_stats()}
+
+
+def check_single_flight() -> Dict[str, Any]:
+    return {"status": "ok", "detail": "per worker", **single_flight_stats()}
+
+
+def check_llm_scheduler() -> Dict[str, Any]:
+    stats = llm_scheduler_stats()
+    status = "warn" if stats["waiting"] >= stats["max_queue"] else "ok"
+    return {"status": status, "detail": "answer > intent > clarification", **stats}
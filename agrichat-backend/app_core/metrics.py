@@ -0,0 +1,165 @@
+"""OpenMetrics exposition for ``GET /metrics``.
+
+Stage latency histograms come from :mod:`pipeline.tracing`; the counters and
+gauges below are read from the same per-worker stats that ``/health`` reports.
+Every gunicorn worker keeps its own numbers, so a scrape describes the worker
+that happened to answer it.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pipeline import answer_cache_stats, intent_classifier_stats, llm_generation_stats, llm_scheduler_stats
+from pipeline.llm_adapter import embedding_batcher_stats, embedding_cache_stats
+from pipeline.ollama_async import async_transport_stats
+from pipeline.ollama_transport import ollama_transport_stats
+from pipeline.tracing import OPENMETRICS_CONTENT_TYPE, MetricFamily, render_openmetrics
+
+from .conversation import conversation_cache_stats
+from .pipeline_service import single_flight_stats
+
+
+def _number(stats: Dict[str, Any], key: str) -> Optional[float]:
+    value = stats.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _transport_families() -> List[MetricFamily]:
+    clients = {"sync": ollama_transport_stats(), "async": async_transport_stats()}
+    requests = MetricFamily("agrichat_ollama_requests", "counter", "HTTP requests sent to Ollama.")
+    retries = MetricFamily("agrichat_ollama_retries", "counter", "Ollama requests retried after a connection error.")
+    errors = MetricFamily("agrichat_ollama_connection_errors", "counter", "Connection-level failures talking to Ollama.")
+    in_flight = MetricFamily("agrichat_ollama_in_flight", "gauge", "Ollama requests currently open.")
+    for client, stats in clients.items():
+        requests.add(_number(stats, "requests"), client=client)
+        retries.add(_number(stats, "retries"), client=client)
+        errors.add(_number(stats, "connection_errors"), client=client)
+        in_flight.add(_number(stats, "in_flight"), client=client)
+    return [requests, retries, errors, in_flight]
+
+
+def _embedding_families() -> List[MetricFamily]:
+    cache = embedding_cache_stats()
+    lookups = MetricFamily("agrichat_embedding_cache_lookups", "counter", "Embedding cache lookups by result.")
+    lookups.add(_number(cache, "memory_hits"), result="memory_hit")
+    lookups.add(_number(cache, "disk_hits"), result="disk_hit")
+    lookups.add(_number(cache, "misses"), result="miss")
+    families = [
+        lookups,
+        MetricFamily("agrichat_embedding_cache_entries", "gauge", "Embeddings held in memory.").add(
+            _number(cache, "memory_entries")
+        ),
+    ]
+    batcher = embedding_batcher_stats()
+    if batcher is not None:
+        families.append(
+            MetricFamily("agrichat_embedding_batches", "counter", "Micro-batched embedding calls sent to Ollama.").add(
+                _number(batcher, "batches")
+            )
+        )
+    return families
+
+
+def _intent_families() -> List[MetricFamily]:
+    stats = intent_classifier_stats()
+    decisions = MetricFamily("agrichat_intent_decisions", "counter", "Intent verdicts by the tier that decided them.")
+    for tier, count in stats["tiers"].items():
+        decisions.add(count, tier=tier)
+    return [decisions]
+
+
+def _answer_cache_families() -> List[MetricFamily]:
+    stats = answer_cache_stats()
+    lookups = MetricFamily("agrichat_answer_cache_lookups", "counter", "Semantic answer cache lookups by result.")
+    lookups.add(_number(stats, "hits"), result="hit")
+    lookups.add(_number(stats, "misses"), result="miss")
+    return [
+        lookups,
+        MetricFamily("agrichat_answer_cache_entries", "gauge", "Answers held in the semantic cache.").add(
+            _number(stats, "entries")
+        ),
+    ]
+
+
+def _conversation_families() -> List[MetricFamily]:
+    stats = conversation_cache_stats()
+    lookups = MetricFamily(
+        "agrichat_conversation_cache_lookups", "counter", "Follow-up history lookups served from memory or Mongo."
+    )
+    lookups.add(_number(stats, "hits"), result="hit")
+    lookups.add(_number(stats, "misses"), result="miss")
+    return [
+        lookups,
+        MetricFamily("agrichat_conversation_cache_entries", "gauge", "Session histories held in memory.").add(
+            _number(stats, "entries")
+        ),
+    ]
+
+
+def _generation_families() -> List[MetricFamily]:
+    stats = llm_generation_stats()
+    return [
+        MetricFamily("agrichat_llm_generations", "counter", "Answers generated by the LLM.").add(
+            _number(stats, "generations")
+        ),
+        MetricFamily(
+            "agrichat_llm_prompt_eval_avg_milliseconds", "gauge", "Average prompt evaluation time reported by Ollama."
+        ).add(_number(stats, "avg_prompt_eval_ms")),
+        MetricFamily(
+            "agrichat_llm_eval_tokens_per_second", "gauge", "Average generation speed reported by Ollama."
+        ).add(_number(stats, "avg_eval_tokens_per_s")),
+    ]
+
+
+def _single_flight_families() -> List[MetricFamily]:
+    stats = single_flight_stats()
+    requests = MetricFamily("agrichat_single_flight_requests", "counter", "Answer requests by how they were served.")
+    requests.add(_number(stats, "executions"), outcome="executed")
+    requests.add(_number(stats, "coalesced"), outcome="coalesced")
+    return [
+        requests,
+        MetricFamily(
+            "agrichat_single_flight_coalescing_ratio", "gauge", "Share of answer requests that joined a run in flight."
+        ).add(_number(stats, "coalescing_ratio")),
+    ]
+
+
+def _scheduler_families() -> List[MetricFamily]:
+    stats = llm_scheduler_stats()
+    admitted = MetricFamily("agrichat_llm_admitted", "counter", "LLM calls admitted by the scheduler.")
+    rejected = MetricFamily("agrichat_llm_rejected", "counter", "LLM calls rejected or displaced by the scheduler.")
+    for priority, counts in stats["by_priority"].items():
+        admitted.add(counts["admitted"], priority=priority)
+        rejected.add(counts["rejected"], priority=priority)
+    return [
+        admitted,
+        rejected,
+        MetricFamily("agrichat_llm_active", "gauge", "LLM calls currently running.").add(_number(stats, "active")),
+        MetricFamily("agrichat_llm_waiting", "gauge", "LLM calls waiting for a slot.").add(_number(stats, "waiting")),
+        MetricFamily(
+            "agrichat_llm_ungated", "counter", "Clarification calls run outside the single LLM slot."
+        ).add(_number(stats, "ungated")),
+    ]
+
+
+def collect_metric_families() -> List[MetricFamily]:
+    families: List[MetricFamily] = []
+    for collect in (
+        _transport_families,
+        _embedding_families,
+        _intent_families,
+        _answer_cache_families,
+        _conversation_families,
+        _generation_families,
+        _single_flight_families,
+        _scheduler_families,
+    ):
+        families.extend(collect())
+    return families
+
+
+def render_metrics() -> str:
+    return render_openmetrics(collect_metric_families())
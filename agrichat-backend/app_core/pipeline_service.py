@@ -1,25 +1,29 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 import os
 import re
 import time
 from copy import deepcopy
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, Union
 from uuid import uuid4
 
 import markdown
 from bs4 import BeautifulSoup
 from fastapi import Request
 from fastapi.responses import JSONResponse, StreamingResponse
-from langchain.memory import ConversationBufferWindowMemory
 
-from pipeline import classify_question_intent, run_pipeline
+from pipeline import LLMOverloadedError, aclassify_question_intent, arun_pipeline, queue_position_listener
+from pipeline.answer_cache import override_signature
+from pipeline.intent_classifier import normalize_question
+from pipeline.tracing import span
 from pipeline.types import PipelineResult
 
-from .context import convert_langchain_memory_to_history, enhance_answer_with_context_questions
+from .context import enhance_answer_with_context_questions
+from .conversation import load_conversation_history, remember_session
 from .db import (
     database_unavailable_response,
     missing_device_response,
@@ -28,11 +32,9 @@ from .db import (
     unauthorized_device_response,
 )
 from .models import DatabaseToggleConfig, QueryRequest, SessionQueryRequest
-from .config import iso_now
+from .config import CLARIFICATION_STREAM_TIMEOUT, SINGLE_FLIGHT_ENABLED, iso_now
 from .utils import (
     build_answer_message,
-    clean_session,
-    conversation_memory_for_session,
     extract_answer_content,
     extract_golden_database_metadata,
     get_request_device_id,
@@ -104,7 +106,232 @@ def _greeting_response(question: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-session_memories: Dict[str, ConversationBufferWindowMemory] = {}
+class _ThinkTagFilter:
+    """Drop ``<think>...</think>`` spans from streamed text, holding back partial tags."""
+
+    _OPEN = "<think>"
+    _CLOSE = "</think>"
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._inside = False
+
+    @staticmethod
+    def _partial_tag_length(text: str, tag: str) -> int:
+        for size in range(min(len(tag) - 1, len(text)), 0, -1):
+            if text.endswith(tag[:size]):
+                return size
+        return 0
+
+    def feed(self, text: str) -> str:
+        self._buffer += text
+        visible: List[str] = []
+        while True:
+            tag = self._CLOSE if self._inside else self._OPEN
+            lowered = self._buffer.lower()
+            index = lowered.find(tag)
+            if index == -1:
+                keep = self._partial_tag_length(lowered, tag)
+                cut = len(self._buffer) - keep
+                if not self._inside:
+                    visible.append(self._buffer[:cut])
+                self._buffer = self._buffer[cut:]
+                break
+            if not self._inside:
+                visible.append(self._buffer[:index])
+            self._buffer = self._buffer[index + len(tag):]
+            self._inside = not self._inside
+        return "".join(visible)
+
+
+class _Listener:
+    """Callbacks of one request subscribed to a flight."""
+
+    __slots__ = ("token", "clarifications", "queue_position")
+
+    def __init__(
+        self,
+        token: Optional[Callable[[str], None]],
+        clarifications: Optional[Callable[[List[str]], None]],
+        queue_position: Optional[Callable[[int], None]],
+    ) -> None:
+        self.token = token
+        self.clarifications = clarifications
+        self.queue_position = queue_position
+
+
+class _Flight:
+    """One in-flight pipeline execution and the requests waiting on it."""
+
+    def __init__(self) -> None:
+        self.task: Optional[asyncio.Task] = None
+        self.tokens: List[str] = []
+        self.clarifications: Optional[List[str]] = None
+        self.queue_position = 0
+        self.listeners: List[_Listener] = []
+
+    def publish_token(self, delta: str) -> None:
+        self.tokens.append(delta)
+        for listener in list(self.listeners):
+            if listener.token is not None:
+                listener.token(delta)
+
+    def publish_clarifications(self, questions: List[str]) -> None:
+        self.clarifications = list(questions)
+        for listener in list(self.listeners):
+            if listener.clarifications is not None:
+                listener.clarifications(list(questions))
+
+    def publish_queue_position(self, position: int) -> None:
+        self.queue_position = position
+        for listener in list(self.listeners):
+            if listener.queue_position is not None:
+                listener.queue_position(position)
+
+    def attach(self, listener: _Listener) -> None:
+        # Late joiners first receive what the flight has already produced.
+        if listener.queue_position is not None and self.queue_position:
+            listener.queue_position(self.queue_position)
+        if listener.token is not None:
+            for delta in self.tokens:
+                listener.token(delta)
+        if listener.clarifications is not None and self.clarifications is not None:
+            listener.clarifications(list(self.clarifications))
+        self.listeners.append(listener)
+
+
+class SingleFlight:
+    """Share one pipeline execution between concurrent requests with the same key.
+
+    Every execution streams, so each subscriber can replay and follow the token
+    stream. LLM queue positions are fanned out the same way. Late clarifications
+    are only waited for when the request that started the execution can receive
+    them; subscribers without a clarifications callback never see
+    ``clarifications_pending``. Callbacks are always invoked on the event loop.
+    The execution is cancelled only when its last subscriber goes away.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._stats = {"requests": 0, "executions": 0, "coalesced": 0, "cancelled": 0}
+
+    async def _execute(
+        self,
+        key: Optional[Hashable],
+        flight: _Flight,
+        factory: Callable[
+            [Callable[[str], None], Optional[Callable[[List[str]], None]]], Awaitable[Dict[str, Any]]
+        ],
+        deliver_clarifications: bool,
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        publish_clarifications: Optional[Callable[[List[str]], None]] = None
+        if deliver_clarifications:
+            publish_clarifications = functools.partial(loop.call_soon_threadsafe, flight.publish_clarifications)
+        try:
+            with span("pipeline"), queue_position_listener(
+                lambda position: loop.call_soon_threadsafe(flight.publish_queue_position, position)
+            ):
+                result = await factory(
+                    lambda delta: loop.call_soon_threadsafe(flight.publish_token, delta),
+                    publish_clarifications,
+                )
+            # Let tokens handed over from worker threads reach the subscribers first.
+            await asyncio.sleep(0)
+            return result
+        finally:
+            if key is not None and self._flights.get(key) is flight:
+                del self._flights[key]
+
+    async def run(
+        self,
+        key: Optional[Hashable],
+        factory: Callable[
+            [Callable[[str], None], Optional[Callable[[List[str]], None]]], Awaitable[Dict[str, Any]]
+        ],
+        token_callback: Optional[Callable[[str], None]] = None,
+        clarifications_callback: Optional[Callable[[List[str]], None]] = None,
+        queue_callback: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, Any]:
+        """Result of ``factory(token_callback, clarifications_callback)``, shared by ``key``."""
+
+        if not self.enabled:
+            key = None
+        flight = self._flights.get(key) if key is not None else None
+        self._stats["requests"] += 1
+        if flight is None:
+            flight = _Flight()
+            flight.task = asyncio.create_task(
+                self._execute(key, flight, factory, clarifications_callback is not None)
+            )
+            if key is not None:
+                self._flights[key] = flight
+            self._stats["executions"] += 1
+        else:
+            self._stats["coalesced"] += 1
+
+        listener = _Listener(token_callback, clarifications_callback, queue_callback)
+        flight.attach(listener)
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            if not flight.task.done():
+                flight.listeners.remove(listener)
+                if not flight.listeners:
+                    flight.task.cancel()
+                    self._stats["cancelled"] += 1
+                    if key is not None and self._flights.get(key) is flight:
+                        del self._flights[key]
+        result = deepcopy(result)
+        if clarifications_callback is None:
+            # Nothing would ever deliver the late suggestions to this caller.
+            (result.get("metadata") or {}).pop("clarifications_pending", None)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = dict(self._stats)
+        snapshot["enabled"] = self.enabled
+        snapshot["in_flight"] = len(self._flights)
+        snapshot["coalescing_ratio"] = (
+            round(snapshot["coalesced"] / snapshot["requests"], 4) if snapshot["requests"] else 0.0
+        )
+        return snapshot
+
+
+single_flight = SingleFlight(enabled=SINGLE_FLIGHT_ENABLED)
+
+
+def single_flight_stats() -> Dict[str, Any]:
+    return single_flight.stats()
+
+
+def _single_flight_key(
+    question: str,
+    conversation_history: Optional[List[Dict[str, str]]],
+    user_state: Optional[str],
+    overrides_payload: Optional[Dict[str, Any]],
+) -> Hashable:
+    history = json.dumps(conversation_history or [], sort_keys=True, default=str)
+    return (
+        normalize_question(question),
+        (user_state or "").strip().lower(),
+        override_signature(overrides_payload),
+        history,
+    )
+
+
+def render_answer_html(answer: str) -> str:
+    with span("markdown_render"):
+        return markdown.markdown(answer, extensions=["extra", "nl2br"])
+
+
+def llm_overloaded_response(exc: LLMOverloadedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"error": "The assistant is busy right now. Please retry shortly."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 
 def _intent_failure_payload(
@@ -131,6 +358,47 @@ async def run_pipeline_answer(
     user_state: Optional[str] = None,
     db_config: Optional[DatabaseToggleConfig] = None,
     config_overrides: Optional[Dict[str, Any]] = None,
+    token_callback: Optional[Callable[[str], None]] = None,
+    clarifications_callback: Optional[Callable[[List[str]], None]] = None,
+    queue_callback: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """Answer dict for ``question``; identical concurrent requests share one execution.
+
+    Raises :class:`LLMOverloadedError` when the LLM scheduler turns the request away.
+    """
+
+    overrides_payload: Optional[Dict[str, Any]] = None
+    if db_config:
+        overrides_payload = build_pipeline_overrides_from_config(db_config)
+    elif config_overrides:
+        overrides_payload = config_overrides
+
+    key = _single_flight_key(question, conversation_history, user_state, overrides_payload)
+    return await single_flight.run(
+        key,
+        lambda flight_tokens, flight_clarifications: _execute_pipeline_answer(
+            question,
+            conversation_history,
+            user_state,
+            db_config,
+            config_overrides,
+            flight_tokens,
+            flight_clarifications,
+        ),
+        token_callback,
+        clarifications_callback,
+        queue_callback,
+    )
+
+
+async def _execute_pipeline_answer(
+    question: str,
+    conversation_history: Optional[List[Dict[str, str]]],
+    user_state: Optional[str],
+    db_config: Optional[DatabaseToggleConfig],
+    config_overrides: Optional[Dict[str, Any]],
+    token_callback: Callable[[str], None],
+    clarifications_callback: Optional[Callable[[List[str]], None]],
 ) -> Dict[str, Any]:
     raw_db_config: Optional[Dict[str, Any]] = None
     if config_overrides and isinstance(config_overrides, dict):
@@ -151,20 +419,12 @@ async def run_pipeline_answer(
     if greeting_payload:
         return greeting_payload
 
-    classification_text = question
-    if conversation_history:
-        recent_user_messages = [
-            (entry.get("content") or "")
-            for entry in conversation_history
-            if entry.get("role") == "user"
-        ]
-        if recent_user_messages:
-            recent_context = " \n".join(message.strip() for message in recent_user_messages[-3:] if message)
-            if recent_context:
-                classification_text = f"{recent_context}\nFollow-up: {question}"
-
     try:
-        intent_metadata = classify_question_intent(classification_text)
+        intent_metadata = await aclassify_question_intent(
+            question, conversation_history, config_overrides=overrides_payload
+        )
+    except LLMOverloadedError:
+        raise
     except Exception as exc:  # pragma: no cover
         logger.warning("[Intent] classification failed: %s", exc)
         intent_metadata = None
@@ -172,19 +432,19 @@ async def run_pipeline_answer(
     if intent_metadata and not intent_metadata.get("final"):
         return _intent_failure_payload(raw_db_config, intent_metadata)
 
-    loop = asyncio.get_event_loop()
-
     try:
-        pipeline_result: PipelineResult = await loop.run_in_executor(
-            None,
-            lambda: run_pipeline(
-                question,
-                conversation_history or [],
-                user_state,
-                intent_metadata=intent_metadata,
-                config_overrides=overrides_payload,
-            ),
+        pipeline_result: PipelineResult = await arun_pipeline(
+            question,
+            conversation_history or [],
+            user_state,
+            intent_metadata=intent_metadata,
+            config_overrides=overrides_payload,
+            stream=True,
+            token_callback=token_callback,
+            clarifications_callback=clarifications_callback,
         )
+    except LLMOverloadedError:
+        raise
     except Exception as exc:  # pragma: no cover
         logger.error("[Pipeline] run_pipeline failed: %s", exc)
         return {
@@ -230,29 +490,28 @@ async def handle_new_session(request: QueryRequest) -> Dict[str, Any]:
         config_overrides = build_pipeline_overrides_from_config(db_config)
 
     session_id = str(uuid4())
-    memory = conversation_memory_for_session(session_id, session_memories)
-
-    memory.chat_memory.add_user_message(request.question)
-    answer = await run_pipeline_answer(
-        request.question,
-        conversation_history=[],
-        user_state=request.state,
-        db_config=db_config,
-        config_overrides=config_overrides,
-    )
 
-    if isinstance(answer, dict) and answer.get("answer"):
-        memory.chat_memory.add_ai_message(answer["answer"])
-    else:  # pragma: no cover
-        memory.chat_memory.add_ai_message(str(answer))
+    try:
+        answer = await run_pipeline_answer(
+            request.question,
+            conversation_history=[],
+            user_state=request.state,
+            db_config=db_config,
+            config_overrides=config_overrides,
+        )
+    except LLMOverloadedError as exc:
+        return llm_overloaded_response(exc)
 
     answer_only, golden_metadata = extract_answer_content(answer)
-    html_answer = markdown.markdown(answer_only, extensions=["extra", "nl2br"])
+    html_answer = render_answer_html(answer_only)
     message = build_answer_message(request.question, answer, html_answer, golden_metadata)
 
+    created_at = iso_now()
     session_document = {
         "session_id": session_id,
-        "timestamp": iso_now(),
+        "title": request.question,
+        "created_at": created_at,
+        "timestamp": created_at,
         "messages": [message],
         "crop": "unknown",
         "state": request.state,
@@ -264,10 +523,13 @@ async def handle_new_session(request: QueryRequest) -> Dict[str, Any]:
 
     if sessions_db_available():
         try:
-            session_store.collection.insert_one(session_document)
-            session_document.pop("_id", None)
+            with span("mongo_write", op="insert"):
+                await session_store.collection.insert_one(session_document)
+            remember_session(session_document)
         except Exception as exc:  # pragma: no cover
             logger.error("[Mongo] Failed to persist session %s: %s", session_id, exc)
+        # insert_one assigns an ObjectId even when the write fails.
+        session_document.pop("_id", None)
     else:
         logger.warning("[Mongo] Session storage unavailable; skipping persistence for %s", session_id)
 
@@ -283,7 +545,7 @@ async def handle_session_query(session_id: str, request: SessionQueryRequest) ->
     if not request.device_id or not request.device_id.strip():
         return missing_device_response()
 
-    session = session_store.collection.find_one({"session_id": session_id})
+    session = await session_store.collection.find_one({"session_id": session_id}, {"messages": 0})
     if not session or session.get("status") == "archived" or session.get("device_id") != request.device_id:
         return JSONResponse(status_code=403, content={"error": "Session is archived, missing or unauthorized"})
 
@@ -293,44 +555,42 @@ async def handle_session_query(session_id: str, request: SessionQueryRequest) ->
         db_config = DatabaseToggleConfig(**request.database_config)
         config_overrides = build_pipeline_overrides_from_config(db_config)
 
-    memory = conversation_memory_for_session(session_id, session_memories)
-    conversation_history = convert_langchain_memory_to_history(memory)
+    conversation_history = await load_conversation_history(session)
     current_state = request.state or session.get("state", "unknown")
 
-    memory.chat_memory.add_user_message(request.question)
-    answer = await run_pipeline_answer(
-        request.question,
-        conversation_history=conversation_history,
-        user_state=current_state,
-        db_config=db_config,
-        config_overrides=config_overrides,
-    )
-
-    if isinstance(answer, dict) and answer.get("answer"):
-        memory.chat_memory.add_ai_message(answer["answer"])
-    else:  # pragma: no cover
-        memory.chat_memory.add_ai_message(str(answer))
+    try:
+        answer = await run_pipeline_answer(
+            request.question,
+            conversation_history=conversation_history,
+            user_state=current_state,
+            db_config=db_config,
+            config_overrides=config_overrides,
+        )
+    except LLMOverloadedError as exc:
+        return llm_overloaded_response(exc)
 
     answer_only, golden_metadata = extract_answer_content(answer)
-    html_answer = markdown.markdown(answer_only, extensions=["extra", "nl2br"])
+    html_answer = render_answer_html(answer_only)
     new_message = build_answer_message(request.question, answer, html_answer, golden_metadata)
 
     crop = session.get("crop", "unknown")
-    session_store.collection.update_one(
-        {"session_id": session_id},
-        {
-            "$push": {"messages": new_message},
-            "$set": {
-                "has_unread": True,
-                "crop": crop,
-                "state": current_state,
-                "timestamp": iso_now(),
+    with span("mongo_write", op="update"):
+        await session_store.collection.update_one(
+            {"session_id": session_id},
+            {
+                "$push": {"messages": new_message},
+                "$set": {
+                    "has_unread": True,
+                    "crop": crop,
+                    "state": current_state,
+                    "timestamp": iso_now(),
+                },
             },
-        },
-    )
+        )
 
-    updated = session_store.collection.find_one({"session_id": session_id})
+    updated = await session_store.collection.find_one({"session_id": session_id})
     if updated:
+        remember_session(updated)
         updated.pop("_id", None)
         updated["recommendations"] = []
 
@@ -361,24 +621,82 @@ async def thinking_stream_response(request: QueryRequest) -> StreamingResponse:
         yield f"data: {json.dumps({'type': 'session_start', 'session_id': session_id})}\n\n"
         yield f"data: {json.dumps({'type': 'thinking_start'})}\n\n"
 
-        try:
-            result = await run_pipeline_answer(
+        # The single-flight layer delivers tokens on the loop (replaying them when this
+        # request joins an execution already under way); they become answer_delta events.
+        # LLM queue positions share the queue as ints and become queue events.
+        token_queue: asyncio.Queue = asyncio.Queue()
+        clarification_queue: asyncio.Queue = asyncio.Queue()
+        answer_task = asyncio.create_task(
+            run_pipeline_answer(
                 request.question,
                 conversation_history=[],
                 user_state=request.state,
                 db_config=db_config,
                 config_overrides=config_overrides,
+                token_callback=token_queue.put_nowait,
+                clarifications_callback=clarification_queue.put_nowait,
+                queue_callback=token_queue.put_nowait,
             )
+        )
+        think_filter = _ThinkTagFilter()
+        answer_started = False
+
+        def _delta_events(item: Union[str, int]) -> List[str]:
+            nonlocal answer_started
+            if isinstance(item, int):
+                return [f"data: {json.dumps({'type': 'queue', 'position': item})}\n\n"]
+            delta = think_filter.feed(item)
+            if not answer_started:
+                delta = delta.lstrip()
+            if not delta:
+                return []
+            events: List[str] = []
+            if not answer_started:
+                answer_started = True
+                events.append(f"data: {json.dumps({'type': 'answer_start'})}\n\n")
+            events.append(f"data: {json.dumps({'type': 'answer_delta', 'delta': delta}, ensure_ascii=False)}\n\n")
+            return events
+
+        try:
+            while not answer_task.done():
+                next_token = asyncio.ensure_future(token_queue.get())
+                await asyncio.wait({next_token, answer_task}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_token.done():
+                    next_token.cancel()
+                    break
+                for event in _delta_events(next_token.result()):
+                    yield event
+            await asyncio.sleep(0)
+            while not token_queue.empty():
+                for event in _delta_events(token_queue.get_nowait()):
+                    yield event
+            result = answer_task.result()
+        except LLMOverloadedError as exc:
+            logger.warning("[Stream] LLM overloaded (%s): %s", exc.status_code, exc)
+            overloaded_event = {
+                "type": "error",
+                "message": "The assistant is busy right now. Please retry shortly.",
+                "status": exc.status_code,
+                "retry_after": exc.retry_after,
+            }
+            yield f"data: {json.dumps(overloaded_event)}\n\n"
+            yield f"data: {json.dumps({'type': 'stream_end'})}\n\n"
+            return
         except Exception as exc:  # pragma: no cover
             logger.error("[Stream] Failed to generate answer: %s", exc)
             yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to generate answer'})}\n\n"
             yield f"data: {json.dumps({'type': 'stream_end'})}\n\n"
             return
+        finally:
+            # The client went away mid-stream: stop generating for nobody.
+            if not answer_task.done():
+                answer_task.cancel()
 
         thinking_content = result.get("thinking") or ""
         yield f"data: {json.dumps({'type': 'thinking_complete', 'thinking': thinking_content})}\n\n"
 
-        yield f"data: {json.dumps({'type': 'answer_start'})}\n\n"
+        if not answer_started:
+            yield f"data: {json.dumps({'type': 'answer_start'})}\n\n"
 
         answer_only, golden_metadata = extract_answer_content(result)
         answer_markdown = result.get("answer_markdown") or answer_only
@@ -411,12 +729,19 @@ async def thinking_stream_response(request: QueryRequest) -> StreamingResponse:
 
         yield f"data: {json.dumps(response_data, ensure_ascii=False)}\n\n"
 
-        html_answer = markdown.markdown(answer_only, extensions=["extra", "nl2br"])
+        if result.get("clarifying_questions"):
+            clarification_event = {"type": "clarifications", "clarifications": result["clarifying_questions"]}
+            yield f"data: {json.dumps(clarification_event, ensure_ascii=False)}\n\n"
+
+        html_answer = render_answer_html(answer_only)
         message = build_answer_message(request.question, result, html_answer, golden_metadata)
 
+        created_at = iso_now()
         session_document = {
             "session_id": session_id,
-            "timestamp": iso_now(),
+            "title": request.question,
+            "created_at": created_at,
+            "timestamp": created_at,
             "messages": [message],
             "crop": "unknown",
             "state": request.state,
@@ -429,11 +754,13 @@ async def thinking_stream_response(request: QueryRequest) -> StreamingResponse:
         storage_status = "skipped"
         if can_persist_stream:
             try:
-                session_store.collection.insert_one(session_document)
-                session_document.pop("_id", None)
+                with span("mongo_write", op="insert"):
+                    await session_store.collection.insert_one(session_document)
+                remember_session(session_document)
                 storage_status = "persisted"
             except Exception as exc:
                 logger.error("[Stream] Failed to persist streamed session %s: %s", session_id, exc)
+            session_document.pop("_id", None)
         else:
             logger.warning("[Stream] Session storage unavailable; skipping persistence for %s", session_id)
 
@@ -445,6 +772,26 @@ async def thinking_stream_response(request: QueryRequest) -> StreamingResponse:
             "stored": storage_status == "persisted",
         }
         yield f"data: {json.dumps(completion_payload, ensure_ascii=False)}\n\n"
+
+        # Suggestions still being generated arrive after the answer, or are dropped at the timeout.
+        if metadata.get("clarifications_pending"):
+            try:
+                late_questions = await asyncio.wait_for(clarification_queue.get(), CLARIFICATION_STREAM_TIMEOUT)
+            except asyncio.TimeoutError:
+                late_questions = None
+            if late_questions:
+                clarification_event = {"type": "clarifications", "clarifications": late_questions}
+                yield f"data: {json.dumps(clarification_event, ensure_ascii=False)}\n\n"
+                if storage_status == "persisted":
+                    try:
+                        with span("mongo_write", op="update"):
+                            await session_store.collection.update_one(
+                                {"session_id": session_id},
+                                {"$set": {"messages.0.clarifying_questions": late_questions}},
+                            )
+                    except Exception as exc:
+                        logger.error("[Stream] Failed to store clarifications for %s: %s", session_id, exc)
+
         yield f"data: {json.dumps({'type': 'stream_end'})}\n\n"
 
     return StreamingResponse(
@@ -5,7 +5,7 @@ import csv
 import os
 import requests
 from io import StringIO, BytesIO
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Body, Form, Request, UploadFile
 from fastapi.responses import JSONResponse, StreamingResponse
@@ -15,6 +15,7 @@ import requests
 from bs4 import BeautifulSoup
 
 from ..db import (
+    SESSION_SUMMARY_PROJECTION,
     database_unavailable_response,
     missing_device_response,
     session_store,
@@ -28,7 +29,7 @@ from ..pipeline_service import (
     handle_session_query,
     thinking_stream_response,
 )
-from ..utils import clean_session, get_request_device_id, format_iso
+from ..utils import decode_session_cursor, encode_session_cursor, get_request_device_id, format_iso
 from ..config import IST
 
 logger = logging.getLogger("agrichat.app.routes.chat")
@@ -49,7 +50,7 @@ async def continue_session(session_id: str, request: SessionQueryRequest):
 
 
 @router.get("/sessions")
-async def list_sessions(request: Request):
+async def list_sessions(request: Request, limit: int = 20, cursor: Optional[str] = None):
     if not sessions_db_available():
         return database_unavailable_response()
 
@@ -57,10 +58,28 @@ async def list_sessions(request: Request):
     if not device_id:
         return missing_device_response()
 
-    sessions = list(
-        session_store.collection.find({"device_id": device_id}).sort("timestamp", -1).limit(20)
+    query: Dict[str, Any] = {"device_id": device_id}
+    if cursor:
+        position = decode_session_cursor(cursor)
+        if position is None:
+            return JSONResponse(status_code=400, content={"error": "Invalid cursor"})
+        created_at, last_session_id = position
+        # created_at never changes, so sessions that get new messages between pages keep their place.
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "session_id": {"$lt": last_session_id}},
+        ]
+
+    limit = max(1, min(limit, 100))
+    # One extra row tells whether another page exists without a count query.
+    sessions = await (
+        session_store.collection.find(query, SESSION_SUMMARY_PROJECTION)
+        .sort([("created_at", -1), ("session_id", -1)])
+        .limit(limit + 1)
+        .to_list()
     )
-    return {"sessions": [clean_session(s) for s in sessions]}
+    next_cursor = encode_session_cursor(sessions[limit - 1]) if len(sessions) > limit else None
+    return {"sessions": sessions[:limit], "next_cursor": next_cursor}
 
 
 @router.get("/session/{session_id}")
@@ -72,14 +91,14 @@ async def get_session(session_id: str, request: Request):
     if not device_id:
         return missing_device_response()
 
-    session = session_store.collection.find_one({"session_id": session_id})
+    session = await session_store.collection.find_one({"session_id": session_id})
     if not session:
         return JSONResponse(status_code=404, content={"error": "Session not found"})
     if session.get("device_id") != device_id:
         return unauthorized_device_response()
 
     session["_id"] = str(session["_id"])
-    session_store.collection.update_one({"session_id": session_id}, {"$set": {"has_unread": False}})
+    await session_store.collection.update_one({"session_id": session_id}, {"$set": {"has_unread": False}})
     session["has_unread"] = False
     return {"session": session}
 
@@ -98,14 +117,14 @@ async def toggle_status(session_id: str, status: str, request: Request):
     if not device_id:
         return missing_device_response()
 
-    session = session_store.collection.find_one({"session_id": session_id})
+    session = await session_store.collection.find_one({"session_id": session_id})
     if not session:
         return JSONResponse(status_code=404, content={"error": "Session not found"})
     if session.get("device_id") != device_id:
         return unauthorized_device_response()
 
     new_status = "archived" if status == "active" else "active"
-    session_store.collection.update_one(
+    await session_store.collection.update_one(
         {"session_id": session_id},
         {"$set": {"status": new_status}},
     )
@@ -121,7 +140,7 @@ async def export_csv(session_id: str, request: Request):
     if not device_id:
         return missing_device_response()
 
-    session = session_store.collection.find_one({"session_id": session_id})
+    session = await session_store.collection.find_one({"session_id": session_id})
     if not session:
         return JSONResponse(status_code=404, content={"error": "Session not found"})
     if session.get("device_id") != device_id:
@@ -159,13 +178,13 @@ async def delete_session(session_id: str, request: Request):
     if not device_id:
         return missing_device_response()
 
-    session = session_store.collection.find_one({"session_id": session_id})
+    session = await session_store.collection.find_one({"session_id": session_id})
     if not session:
         return JSONResponse(status_code=404, content={"error": "Session not found"})
     if session.get("device_id") != device_id:
         return unauthorized_device_response()
 
-    result = session_store.collection.delete_one({"session_id": session_id})
+    result = await session_store.collection.delete_one({"session_id": session_id})
     if result.deleted_count == 0:
         return JSONResponse(status_code=404, content={"error": "Session not found"})
     return {"message": "Session deleted successfully"}
@@ -188,7 +207,7 @@ async def rate_answer(
     if not device_id or not device_id.strip():
         return missing_device_response()
 
-    session = session_store.collection.find_one({"session_id": session_id})
+    session = await session_store.collection.find_one({"session_id": session_id})
     if not session:
         return JSONResponse(status_code=404, content={"error": "Session not found"})
     if session.get("device_id") != device_id.strip():
@@ -198,7 +217,7 @@ async def rate_answer(
         return JSONResponse(status_code=400, content={"error": "Question index out of range"})
 
     update_field = f"messages.{question_index}.rating"
-    session_store.collection.update_one({"session_id": session_id}, {"$set": {update_field: rating}})
+    await session_store.collection.update_one({"session_id": session_id}, {"$set": {update_field: rating}})
     return {"message": "Rating Updated"}
 
 
@@ -215,10 +234,10 @@ async def update_language(data: Dict[str, Any] = Body(...)):
         return missing_device_response()
     device_id = device_id.strip()
 
-    if session_store.collection.count_documents({"device_id": device_id}) == 0:
+    if await session_store.collection.count_documents({"device_id": device_id}) == 0:
         return JSONResponse(status_code=404, content={"error": "Device not found"})
 
-    session_store.collection.update_many(
+    await session_store.collection.update_many(
         {"device_id": device_id},
         {"$set": {"state": state, "language": language}},
     )
@@ -6,10 +6,21 @@ from datetime import datetime
 from typing import Dict
 
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from ..config import CORS_ORIGINS, iso_now
-from ..health import check_chroma_health, check_mongo_health, check_ollama_health
+from ..health import (
+    check_answer_cache,
+    check_chroma_health,
+    check_conversation_cache,
+    check_embedding_cache,
+    check_intent_classifier,
+    check_llm_scheduler,
+    check_mongo_health,
+    check_ollama_health,
+    check_single_flight,
+)
+from ..metrics import OPENMETRICS_CONTENT_TYPE, render_metrics
 
 logger = logging.getLogger("agrichat.app.routes.system")
 
@@ -24,9 +35,15 @@ async def root():
 @router.get("/health")
 async def health():
     checks = {
-        "mongo": check_mongo_health(),
+        "mongo": await check_mongo_health(),
         "chroma": check_chroma_health(),
         "ollama": check_ollama_health(),
+        "embedding_cache": check_embedding_cache(),
+        "intent_classifier": check_intent_classifier(),
+        "answer_cache": check_answer_cache(),
+        "conversation_cache": check_conversation_cache(),
+        "single_flight": check_single_flight(),
+        "llm_scheduler": check_llm_scheduler(),
     }
 
     statuses = [check.get("status") for check in checks.values()]
@@ -44,6 +61,11 @@ async def health():
     }
 
 
+@router.get("/metrics")
+async def metrics():
+    return Response(render_metrics(), media_type=OPENMETRICS_CONTENT_TYPE)
+
+
 @router.options("/{full_path:path}")
 async def options_handler(request: Request):
     origin = request.headers.get("origin")
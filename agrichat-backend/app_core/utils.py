@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import base64
+import binascii
 import csv
 import json
 import os
@@ -15,7 +17,6 @@ from bs4 import BeautifulSoup
 from dateutil import parser
 from fastapi import Request
 from fastapi.responses import JSONResponse
-from langchain.memory import ConversationBufferWindowMemory
 
 from pipeline.types import PipelineResult
 
@@ -323,6 +324,10 @@ def build_answer_message(question: str, answer_result: Any, html_answer: str, go
         "answer": html_answer,
         "rating": None,
     }
+    if isinstance(answer_result, dict):
+        markdown_answer = answer_result.get("answer_markdown") or answer_result.get("answer")
+        if markdown_answer:
+            message["answer_markdown"] = markdown_answer
 
     metadata_block: Dict[str, Any] = {}
     if golden_metadata:
@@ -379,11 +384,24 @@ def clean_session(document: Dict[str, Any]) -> Dict[str, Any]:
     return document
 
 
+def encode_session_cursor(session: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing just past ``session`` in the (created_at, session_id) order."""
+
+    raw = json.dumps([session.get("created_at"), session.get("session_id")]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_session_cursor(cursor: str) -> Optional[Tuple[str, str]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, session_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    if not isinstance(created_at, str) or not isinstance(session_id, str):
+        return None
+    return created_at, session_id
+
+
 def format_iso(ts: datetime) -> str:
     return ts.astimezone(IST).strftime("%Y-%m-%d %H:%M:%S")
 
-
-def conversation_memory_for_session(session_id: str, store: Dict[str, ConversationBufferWindowMemory]) -> ConversationBufferWindowMemory:
-    if session_id not in store:
-        store[session_id] = ConversationBufferWindowMemory(k=8, return_messages=True)
-    return store[session_id]
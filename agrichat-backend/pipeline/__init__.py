@@ -1,7 +1,9 @@
 from typing import Any, Callable, Dict, List, Optional
 
 from .config import DEFAULT_CONFIG, PipelineConfig
+from .llm import generation_stats
 from .runner import PipelineRunner
+from .scheduler import LLMOverloadedError, llm_scheduler_stats, queue_position_listener
 from .types import PipelineResult
 
 _default_runner = PipelineRunner()
@@ -21,6 +23,7 @@ def run_pipeline(
     token_callback: Optional[Callable[[str], None]] = None,
     intent_metadata: Optional[Dict[str, Optional[bool]]] = None,
     config_overrides: Optional[Dict[str, Any]] = None,
+    clarifications_callback: Optional[Callable[[List[str]], None]] = None,
 ) -> PipelineResult:
     return _default_runner.answer(
         question,
@@ -30,9 +33,63 @@ def run_pipeline(
         token_callback=token_callback,
         intent_metadata=intent_metadata,
         config_overrides=config_overrides,
+        clarifications_callback=clarifications_callback,
     )
 
 
-def classify_question_intent(question: str) -> Dict[str, Optional[bool]]:
+async def arun_pipeline(
+    question: str,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    user_state: Optional[str] = None,
+    *,
+    stream: bool = False,
+    token_callback: Optional[Callable[[str], None]] = None,
+    intent_metadata: Optional[Dict[str, Optional[bool]]] = None,
+    config_overrides: Optional[Dict[str, Any]] = None,
+    clarifications_callback: Optional[Callable[[List[str]], None]] = None,
+) -> PipelineResult:
+    """Async :func:`run_pipeline`; LLM generation is awaited instead of blocking a thread."""
+    return await _default_runner.aanswer(
+        question,
+        conversation_history,
+        user_state,
+        stream=stream,
+        token_callback=token_callback,
+        intent_metadata=intent_metadata,
+        config_overrides=config_overrides,
+        clarifications_callback=clarifications_callback,
+    )
+
+
+def classify_question_intent(
+    question: str, conversation_history: Optional[List[Dict[str, str]]] = None
+) -> Dict[str, Optional[bool]]:
     """Expose intent classification metadata for external callers."""
-    return _default_runner.classify_question_intent(question)
+    return _default_runner.classify_question_intent(question, conversation_history)
+
+
+async def aclassify_question_intent(
+    question: str,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    *,
+    config_overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Optional[bool]]:
+    """Async :func:`classify_question_intent`; pass the result to :func:`arun_pipeline`."""
+    return await _default_runner.aclassify_intent(
+        question, conversation_history, config_overrides=config_overrides
+    )
+
+
+def intent_classifier_stats() -> Dict[str, Any]:
+    """Per-tier decision counts of the intent classifier."""
+    return _default_runner.intent.stats()
+
+
+def answer_cache_stats() -> Dict[str, Any]:
+    """Hit rate and size of the semantic answer cache."""
+    return _default_runner.answer_cache.stats()
+
+
+def llm_generation_stats() -> Dict[str, Any]:
+    """Average prompt-eval time and tokens of answer generations in this worker."""
+    return generation_stats.snapshot()
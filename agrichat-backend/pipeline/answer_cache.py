@@ -0,0 +1,194 @@
+"""Semantic cache of generated answers.
+
+Farmers ask the same few questions over and over, so LLM answers are kept
+per worker and reused for a new question whose embedding is nearly identical
+(cosine at or above the threshold) and whose *signature* matches: the
+prioritised states, the request's config overrides and the on-disk version
+of the knowledge collections. A rebuilt collection changes the version and
+clears the cache. Only questions without conversation history are cached,
+because a follow-up answer depends on the earlier turns.
+
+Settings (all optional):
+
+* ``ANSWER_CACHE_SIZE`` – entries kept per worker (default 1024, ``0`` disables).
+* ``ANSWER_CACHE_TTL`` – seconds an answer stays valid (default 21600).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .types import PipelineResult
+
+logger = logging.getLogger("agrichat.pipeline.answer_cache")
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def override_signature(config_overrides: Optional[Dict[str, Any]]) -> str:
+    """Stable text form of the request overrides (``{}`` when there are none)."""
+
+    return json.dumps(config_overrides or {}, sort_keys=True, default=str)
+
+
+@dataclass
+class _Entry:
+    signature: Hashable
+    vector: np.ndarray
+    result: PipelineResult
+    question: str
+    created: float
+
+
+class SemanticAnswerCache:
+    """Bounded, TTL-limited nearest-neighbour cache of :class:`PipelineResult` objects."""
+
+    def __init__(
+        self,
+        threshold: float = 0.97,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.threshold = threshold
+        self.max_entries = int(_env_number("ANSWER_CACHE_SIZE", 1024)) if max_entries is None else max_entries
+        self.ttl_seconds = _env_number("ANSWER_CACHE_TTL", 21600.0) if ttl_seconds is None else ttl_seconds
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._by_signature: Dict[Hashable, List[int]] = {}
+        self._matrices: Dict[Hashable, Tuple[np.ndarray, List[int]]] = {}
+        self._next_id = 0
+        self._data_version: Optional[Hashable] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def _normalise(vector: Sequence[float]) -> Optional[np.ndarray]:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        if not norm:
+            return None
+        return array / norm
+
+    def _check_version(self, data_version: Hashable) -> None:
+        if self._data_version != data_version:
+            if self._entries:
+                logger.info("Knowledge collections changed; dropping %d cached answers", len(self._entries))
+                self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._by_signature.clear()
+            self._matrices.clear()
+            self._data_version = data_version
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        ids = self._by_signature.get(entry.signature)
+        if ids is not None:
+            ids.remove(entry_id)
+            if not ids:
+                del self._by_signature[entry.signature]
+        self._matrices.pop(entry.signature, None)
+
+    def _matrix(self, signature: Hashable) -> Tuple[np.ndarray, List[int]]:
+        cached = self._matrices.get(signature)
+        if cached is None:
+            ids = list(self._by_signature.get(signature, []))
+            vectors = [self._entries[entry_id].vector for entry_id in ids]
+            cached = (np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32), ids)
+            self._matrices[signature] = cached
+        return cached
+
+    def lookup(
+        self,
+        vector: Sequence[float],
+        signature: Hashable,
+        data_version: Hashable,
+    ) -> Optional[Tuple[PipelineResult, float, str]]:
+        """Cached ``(result, cosine, original question)`` for the nearest match, if close enough."""
+
+        query = self._normalise(vector)
+        if query is None or not self.enabled:
+            return None
+        with self._lock:
+            self._check_version(data_version)
+            matrix, ids = self._matrix(signature)
+            if not ids or matrix.shape[1] != query.shape[0]:
+                self._stats["misses"] += 1
+                return None
+            scores = matrix @ query
+            now = time.time()
+            for position in np.argsort(-scores):
+                score = float(scores[position])
+                if score < self.threshold:
+                    break
+                entry_id = ids[int(position)]
+                entry = self._entries[entry_id]
+                if now - entry.created > self.ttl_seconds:
+                    self._remove(entry_id)
+                    self._stats["expired"] += 1
+                    continue
+                self._entries.move_to_end(entry_id)
+                self._stats["hits"] += 1
+                return deepcopy(entry.result), score, entry.question
+            self._stats["misses"] += 1
+            return None
+
+    def store(
+        self,
+        question: str,
+        vector: Sequence[float],
+        signature: Hashable,
+        data_version: Hashable,
+        result: PipelineResult,
+    ) -> None:
+        normalised = self._normalise(vector)
+        if normalised is None or not self.enabled:
+            return
+        with self._lock:
+            self._check_version(data_version)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(signature, normalised, deepcopy(result), question, time.time())
+            self._by_signature.setdefault(signature, []).append(entry_id)
+            self._matrices.pop(signature, None)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_signature.clear()
+            self._matrices.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._stats)
+            snapshot["entries"] = len(self._entries)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        snapshot["max_entries"] = self.max_entries
+        snapshot["ttl_seconds"] = self.ttl_seconds
+        snapshot["threshold"] = self.threshold
+        return snapshot
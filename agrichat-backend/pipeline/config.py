@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -26,6 +27,8 @@ class PipelineConfig:
     enable_golden: bool = True
     enable_pops: bool = True
     enable_llm: bool = True
+    # Embeddings are unit length and Chroma's l2 is squared, so distance = 2 - 2 * cosine:
+    # max_distance 0.45 admits cosine >= 0.775 and is the binding Golden gate.
     golden_thresholds: SourceThresholds = field(
         default_factory=lambda: SourceThresholds(max_distance=0.45, min_cosine=0.5)
     )
@@ -42,11 +45,34 @@ class PipelineConfig:
     clarification_max_questions: int = 2
     llm_model: str = "gpt-oss:latest"
     clarification_temperature: float = 0.2
+    # Clarifications run beside answer generation; a finished answer waits at most this long for them.
+    clarification_wait_ms: float = field(
+        default_factory=lambda: float(os.getenv("PIPELINE_CLARIFICATION_WAIT_MS", "250"))
+    )
+    clarification_max_workers: int = 4
     answer_temperature: float = 0.2
     max_answer_tokens: int = 1024
     enable_logging: bool = True
     show_diagnostics: bool = True
     use_llm_intent_classifier: bool = True
+    local_intent_classifier: bool = field(
+        default_factory=lambda: os.getenv("PIPELINE_LOCAL_INTENT", "true").strip().lower() in {"1", "true", "yes"}
+    )
+    local_intent_accept: float = 0.95
+    local_intent_reject: float = 0.1
+    golden_backend: str = field(default_factory=lambda: os.getenv("GOLDEN_VECTOR_BACKEND", "chroma"))
+    speculative_retrieval: bool = field(
+        default_factory=lambda: os.getenv("PIPELINE_SPECULATIVE_RETRIEVAL", "false").strip().lower() in {"1", "true", "yes"}
+    )
+    speculative_max_workers: int = 4
+    hybrid_retrieval: bool = field(
+        default_factory=lambda: os.getenv("PIPELINE_HYBRID_RETRIEVAL", "false").strip().lower() in {"1", "true", "yes"}
+    )
+    rrf_k: int = 60
+    answer_cache: bool = field(
+        default_factory=lambda: os.getenv("PIPELINE_ANSWER_CACHE", "true").strip().lower() in {"1", "true", "yes"}
+    )
+    answer_cache_threshold: float = 0.97
 
 
 DEFAULT_CONFIG = PipelineConfig()
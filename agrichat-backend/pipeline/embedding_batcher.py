@@ -0,0 +1,161 @@
+"""Request-level micro-batching for embedding calls.
+
+Concurrent ``embed_query`` calls coming from different in-flight requests are
+collected for a short window (or until a size cap is hit) and sent to Ollama
+as one multi-input ``/api/embed`` call. Async callers share the same batches
+through :meth:`EmbeddingMicroBatcher.aembed`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .ollama_transport import ollama_transport
+
+logger = logging.getLogger("agrichat.pipeline.embedding_batcher")
+
+BatchEmbedFn = Callable[[List[str]], List[List[float]]]
+
+
+class EmbeddingMicroBatcher:
+    """Merge concurrent single-text embedding requests into batched calls."""
+
+    def __init__(
+        self,
+        embed_batch: BatchEmbedFn,
+        *,
+        window_ms: float = 5.0,
+        max_items: int = 32,
+        max_inflight_batches: int = 4,
+        result_timeout: Optional[float] = None,
+    ):
+        self._embed_batch = embed_batch
+        if result_timeout is None:
+            # Long enough for every attempt the transport may make for one batch.
+            connect, read = ollama_transport.timeouts["embed"]
+            result_timeout = (connect + read) * (1 + ollama_transport.max_retries)
+        self.result_timeout = result_timeout
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_items = max(1, max_items)
+        self.max_inflight_batches = max(1, max_inflight_batches)
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[str, Future]] = []
+        self._dispatcher: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._owner_pid: Optional[int] = None
+        self._stats = {"requests": 0, "batches": 0, "largest_batch": 0}
+
+    @classmethod
+    def from_env(cls, embed_batch: BatchEmbedFn) -> Optional["EmbeddingMicroBatcher"]:
+        """Build a batcher from ``OLLAMA_EMBED_BATCH_*`` settings; ``None`` when disabled."""
+
+        try:
+            window_ms = float(os.getenv("OLLAMA_EMBED_BATCH_WINDOW_MS", "5"))
+        except ValueError:
+            window_ms = 5.0
+        try:
+            max_items = int(os.getenv("OLLAMA_EMBED_BATCH_MAX_ITEMS", "32"))
+        except ValueError:
+            max_items = 32
+        if window_ms <= 0 or max_items <= 1:
+            return None
+        return cls(embed_batch, window_ms=window_ms, max_items=max_items)
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._dispatcher is not None and self._owner_pid == pid and self._dispatcher.is_alive():
+            return
+        # Threads do not survive a fork, so each worker process starts its own dispatcher.
+        self._owner_pid = pid
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_inflight_batches,
+            thread_name_prefix="embed-batch",
+        )
+        self._dispatcher = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+        self._dispatcher.start()
+
+    def _submit(self, text: str) -> Future:
+        future: Future = Future()
+        with self._cond:
+            self._ensure_started()
+            self._pending.append((text, future))
+            self._stats["requests"] += 1
+            self._cond.notify()
+        return future
+
+    def embed(self, text: str) -> List[float]:
+        return self._submit(text).result(timeout=self.result_timeout)
+
+    async def aembed(self, text: str) -> List[float]:
+        """Like :meth:`embed`, but awaits the batch instead of blocking the event loop."""
+
+        return await asyncio.wrap_future(self._submit(text))
+
+    def _take_batch(self) -> List[Tuple[str, Future]]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.window
+            while len(self._pending) < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[: self.max_items]
+            del self._pending[: self.max_items]
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            assert self._executor is not None
+            self._executor.submit(self._flush, batch)
+
+    def _flush(self, batch: List[Tuple[str, Future]]) -> None:
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = self._embed_batch(unique_texts)
+            if len(vectors) != len(unique_texts):
+                raise ValueError(
+                    f"Embedding batch returned {len(vectors)} vectors for {len(unique_texts)} inputs"
+                )
+        except Exception as exc:
+            logger.error("Batched embedding request failed: %s", exc)
+            for _, future in batch:
+                self._resolve(future, exception=exc)
+            return
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future in batch:
+            self._resolve(future, result=by_text[text])
+
+    @staticmethod
+    def _resolve(future: Future, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        # An async caller that was cancelled cancels its future; the rest of the batch must still resolve.
+        if future.done():
+            return
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            batches = self._stats["batches"]
+            return {
+                **self._stats,
+                "avg_batch_size": round(self._stats["requests"] / batches, 2) if batches else None,
+                "pending": len(self._pending),
+                "window_ms": self.window * 1000.0,
+                "max_items": self.max_items,
+            }
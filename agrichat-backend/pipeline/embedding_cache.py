@@ -0,0 +1,233 @@
+"""Content-addressed embedding cache shared by every caller of ``local_embeddings``.
+
+Vectors are keyed by ``(model, sha256(text))``, where the model identity also
+names the client's vector normalization so unit-length and raw vectors never
+share entries. A bounded in-process LRU
+answers hot lookups; a SQLite file (WAL mode, float32 blobs) backs it on disk
+so all gunicorn workers and PoPs rebuilds reuse each other's work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("agrichat.pipeline.embedding_cache")
+
+_DISABLED_VALUES = {"", "0", "off", "none", "false"}
+
+
+def _default_cache_path() -> Optional[str]:
+    configured = os.getenv("EMBEDDING_CACHE_PATH")
+    if configured is not None:
+        return None if configured.strip().lower() in _DISABLED_VALUES else configured
+    base_path = Path(__file__).resolve().parent.parent
+    return str(base_path / ".cache" / "embeddings.sqlite3")
+
+
+def _default_cache_size() -> int:
+    try:
+        return max(0, int(os.getenv("EMBEDDING_CACHE_SIZE", "4096")))
+    except ValueError:
+        return 4096
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + SQLite) store of embedding vectors."""
+
+    def __init__(self, model: str, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.model = model
+        self.path = path
+        self.max_entries = _default_cache_size() if max_entries is None else max_entries
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._disk_enabled = bool(path)
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_errors": 0}
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self._disk_enabled or not self.path:
+            return None
+        pid = os.getpid()
+        if self._conn is not None and self._conn_pid == pid:
+            return self._conn
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, digest TEXT NOT NULL, dim INTEGER NOT NULL, "
+                "vector BLOB NOT NULL, created_at REAL NOT NULL, PRIMARY KEY (model, digest))"
+            )
+        except Exception as exc:
+            logger.warning("Disabling on-disk embedding cache at %s: %s", self.path, exc)
+            self._disk_enabled = False
+            return None
+        self._conn = conn
+        self._conn_pid = pid
+        return conn
+
+    def _remember(self, digest: str, vector: List[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[digest] = vector
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Return cached vectors aligned with ``texts`` (``None`` for misses)."""
+
+        digests = [_digest(text) for text in texts]
+        found: List[Optional[List[float]]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        with self._lock:
+            for index, digest in enumerate(digests):
+                vector = self._memory.get(digest)
+                if vector is not None:
+                    self._memory.move_to_end(digest)
+                    self._stats["memory_hits"] += 1
+                    found[index] = vector
+                else:
+                    pending.setdefault(digest, []).append(index)
+
+            if pending:
+                for digest, vector in self._load(list(pending)).items():
+                    self._remember(digest, vector)
+                    for index in pending.pop(digest):
+                        self._stats["disk_hits"] += 1
+                        found[index] = vector
+
+            self._stats["misses"] += sum(len(indices) for indices in pending.values())
+        return found
+
+    def _load(self, digests: List[str]) -> Dict[str, List[float]]:
+        conn = self._connection()
+        if conn is None or not digests:
+            return {}
+        loaded: Dict[str, List[float]] = {}
+        try:
+            for start in range(0, len(digests), 500):
+                chunk = digests[start : start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT digest, vector FROM embeddings WHERE model = ? AND digest IN ({placeholders})",
+                    [self.model, *chunk],
+                )
+                for digest, blob in rows:
+                    loaded[digest] = _unpack(blob)
+        except Exception as exc:  # pragma: no cover - disk failure should not break embeddings
+            self._stats["disk_errors"] += 1
+            logger.warning("Embedding cache read failed: %s", exc)
+        return loaded
+
+    def put_many(self, items: Iterable[Tuple[str, Sequence[float]]]) -> None:
+        rows = []
+        now = time.time()
+        with self._lock:
+            for text, vector in items:
+                digest = _digest(text)
+                values = [float(value) for value in vector]
+                self._remember(digest, values)
+                rows.append((self.model, digest, len(values), _pack(values), now))
+
+            conn = self._connection()
+            if conn is None or not rows:
+                return
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, digest, dim, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except Exception as exc:  # pragma: no cover - disk failure should not break embeddings
+                self._stats["disk_errors"] += 1
+                logger.warning("Embedding cache write failed: %s", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            return {
+                **self._stats,
+                "hit_ratio": round(hits / lookups, 4) if lookups else None,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_enabled": self._disk_enabled,
+                "path": self.path,
+                "model": self.model,
+            }
+
+
+class CachedEmbeddings:
+    """Embeddings client that consults an :class:`EmbeddingCache` before the wrapped client."""
+
+    def __init__(self, inner: Any, cache: Optional[EmbeddingCache] = None):
+        self.inner = inner
+        model = getattr(inner, "model", None) or getattr(inner, "model_name", None) or type(inner).__name__
+        normalization = getattr(inner, "normalization", None)
+        if normalization:
+            model = f"{model}#{normalization}"
+        self.cache = cache or EmbeddingCache(str(model), _default_cache_path())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    def embed_documents(self, texts: Iterable[str]) -> List[List[float]]:
+        texts = list(texts)
+        vectors = self.cache.get_many(texts)
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing:
+            unique_texts = list(dict.fromkeys(texts[index] for index in missing))
+            computed = dict(zip(unique_texts, self.inner.embed_documents(unique_texts)))
+            self.cache.put_many(computed.items())
+            for index in missing:
+                vectors[index] = computed[texts[index]]
+        return vectors  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> List[float]:
+        cached = self.cache.get_many([text])[0]
+        if cached is not None:
+            return cached
+        vector = self.inner.embed_query(text)
+        self.cache.put_many([(text, vector)])
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        # The cache lock can be held across a SQLite write, so lookups and stores run in a thread.
+        cached = (await asyncio.to_thread(self.cache.get_many, [text]))[0]
+        if cached is not None:
+            return cached
+        aembed = getattr(self.inner, "aembed_query", None)
+        if aembed is not None:
+            vector = await aembed(text)
+        else:
+            vector = await asyncio.to_thread(self.inner.embed_query, text)
+        await asyncio.to_thread(self.cache.put_many, [(text, vector)])
+        return vector
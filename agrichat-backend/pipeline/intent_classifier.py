@@ -0,0 +1,301 @@
+"""Tiered agricultural intent classification.
+
+Questions are decided by the cheapest tier that is sure of its answer:
+
+1. ``cache`` – a bounded LRU of recent verdicts keyed by the normalised question.
+   Each verdict keeps the tier that decided it and is skipped by requests that
+   disable that tier.
+2. ``dictionary`` – the ``AGRICULTURE_KEYWORDS`` / pattern heuristic.
+3. ``local`` – a logistic-regression model over hashed character n-grams,
+   trained from the seed questions and keywords in :mod:`pipeline.intent_dictionary`
+   and the questions logged in ``fallback_queries.csv``. It only answers when its
+   probability is outside the ``[reject, accept]`` band.
+4. ``llm`` – ``LLMResponder.classify_question_intent``; its definite verdicts
+   are also fed back into the local model.
+
+Settings: ``INTENT_CACHE_SIZE`` (default 2048) bounds the verdict cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import logging
+import math
+import os
+import random
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .intent_dictionary import AGRICULTURE_KEYWORDS, INTENT_SEED_AGRICULTURE, INTENT_SEED_GENERAL
+
+logger = logging.getLogger("agrichat.pipeline.intent_classifier")
+
+TIERS = ("cache", "dictionary", "local", "llm", "undecided")
+
+_FEATURE_BITS = 18
+_NGRAM_SIZES = (3, 4, 5)
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(_WORD_RE.findall((question or "").lower()))
+
+
+def _features(normalized: str) -> np.ndarray:
+    """Hashed word and padded character n-gram ids (stable across processes)."""
+
+    mask = (1 << _FEATURE_BITS) - 1
+    ids = set()
+    for word in normalized.split():
+        ids.add(zlib.crc32(f"w:{word}".encode("utf-8")) & mask)
+        padded = f" {word} "
+        for size in _NGRAM_SIZES:
+            for start in range(max(1, len(padded) - size + 1)):
+                ids.add(zlib.crc32(padded[start:start + size].encode("utf-8")) & mask)
+    return np.fromiter(ids, dtype=np.intp, count=len(ids))
+
+
+class NgramIntentModel:
+    """Binary logistic regression on binary hashed n-gram features."""
+
+    def __init__(self, learning_rate: float = 0.5, l2: float = 1e-4):
+        self.weights = np.zeros(1 << _FEATURE_BITS, dtype=np.float64)
+        self.bias = 0.0
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.examples = 0
+
+    def _logit(self, features: np.ndarray) -> float:
+        if not len(features):
+            return self.bias
+        return float(self.weights[features].sum() / math.sqrt(len(features))) + self.bias
+
+    def probability(self, normalized: str) -> float:
+        logit = max(-30.0, min(30.0, self._logit(_features(normalized))))
+        return 1.0 / (1.0 + math.exp(-logit))
+
+    def _step(self, features: np.ndarray, label: bool, weight: float) -> None:
+        logit = max(-30.0, min(30.0, self._logit(features)))
+        error = (1.0 / (1.0 + math.exp(-logit))) - (1.0 if label else 0.0)
+        scale = self.learning_rate * weight * error
+        if len(features):
+            self.weights[features] -= scale / math.sqrt(len(features)) + self.learning_rate * self.l2 * self.weights[features]
+        self.bias -= scale
+
+    def fit(self, samples: Sequence[Tuple[str, bool]], epochs: int = 12, seed: int = 13) -> None:
+        positives = sum(1 for _, label in samples if label)
+        negatives = len(samples) - positives
+        if not positives or not negatives:
+            return
+        # Fallback logs only add positives, so classes are weighted to stay balanced.
+        class_weight = {True: len(samples) / (2.0 * positives), False: len(samples) / (2.0 * negatives)}
+        encoded = [(_features(text), label) for text, label in samples]
+        order = list(range(len(encoded)))
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(order)
+            for index in order:
+                features, label = encoded[index]
+                self._step(features, label, class_weight[label])
+        self.examples = len(samples)
+
+    def update(self, normalized: str, label: bool) -> None:
+        self._step(_features(normalized), label, 1.0)
+        self.examples += 1
+
+
+def load_logged_questions(path: Path, limit: int = 5000) -> List[str]:
+    """Most recent distinct questions from the fallback log (all passed the intent gate)."""
+
+    if not path.exists():
+        return []
+    questions: "OrderedDict[str, None]" = OrderedDict()
+    try:
+        with path.open(newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                normalized = normalize_question(row.get("question") or "")
+                if normalized:
+                    questions.pop(normalized, None)
+                    questions[normalized] = None
+    except Exception as exc:  # pragma: no cover - unreadable log should not block start-up
+        logger.warning("Could not read intent training questions from %s: %s", path, exc)
+        return []
+    return list(questions)[-limit:]
+
+
+def _default_cache_size() -> int:
+    try:
+        return max(0, int(os.getenv("INTENT_CACHE_SIZE", "2048")))
+    except ValueError:
+        return 2048
+
+
+class IntentClassifier:
+    """Cache → dictionary → local model → LLM, with per-tier counters."""
+
+    def __init__(
+        self,
+        heuristic: Callable[[str], bool],
+        training_log: Optional[Path] = None,
+        *,
+        accept_threshold: float = 0.95,
+        reject_threshold: float = 0.1,
+        cache_size: Optional[int] = None,
+    ):
+        self.heuristic = heuristic
+        self.training_log = training_log
+        self.accept_threshold = accept_threshold
+        self.reject_threshold = reject_threshold
+        self.cache_size = _default_cache_size() if cache_size is None else cache_size
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._model: Optional[NgramIntentModel] = None
+        self._counts = {tier: 0 for tier in TIERS}
+
+    def _training_samples(self) -> List[Tuple[str, bool]]:
+        samples = [(normalize_question(text), True) for text in INTENT_SEED_AGRICULTURE]
+        samples.extend((normalize_question(term), True) for term in sorted(AGRICULTURE_KEYWORDS))
+        samples.extend((normalize_question(text), False) for text in INTENT_SEED_GENERAL)
+        if self.training_log is not None:
+            samples.extend((text, True) for text in load_logged_questions(self.training_log))
+        return samples
+
+    def model(self) -> NgramIntentModel:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    model = NgramIntentModel()
+                    samples = self._training_samples()
+                    model.fit(samples)
+                    logger.info("Trained local intent model on %d questions", len(samples))
+                    self._model = model
+        return self._model
+
+    def _count(self, tier: str) -> None:
+        with self._lock:
+            self._counts[tier] += 1
+
+    def _remember(self, key: str, verdict: Dict[str, Any]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            current = self._cache.get(key)
+            if current is not None and current["tier"] == "llm" and verdict["tier"] != "llm":
+                # A request without the LLM tier must not overwrite the LLM's verdict for everyone else.
+                return
+            self._cache[key] = verdict
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _classify_cheap(self, question: str, use_local: bool, use_llm: bool) -> Tuple[str, Dict[str, Any], bool]:
+        """Run the cache, dictionary and local tiers; the flag says whether one decided."""
+
+        key = normalize_question(question)
+        disabled = {tier for tier, enabled in (("local", use_local), ("llm", use_llm)) if not enabled}
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached["tier"] in disabled:
+                cached = None
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            self._count("cache")
+            return key, {**cached, "tier": "cache", "cached_tier": cached["tier"]}, True
+
+        heuristic_intent = self.heuristic(question)
+        metadata: Dict[str, Any] = {"heuristic": heuristic_intent, "llm_used": False, "llm_result": None}
+        if heuristic_intent:
+            return key, self._decide(key, metadata, True, "dictionary"), True
+
+        if use_local and key:
+            probability = self.model().probability(key)
+            metadata["local_score"] = round(probability, 4)
+            if probability >= self.accept_threshold:
+                return key, self._decide(key, metadata, True, "local"), True
+            if probability <= self.reject_threshold:
+                return key, self._decide(key, metadata, False, "local"), True
+        return key, metadata, False
+
+    def _apply_llm_result(
+        self, key: str, metadata: Dict[str, Any], llm_result: Optional[bool], use_local: bool
+    ) -> Dict[str, Any]:
+        metadata["llm_used"] = True
+        metadata["llm_result"] = llm_result
+        if llm_result is None:
+            return self._undecided(metadata)
+        if use_local and key:
+            model = self.model()
+            with self._lock:
+                model.update(key, llm_result)
+        return self._decide(key, metadata, llm_result, "llm")
+
+    def _undecided(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        # No tier was sure; keep the previous default (refuse) and do not cache it.
+        self._count("undecided")
+        metadata["final"] = False
+        metadata["tier"] = "undecided"
+        return metadata
+
+    def classify(
+        self,
+        question: str,
+        llm_classify: Optional[Callable[[str], Optional[bool]]] = None,
+        *,
+        use_local: bool = True,
+    ) -> Dict[str, Any]:
+        """Intent metadata (``heuristic``, ``llm_used``, ``llm_result``, ``final``, ``tier``)."""
+
+        key, metadata, decided = self._classify_cheap(question, use_local, llm_classify is not None)
+        if decided:
+            return metadata
+        if llm_classify is None:
+            return self._undecided(metadata)
+        return self._apply_llm_result(key, metadata, llm_classify(question), use_local)
+
+    async def aclassify(
+        self,
+        question: str,
+        llm_classify: Optional[Callable[[str], Awaitable[Optional[bool]]]] = None,
+        *,
+        use_local: bool = True,
+    ) -> Dict[str, Any]:
+        """Async :meth:`classify`; the LLM tier is awaited instead of blocking a thread."""
+
+        if use_local and self._model is None:
+            # The first call trains the model, which is too slow for the event loop.
+            await asyncio.to_thread(self.model)
+        key, metadata, decided = self._classify_cheap(question, use_local, llm_classify is not None)
+        if decided:
+            return metadata
+        if llm_classify is None:
+            return self._undecided(metadata)
+        return self._apply_llm_result(key, metadata, await llm_classify(question), use_local)
+
+    def _decide(self, key: str, metadata: Dict[str, Any], verdict: bool, tier: str) -> Dict[str, Any]:
+        self._count(tier)
+        metadata["final"] = bool(verdict)
+        metadata["tier"] = tier
+        if key:
+            self._remember(key, dict(metadata))
+        return metadata
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            cached = len(self._cache)
+        total = sum(counts.values())
+        return {
+            "tiers": counts,
+            "llm_share": round(counts["llm"] / total, 4) if total else 0.0,
+            "cache_entries": cached,
+            "cache_size": self.cache_size,
+            "model_examples": self._model.examples if self._model is not None else 0,
+        }
@@ -162,3 +162,118 @@ AGRICULTURE_KEYWORDS = {
     "wheat",
     "yield",
 }
+
+# Labelled seed questions for the local n-gram intent model. Questions logged
+# in ``fallback_queries.csv`` (which all passed the intent gate) are added to
+# the agricultural side at start-up.
+INTENT_SEED_AGRICULTURE = (
+    "when should i sow mustard in rajasthan",
+    "how much dap should be applied at sowing",
+    "my paddy leaves are turning yellow what should i do",
+    "best time to transplant rice seedlings",
+    "how to control whitefly on cotton",
+    "which groundnut variety suits sandy soil",
+    "how often should drip irrigation run for pomegranate",
+    "what is the recommended spacing for brinjal",
+    "how to treat foot and mouth disease in cows",
+    "my goat is not eating and has diarrhoea",
+    "how many eggs does a desi hen lay",
+    "how to prepare jeevamrut for natural farming",
+    "which fungicide for blast in rice",
+    "how to increase milk production in buffaloes",
+    "what is the seed rate of maize per acre",
+    "how to make compost from crop residue",
+    "can i grow apple in the plains",
+    "how to manage fall armyworm in corn",
+    "what are the symptoms of zinc deficiency in paddy",
+    "how to store onions after harvest",
+    "when to prune mango trees",
+    "how to start mushroom cultivation",
+    "what is the msp for paddy this year",
+    "how to apply for pm kisan",
+    "which crop to grow after harvesting potato",
+    "how to reduce stubble burning",
+    "how to save my crop from frost",
+    "what is the right ph for growing tea",
+    "how to raise a nursery for chilli",
+    "how to control termites in sugarcane",
+    "what fodder should i give dairy animals in summer",
+    "how to prevent lumpy skin disease in cattle",
+    "when to harvest turmeric",
+    "best intercrop with coconut",
+    "how to grow coriander in pots",
+    "what to do about leaf curl in tomato plants",
+    "how to improve soil organic carbon",
+    "which pesticide is safe for okra",
+    "how to manage salinity in my field",
+    "how to do soil testing",
+    "how deep should i plough before sowing",
+    "what is zero tillage wheat",
+    "how to control weeds in soybean",
+    "how to get crop insurance under pmfby",
+    "how to rear fish in a farm pond",
+    "what is the gestation period of a sow",
+    "how much water does banana need",
+    "why are my cucumber flowers dropping",
+    "how to graft guava",
+    "how to protect stored grain from insects",
+    "mere kheton me keede lag gaye hain kya karu",
+    "gehu ki buvai kab kare",
+    "dhan me khad kitni dale",
+    "bhains ka doodh kaise badhaye",
+)
+
+INTENT_SEED_GENERAL = (
+    "who won the cricket world cup",
+    "what is the capital of france",
+    "write a python function to sort a list",
+    "tell me a joke",
+    "what is the weather on mars",
+    "who is the prime minister of japan",
+    "recommend a good movie to watch tonight",
+    "how do i reset my phone password",
+    "what is the meaning of life",
+    "translate hello into german",
+    "how to lose weight fast",
+    "what is bitcoin price today",
+    "explain quantum computing",
+    "write a poem about love",
+    "how to make a resume",
+    "what is the best smartphone under 20000",
+    "how does the stock market work",
+    "who wrote harry potter",
+    "solve this equation x squared minus four",
+    "how to cook biryani",
+    "what time is it in new york",
+    "how to learn english speaking",
+    "book a train ticket to delhi",
+    "what are the symptoms of covid",
+    "how to fix a leaking tap",
+    "who is the richest person in the world",
+    "how to apply for a passport",
+    "which laptop is best for gaming",
+    "explain the theory of relativity",
+    "how to make money online",
+    "what is the plot of the mahabharata",
+    "how to improve my chess rating",
+    "what is machine learning",
+    "sing me a song",
+    "how to tie a tie",
+    "how many planets are in the solar system",
+    "what is the population of china",
+    "how to install windows",
+    "tips for a job interview",
+    "how to meditate",
+    "what is the best holiday destination in europe",
+    "how to open a bank account",
+    "who are you",
+    "what is your name",
+    "how to play guitar",
+    "how to write an essay on independence day",
+    "how do airplanes fly",
+    "what is the score of the football match",
+    "convert 100 dollars to rupees",
+    "how to bake a chocolate cake",
+    "mujhe ek kahani sunao",
+    "aaj ka match kaun jeeta",
+)
@@ -0,0 +1,236 @@
+"""Persisted BM25 inverted index for the Golden and PoPs collections.
+
+The index is built from the documents already stored in Chroma (at ingest
+time or with ``scripts/build_lexical_index.py``) and serves two purposes:
+
+* a lexical candidate list per state that the retrievers fuse with the
+  vector results using reciprocal rank fusion, and
+* keyword-overlap checks answered from precomputed per-document term sets
+  instead of scanning each candidate's text with regular expressions.
+
+Tokens are the ``\\w+`` runs of the lower-cased document, which is exactly
+what ``\\b<word>\\b`` matches against the same text.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import re
+from pathlib import Path
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .metadata_schema import canonical_state
+
+logger = logging.getLogger("agrichat.pipeline.lexical")
+
+INDEX_FILE = "index.json"
+INDEX_FORMAT_VERSION = 1
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Function words carry no lexical signal and have the longest posting lists.
+_QUERY_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "how",
+    "i", "in", "is", "it", "me", "my", "of", "on", "or", "should", "the", "to", "we", "what",
+    "when", "where", "which", "who", "why", "will", "with", "you", "your",
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+@lru_cache(maxsize=1024)
+def document_terms(text: str) -> FrozenSet[str]:
+    """Distinct tokens of a document that is not covered by a lexical index."""
+
+    return frozenset(tokenize(text))
+
+
+def lexical_index_path(collection_name: str, chroma_path: str) -> str:
+    """Directory holding the lexical index of ``collection_name``.
+
+    ``LEXICAL_INDEX_PATH`` overrides the root (default ``<chroma>/lexical``).
+    """
+
+    root = os.getenv("LEXICAL_INDEX_PATH") or os.path.join(chroma_path, "lexical")
+    return os.path.join(root, collection_name)
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = 60) -> Dict[str, float]:
+    """Fuse ranked id lists: ``score(d) = sum(1 / (k + rank))`` with 1-based ranks."""
+
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class LexicalIndex:
+    """BM25 inverted index keyed by row; rows map to collection document ids."""
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        states: Sequence[str],
+        hashes: Sequence[Optional[str]],
+        doc_lengths: Sequence[int],
+        postings: Dict[str, Dict[int, int]],
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.ids = list(ids)
+        self.states = list(states)
+        self.hashes = list(hashes)
+        self.doc_lengths = list(doc_lengths)
+        self.postings = postings
+        self.k1 = k1
+        self.b = b
+        self._rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        row_terms: List[set] = [set() for _ in self.ids]
+        for term, rows in postings.items():
+            for row in rows:
+                row_terms[row].add(term)
+        self._row_terms: List[FrozenSet[str]] = [frozenset(terms) for terms in row_terms]
+        total = sum(self.doc_lengths)
+        self._avg_length = (total / len(self.doc_lengths)) if self.doc_lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_documents(
+        cls,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+    ) -> "LexicalIndex":
+        postings: Dict[str, Dict[int, int]] = {}
+        states: List[str] = []
+        hashes: List[Optional[str]] = []
+        lengths: List[int] = []
+        for row, (document, metadata) in enumerate(zip(documents, metadatas)):
+            metadata = metadata or {}
+            tokens = tokenize(document)
+            lengths.append(len(tokens))
+            states.append(metadata.get("state") or canonical_state(metadata.get("State")))
+            hashes.append(metadata.get("content_hash"))
+            for token in tokens:
+                bucket = postings.setdefault(token, {})
+                bucket[row] = bucket.get(row, 0) + 1
+        return cls(ids, states, hashes, lengths, postings)
+
+    def save(self, path: str) -> None:
+        target = Path(path)
+        target.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_FORMAT_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "ids": self.ids,
+            "states": self.states,
+            "hashes": self.hashes,
+            "doc_lengths": self.doc_lengths,
+            "postings": {term: [[row, tf] for row, tf in rows.items()] for term, rows in self.postings.items()},
+        }
+        tmp = target / f".{INDEX_FILE}.tmp"
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, target / INDEX_FILE)
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        payload = json.loads((Path(path) / INDEX_FILE).read_text(encoding="utf-8"))
+        if payload.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported lexical index version: {payload.get('version')}")
+        postings = {term: {row: tf for row, tf in rows} for term, rows in payload["postings"].items()}
+        index = cls(
+            payload["ids"],
+            payload["states"],
+            payload["hashes"],
+            payload["doc_lengths"],
+            postings,
+            k1=payload.get("k1", 1.5),
+            b=payload.get("b", 0.75),
+        )
+        logger.info("Loaded lexical index from %s (%d documents, %d terms)", path, len(index), len(postings))
+        return index
+
+    def row_for(self, doc_id: Optional[str], content_hash: Optional[str] = None) -> Optional[int]:
+        """Row of ``doc_id``, or ``None`` when unknown or indexed from different content."""
+
+        if not doc_id:
+            return None
+        row = self._rows.get(doc_id)
+        if row is None:
+            return None
+        if content_hash and self.hashes[row] and self.hashes[row] != content_hash:
+            return None
+        return row
+
+    def terms_for(self, row: int) -> FrozenSet[str]:
+        return self._row_terms[row]
+
+    def search(self, query: str, k: int, state_keys: Optional[Sequence[str]] = None) -> List[Tuple[str, str, float]]:
+        """Top BM25 matches as ``(doc_id, state, score)``, at most ``k`` per state key."""
+
+        if not len(self) or k <= 0:
+            return []
+        terms = {token for token in tokenize(query) if token not in _QUERY_STOPWORDS}
+        allowed = set(state_keys) if state_keys else None
+        total = len(self)
+        scores: Dict[int, float] = {}
+        for term in terms:
+            rows = self.postings.get(term)
+            if not rows:
+                continue
+            idf = math.log(1.0 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+            for row, tf in rows.items():
+                if allowed is not None and self.states[row] not in allowed:
+                    continue
+                norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[row] / (self._avg_length or 1.0))
+                scores[row] = scores.get(row, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        per_state: Dict[str, int] = {}
+        results: List[Tuple[str, str, float]] = []
+        for row, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+            state = self.states[row]
+            if per_state.get(state, 0) >= k:
+                continue
+            per_state[state] = per_state.get(state, 0) + 1
+            results.append((self.ids[row], state, score))
+        return results
+
+
+def build_lexical_index(collection: Any, path: str, batch_size: int = 1000) -> Dict[str, Any]:
+    """Index every document of a Chroma ``collection`` and persist it to ``path``."""
+
+    total = collection.count()
+    ids: List[str] = []
+    documents: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+    for offset in range(0, total, batch_size):
+        page = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+        ids.extend(str(doc_id) for doc_id in page.get("ids") or [])
+        documents.extend(document or "" for document in page.get("documents") or [])
+        metadatas.extend(metadata or {} for metadata in page.get("metadatas") or [])
+
+    index = LexicalIndex.from_documents(ids, documents, metadatas)
+    index.save(path)
+    return {"path": path, "documents": len(index), "terms": len(index.postings)}
+
+
+def load_lexical_index(collection_name: str, chroma_path: str) -> Optional[LexicalIndex]:
+    path = lexical_index_path(collection_name, chroma_path)
+    if not os.path.exists(os.path.join(path, INDEX_FILE)):
+        logger.info("No lexical index for %s at %s; using vector retrieval only", collection_name, path)
+        return None
+    try:
+        return LexicalIndex.load(path)
+    except Exception as exc:
+        logger.warning("Lexical index at %s could not be loaded: %s", path, exc)
+        return None
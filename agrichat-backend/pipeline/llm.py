@@ -1,10 +1,15 @@
+import asyncio
 import os
 import re
-from typing import Callable, List, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .llm_adapter import OllamaLLMInterface
+from .llm_adapter import ASYNC_LLM_AVAILABLE, AsyncOllamaLLMInterface, OllamaLLMInterface
 
 from .config import PipelineConfig
+from .scheduler import ANSWER, CLARIFICATION, INTENT, LLMOverloadedError, llm_scheduler
+from .tracing import record
 
 
 GENERAL_REFUSAL = (
@@ -29,6 +34,130 @@ def _conversation_to_text(history: Optional[List[dict]], max_turns: int = 5) ->
 
 TokenCallback = Callable[[str], None]
 
+# Sent byte-for-byte identical on every request so Ollama can reuse its evaluated prefix.
+ANSWER_SYSTEM_PROMPT = (
+    "You are AgriChat, an Indian agricultural expert. Answer the user's question using only agricultural knowledge that applies to Indian conditions.\n"
+    "Respond in clean Markdown that renders well in the chatbot and follow this exact structure:\n"
+    "1. Start with a bold one-sentence summary tailored to the farmer.\n"
+    "2. Provide numbered or bulleted actionable steps covering timings, dosages, and precautions when available.\n"
+    "3. Include a short **Need more detail?** subsection only when extra context (orchard age, variety, region, etc.) would change the advice; list up to two follow-up questions.\n"
+    "4. Finish with a concise tip or reminder relevant to Indian farming practices.\n"
+    "Rules: Begin directly with the summary sentence—do not describe your plan, the instructions, or say phrases like 'We need to answer.' Do not expose internal reasoning or mention that you are an AI.\n"
+    "If precise data is unavailable, state reasonable assumptions and provide best-practice guidance.\n"
+    "If the question is outside agriculture, refuse politely and redirect back to farming topics.\n"
+    "Respond in the same language as the user.\n"
+)
+
+_TIMING_FIELDS = {
+    "prompt_eval_count": "prompt_tokens",
+    "prompt_eval_duration": "prompt_eval_ms",
+    "eval_count": "eval_tokens",
+    "eval_duration": "eval_ms",
+    "load_duration": "load_ms",
+    "total_duration": "total_ms",
+}
+
+
+def extract_timings(data: Any) -> Dict[str, float]:
+    """Ollama's ``done`` timing fields with durations converted from ns to ms."""
+
+    if not isinstance(data, dict):
+        return {}
+    timings: Dict[str, float] = {}
+    for field_name, key in _TIMING_FIELDS.items():
+        value = data.get(field_name)
+        if isinstance(value, (int, float)):
+            timings[key] = round(value / 1e6, 2) if key.endswith("_ms") else value
+    return timings
+
+
+class _GenerationStats:
+    """Running prompt-eval totals, to compare time-to-first-token across deployments."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._totals = {"generations": 0, "prompt_tokens": 0, "prompt_eval_ms": 0.0, "load_ms": 0.0, "eval_tokens": 0, "eval_ms": 0.0}
+        self._last: Dict[str, float] = {}
+
+    def record(self, timings: Dict[str, float]) -> None:
+        if not timings:
+            return
+        with self._lock:
+            self._totals["generations"] += 1
+            for key in ("prompt_tokens", "prompt_eval_ms", "load_ms", "eval_tokens", "eval_ms"):
+                self._totals[key] += timings.get(key, 0)
+            self._last = dict(timings)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = dict(self._totals)
+            last = dict(self._last)
+        count = totals["generations"]
+        return {
+            "generations": count,
+            "avg_prompt_eval_ms": round(totals["prompt_eval_ms"] / count, 2) if count else 0.0,
+            "avg_prompt_tokens": round(totals["prompt_tokens"] / count, 1) if count else 0.0,
+            "avg_load_ms": round(totals["load_ms"] / count, 2) if count else 0.0,
+            "avg_eval_tokens_per_s": round(totals["eval_tokens"] / (totals["eval_ms"] / 1000.0), 2) if totals["eval_ms"] else 0.0,
+            "last": last,
+        }
+
+
+generation_stats = _GenerationStats()
+
+
+class _StreamingSanitizer:
+    """Line-buffered incremental form of :meth:`LLMResponder._sanitize_output`.
+
+    Only lines completed by the newest token are examined; the partial trailing
+    line (and a lone trailing ``\r`` that may start ``\r\n``) is held back. A
+    blank line is emitted only once the next kept line arrives, so the
+    concatenated deltas always equal the batch sanitizer's output.
+    """
+
+    def __init__(self, patterns: List["re.Pattern[str]"]):
+        self._patterns = patterns
+        self._buffer = ""
+        self._parts: List[str] = []
+        self._blank_pending = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def _accept(self, line: str) -> str:
+        stripped = line.strip()
+        if not stripped:
+            if self._parts:
+                self._blank_pending = True
+            return ""
+        if any(pattern.match(stripped) for pattern in self._patterns):
+            return ""
+        if self._parts:
+            stripped = ("\n\n" if self._blank_pending else "\n") + stripped
+        self._blank_pending = False
+        self._parts.append(stripped)
+        return stripped
+
+    def feed(self, chunk: str) -> str:
+        """Consume a token and return the newly sanitized text (possibly empty)."""
+
+        if not chunk:
+            return ""
+        lines = (self._buffer + chunk).splitlines(keepends=True)
+        self._buffer = lines.pop()
+        if self._buffer.endswith("\r") or self._buffer.splitlines() == [self._buffer]:
+            completed = lines
+        else:
+            completed, self._buffer = lines + [self._buffer], ""
+        return "".join(self._accept(line) for line in completed)
+
+    def finish(self) -> str:
+        """Flush the held-back trailing line."""
+
+        remainder, self._buffer = self._buffer, ""
+        return self._accept(remainder) if remainder else ""
+
 
 class LLMResponder:
     _PLANNING_PATTERNS = [
@@ -46,6 +175,7 @@ class LLMResponder:
     def __init__(self, config: PipelineConfig):
         model = os.getenv("PIPELINE_LLM_MODEL", config.llm_model)
         self.interface = OllamaLLMInterface(model_name=model)
+        self.async_interface = AsyncOllamaLLMInterface(model_name=model) if ASYNC_LLM_AVAILABLE else None
         self.config = config
 
     @classmethod
@@ -82,6 +212,79 @@ class LLMResponder:
 
         return "\n".join(normalized).strip()
 
+    @classmethod
+    def _stream_sanitizer(cls) -> _StreamingSanitizer:
+        return _StreamingSanitizer(cls._PLANNING_PATTERNS)
+
+    @staticmethod
+    def _answer_messages(question: str, history: Optional[List[dict]], context: str) -> Tuple[str, str]:
+        """Static system instructions and the per-request user message."""
+
+        convo = _conversation_to_text(history)
+        user = ""
+        if convo:
+            user += f"Conversation so far:\n{convo}\n\n"
+        if context:
+            user += f"Context:\n{context}\n\n"
+        user += f"Question: {question}\nAnswer:"
+        return ANSWER_SYSTEM_PROMPT, user
+
+    @classmethod
+    def _answer_prompt(cls, question: str, history: Optional[List[dict]], context: str) -> str:
+        """Single prompt for interfaces without chat support; the instructions stay a fixed prefix."""
+
+        system, user = cls._answer_messages(question, history, context)
+        return f"{system}\n{user}"
+
+    def _chat_supported(self, interface: Any) -> bool:
+        return hasattr(interface, "chat") and hasattr(interface, "stream_chat")
+
+    @staticmethod
+    def _handle_stream_event(
+        event: dict,
+        sanitizer: _StreamingSanitizer,
+        token_callback: Optional[TokenCallback],
+        timings: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """Feed one streaming event through ``sanitizer`` and forward new text."""
+
+        event_type = event.get("type")
+        if event_type == "raw" and timings is not None:
+            timings.update(extract_timings(event.get("data")))
+        elif event_type == "token":
+            delta = sanitizer.feed(event.get("text", ""))
+            if delta and token_callback:
+                token_callback(delta)
+        elif event_type == "error":
+            message = event.get("message") or "Unknown streaming error"
+            if token_callback:
+                token_callback(f"\n[Streaming error: {message}]\n")
+
+    @staticmethod
+    def _finish_stream(sanitizer: _StreamingSanitizer, token_callback: Optional[TokenCallback]) -> str:
+        delta = sanitizer.finish()
+        if delta and token_callback:
+            token_callback(delta)
+        return sanitizer.text
+
+    def _complete(self, question: str, history: Optional[List[dict]], context: str, timings: Dict[str, float]) -> str:
+        if self._chat_supported(self.interface):
+            system, user = self._answer_messages(question, history, context)
+            data = self.interface.chat(
+                system,
+                user,
+                temperature=self.config.answer_temperature,
+                max_tokens=self.config.max_answer_tokens,
+            )
+            timings.update(extract_timings(data))
+            return ((data.get("message") or {}).get("content") or "").strip()
+        return self.interface.generate_content(
+            self._answer_prompt(question, history, context),
+            temperature=self.config.answer_temperature,
+            max_tokens=self.config.max_answer_tokens,
+            use_fallback=False,
+        )
+
     def generate_answer(
         self,
         question: str,
@@ -90,69 +293,109 @@ class LLMResponder:
         *,
         stream: bool = False,
         token_callback: Optional[TokenCallback] = None,
+        timings: Optional[Dict[str, float]] = None,
     ) -> str:
-        convo = _conversation_to_text(history)
-        prompt = (
-            "You are AgriChat, an Indian agricultural expert. Answer the user's question using only agricultural knowledge that applies to Indian conditions.\n"
-            "Respond in clean Markdown that renders well in the chatbot and follow this exact structure:\n"
-            "1. Start with a bold one-sentence summary tailored to the farmer.\n"
-            "2. Provide numbered or bulleted actionable steps covering timings, dosages, and precautions when available.\n"
-            "3. Include a short **Need more detail?** subsection only when extra context (orchard age, variety, region, etc.) would change the advice; list up to two follow-up questions.\n"
-            "4. Finish with a concise tip or reminder relevant to Indian farming practices.\n"
-            "Rules: Begin directly with the summary sentence—do not describe your plan, the instructions, or say phrases like 'We need to answer.' Do not expose internal reasoning or mention that you are an AI.\n"
-            "If precise data is unavailable, state reasonable assumptions and provide best-practice guidance.\n"
-            "If the question is outside agriculture, refuse politely and redirect back to farming topics.\n"
-            "Respond in the same language as the user.\n"
-        )
-        if convo:
-            prompt += f"\nConversation so far:\n{convo}\n"
-        if context:
-            prompt += f"\nContext:\n{context}\n"
-        prompt += f"\nQuestion: {question}\nAnswer:"
+        """Generate an answer; Ollama's timing fields are copied into ``timings`` when given."""
 
-        if stream:
-            raw_text_parts: List[str] = []
-            emitted_length = 0
-            for event in self.interface.stream_generate(
-                prompt,
-                temperature=self.config.answer_temperature,
-            ):
-                event_type = event.get("type")
-                if event_type == "token":
-                    text = event.get("text", "")
-                    if text:
-                        raw_text_parts.append(text)
-                        if token_callback:
-                            sanitized = self._sanitize_output("".join(raw_text_parts))
-                            delta = sanitized[emitted_length:]
-                            if delta:
-                                token_callback(delta)
-                                emitted_length += len(delta)
-                elif event_type == "error":
-                    message = event.get("message") or "Unknown streaming error"
-                    if token_callback:
-                        token_callback(f"\n[Streaming error: {message}]\n")
-                elif event_type == "raw":
-                    continue
-            final = "".join(raw_text_parts).strip()
-            final = self._sanitize_output(final)
-            if final:
-                return final
-            fallback = self.interface.generate_content(
-                prompt,
-                temperature=self.config.answer_temperature,
-                max_tokens=self.config.max_answer_tokens,
-                use_fallback=False,
-            )
-            return self._sanitize_output(fallback) or "No response generated."
+        timings = {} if timings is None else timings
+        started: Optional[float] = None
+        try:
+            with llm_scheduler.slot(ANSWER):
+                started = time.perf_counter()
+                if stream:
+                    sanitizer = self._stream_sanitizer()
+                    if self._chat_supported(self.interface):
+                        system, user = self._answer_messages(question, history, context)
+                        events = self.interface.stream_chat(system, user, temperature=self.config.answer_temperature)
+                    else:
+                        events = self.interface.stream_generate(
+                            self._answer_prompt(question, history, context),
+                            temperature=self.config.answer_temperature,
+                        )
+                    first_token = True
+                    for event in events:
+                        if first_token and event.get("type") == "token":
+                            first_token = False
+                            record("llm_ttft", time.perf_counter() - started)
+                        self._handle_stream_event(event, sanitizer, token_callback, timings)
+                    final = self._finish_stream(sanitizer, token_callback)
+                    if final:
+                        return final
+                    return self._sanitize_output(self._complete(question, history, context, timings)) or "No response generated."
+
+                return self._sanitize_output(self._complete(question, history, context, timings))
+        finally:
+            self._record_generation(started, stream, timings)
+
+    @staticmethod
+    def _record_generation(started: Optional[float], stream: bool, timings: Dict[str, float]) -> None:
+        # Timed from admission, so time spent queued in the scheduler is not counted.
+        if started is not None:
+            record("llm_generation", time.perf_counter() - started, mode="stream" if stream else "json")
+        generation_stats.record(timings)
 
-        raw_answer = self.interface.generate_content(
-            prompt,
+    async def _acomplete(
+        self, question: str, history: Optional[List[dict]], context: str, timings: Dict[str, float]
+    ) -> str:
+        system, user = self._answer_messages(question, history, context)
+        data = await self.async_interface.achat(
+            system,
+            user,
             temperature=self.config.answer_temperature,
             max_tokens=self.config.max_answer_tokens,
-            use_fallback=False,
         )
-        return self._sanitize_output(raw_answer)
+        timings.update(extract_timings(data))
+        return ((data.get("message") or {}).get("content") or "").strip()
+
+    async def agenerate_answer(
+        self,
+        question: str,
+        history: Optional[List[dict]],
+        context: str = "",
+        *,
+        stream: bool = False,
+        token_callback: Optional[TokenCallback] = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> str:
+        """Async :meth:`generate_answer`; awaits Ollama without holding a thread."""
+
+        if self.async_interface is None:
+            return await asyncio.to_thread(
+                self.generate_answer,
+                question,
+                history,
+                context,
+                stream=stream,
+                token_callback=token_callback,
+                timings=timings,
+            )
+
+        timings = {} if timings is None else timings
+        started: Optional[float] = None
+        try:
+            async with llm_scheduler.aslot(ANSWER):
+                started = time.perf_counter()
+                if stream:
+                    sanitizer = self._stream_sanitizer()
+                    system, user = self._answer_messages(question, history, context)
+                    first_token = True
+                    async for event in self.async_interface.astream_chat(
+                        system,
+                        user,
+                        temperature=self.config.answer_temperature,
+                    ):
+                        if first_token and event.get("type") == "token":
+                            first_token = False
+                            record("llm_ttft", time.perf_counter() - started)
+                        self._handle_stream_event(event, sanitizer, token_callback, timings)
+                    final = self._finish_stream(sanitizer, token_callback)
+                    if final:
+                        return final
+                    return self._sanitize_output(await self._acomplete(question, history, context, timings)) or "No response generated."
+
+                return self._sanitize_output(await self._acomplete(question, history, context, timings))
+        finally:
+            self._record_generation(started, stream, timings)
 
     def suggest_clarifications(self, question: str, failed_sources: List[str]) -> List[str]:
         if not self.config.clarify_with_llm:
@@ -165,35 +408,30 @@ class LLMResponder:
             "Return each question on a new line. If no clarification is needed, respond with 'NONE'.\n"
             f"\nQuestion: {question}\nClarifications:"
         )
-        response = self.interface.generate_content(
-            prompt,
-            temperature=self.config.clarification_temperature,
-            max_tokens=128,
-            use_fallback=False,
-        )
+        with llm_scheduler.slot(CLARIFICATION):
+            response = self.interface.generate_content(
+                prompt,
+                temperature=self.config.clarification_temperature,
+                max_tokens=128,
+                use_fallback=False,
+            )
         suggestions = [line.strip("-• ") for line in response.strip().splitlines() if line.strip()]
         if not suggestions or suggestions[0].upper().startswith("NONE"):
             return []
         return suggestions[: self.config.clarification_max_questions]
 
-    def classify_question_intent(self, question: str) -> Optional[bool]:
-        prompt = (
+    @staticmethod
+    def _intent_prompt(question: str) -> str:
+        return (
             "You are an expert intent classifier for an agricultural assistant focused on Indian farming. "
             "Decide if the user's question is about agriculture, farming, crops, livestock, soil, irrigation, "
             "or any related agricultural practice. Respond with exactly one word: AGRICULTURE if it is relevant, "
             "or NON_AGRICULTURE if it is not."
             f"\n\nQuestion: {question}\nLabel:"
         )
-        try:
-            response = self.interface.generate_content(
-                prompt,
-                temperature=0.0,
-                max_tokens=4,
-                use_fallback=False,
-            )
-        except Exception:
-            return None
 
+    @staticmethod
+    def _parse_intent_label(response: Optional[str]) -> Optional[bool]:
         if not response:
             return None
 
@@ -207,3 +445,34 @@ class LLMResponder:
         if label in {"OTHER", "GENERAL"}:
             return False
         return None
+
+    def classify_question_intent(self, question: str) -> Optional[bool]:
+        try:
+            with llm_scheduler.slot(INTENT):
+                response = self.interface.generate_content(
+                    self._intent_prompt(question),
+                    temperature=0.0,
+                    max_tokens=4,
+                    use_fallback=False,
+                )
+        except LLMOverloadedError:
+            raise
+        except Exception:
+            return None
+        return self._parse_intent_label(response)
+
+    async def aclassify_question_intent(self, question: str) -> Optional[bool]:
+        if self.async_interface is None:
+            return await asyncio.to_thread(self.classify_question_intent, question)
+        try:
+            async with llm_scheduler.aslot(INTENT):
+                response = await self.async_interface.agenerate_content(
+                    self._intent_prompt(question),
+                    temperature=0.0,
+                    max_tokens=4,
+                )
+        except LLMOverloadedError:
+            raise
+        except Exception:
+            return None
+        return self._parse_intent_label(response)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import importlib.util
 import json
 import logging
@@ -10,7 +11,17 @@ from pathlib import Path
 from types import ModuleType
 from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-import requests
+from .embedding_batcher import EmbeddingMicroBatcher
+from .embedding_cache import CachedEmbeddings
+from .ollama_async import (
+    EMBEDDING_NORMALIZATION,
+    AsyncOllamaEmbeddings,
+    AsyncOllamaLLMInterface,
+    arun_local_llm,
+    normalize_embedding,
+)
+from .ollama_transport import ollama_keep_alive, ollama_transport
+from .scheduler import ANSWER, llm_scheduler
 
 logger = logging.getLogger("agrichat.pipeline.llm_adapter")
 
@@ -55,47 +66,89 @@ def get_attr(name: str) -> Any:
         raise ImportError(f"Attribute {name} not found in local_llm_interface") from exc
 
 
-def _ollama_base_url() -> str:
-    host = os.getenv("OLLAMA_HOST", "localhost:11434")
-    if host.startswith("http://") or host.startswith("https://"):
-        return host
-    return f"http://{host}"
-
-
-def _ollama_timeout() -> int:
+def _embed_batch_size() -> int:
     try:
-        return int(os.getenv("OLLAMA_TIMEOUT", "180"))
+        return max(1, int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "64")))
     except ValueError:
-        return 180
+        return 64
 
 
 class _FallbackOllamaEmbeddings:
-    """Minimal embeddings client that talks directly to Ollama."""
+    """Minimal embeddings client that talks directly to Ollama.
+
+    Every method returns unit-length vectors, whichever endpoint produced them,
+    so single, batched and async embeddings are interchangeable.
+    """
+
+    normalization = EMBEDDING_NORMALIZATION
 
     def __init__(self, model: Optional[str] = None):
         self.model = model or os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+        self._batch_supported = True
+        self._batcher = EmbeddingMicroBatcher.from_env(self._embed_batch)
+        self._async = AsyncOllamaEmbeddings(self.model)
 
     def _embed(self, text: str) -> List[float]:
         payload = {"model": self.model, "prompt": text}
-        url = f"{_ollama_base_url()}/api/embeddings"
         try:
-            response = requests.post(url, json=payload, timeout=_ollama_timeout())
+            response = ollama_transport.post("/api/embeddings", profile="embed", json=payload)
             response.raise_for_status()
             data = response.json()
             embedding = data.get("embedding")
             if isinstance(embedding, list):
-                return embedding
+                return normalize_embedding(embedding)
             raise ValueError("Embedding response missing 'embedding' list")
         except Exception as exc:  # pragma: no cover - network failure
             logger.error("Ollama embedding request failed: %s", exc)
             raise
 
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts with one multi-input ``/api/embed`` call."""
+
+        if not texts:
+            return []
+        if not self._batch_supported:
+            return [self._embed(text) for text in texts]
+
+        payload = {"model": self.model, "input": texts}
+        try:
+            response = ollama_transport.post("/api/embed", profile="embed", json=payload)
+            if response.status_code == 404:
+                # Ollama releases before /api/embed only expose the single-prompt endpoint.
+                logger.warning("Ollama /api/embed unavailable; falling back to per-text /api/embeddings")
+                self._batch_supported = False
+                return [self._embed(text) for text in texts]
+            response.raise_for_status()
+            data = response.json()
+            embeddings = data.get("embeddings")
+            if isinstance(embeddings, list) and len(embeddings) == len(texts):
+                return [normalize_embedding(embedding) for embedding in embeddings]
+            raise ValueError("Embedding response missing 'embeddings' list")
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.error("Ollama batch embedding request failed: %s", exc)
+            raise
+
     def embed_documents(self, texts: Iterable[str]) -> List[List[float]]:
-        return [self._embed(text) for text in texts]
+        texts = list(texts)
+        batch_size = _embed_batch_size()
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), batch_size):
+            vectors.extend(self._embed_batch(texts[start : start + batch_size]))
+        return vectors
 
     def embed_query(self, text: str) -> List[float]:
+        if self._batcher is not None:
+            return self._batcher.embed(text)
         return self._embed(text)
 
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        return await self._async.aembed(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        if self._batcher is not None:
+            return await self._batcher.aembed(text)
+        return await self._async.aembed_query(text)
+
 
 class _FallbackOllamaLLMInterface:
     """Lightweight Ollama text generation client."""
@@ -119,8 +172,23 @@ class _FallbackOllamaLLMInterface:
             "prompt": prompt,
             "stream": stream,
             "options": options,
+            "keep_alive": ollama_keep_alive(),
         }
 
+    def _chat_payload(
+        self,
+        system: str,
+        user: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+    ) -> Dict[str, Any]:
+        payload = self._generate_payload("", temperature=temperature, max_tokens=max_tokens, stream=stream)
+        del payload["prompt"]
+        payload["messages"] = [{"role": "system", "content": system}, {"role": "user", "content": user}]
+        return payload
+
     def generate_content(
         self,
         prompt: str,
@@ -130,9 +198,8 @@ class _FallbackOllamaLLMInterface:
         use_fallback: bool = False,  # Reserved for API compatibility
     ) -> str:
         payload = self._generate_payload(prompt, temperature=temperature, max_tokens=max_tokens, stream=False)
-        url = f"{_ollama_base_url()}/api/generate"
         try:
-            response = requests.post(url, json=payload, timeout=_ollama_timeout())
+            response = ollama_transport.post("/api/generate", profile="generate", json=payload)
             response.raise_for_status()
             data = response.json()
             return data.get("response", "").strip()
@@ -148,9 +215,8 @@ class _FallbackOllamaLLMInterface:
         max_tokens: Optional[int] = None,
     ) -> Iterator[Dict[str, Any]]:
         payload = self._generate_payload(prompt, temperature=temperature, max_tokens=max_tokens, stream=True)
-        url = f"{_ollama_base_url()}/api/generate"
         try:
-            with requests.post(url, json=payload, timeout=_ollama_timeout(), stream=True) as response:
+            with ollama_transport.stream("/api/generate", json=payload) as response:
                 response.raise_for_status()
                 for raw_line in response.iter_lines():
                     if not raw_line:
@@ -175,6 +241,62 @@ class _FallbackOllamaLLMInterface:
         except Exception as exc:  # pragma: no cover - network failure
             yield {"type": "error", "message": str(exc)}
 
+    def chat(
+        self,
+        system: str,
+        user: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """One ``/api/chat`` turn; returns Ollama's response including its timing fields."""
+
+        payload = self._chat_payload(system, user, temperature=temperature, max_tokens=max_tokens)
+        try:
+            response = ollama_transport.post("/api/chat", profile="generate", json=payload)
+            response.raise_for_status()
+            return response.json()
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.error("Ollama chat request failed: %s", exc)
+            raise
+
+    def stream_chat(
+        self,
+        system: str,
+        user: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream a ``/api/chat`` turn as the same events as :meth:`stream_generate`."""
+
+        payload = self._chat_payload(system, user, temperature=temperature, max_tokens=max_tokens, stream=True)
+        try:
+            with ollama_transport.stream("/api/chat", json=payload) as response:
+                response.raise_for_status()
+                for raw_line in response.iter_lines():
+                    if not raw_line:
+                        continue
+                    try:
+                        data = json.loads(raw_line)
+                    except json.JSONDecodeError:
+                        yield {"type": "raw", "data": raw_line.decode("utf-8", errors="ignore")}
+                        continue
+
+                    if data.get("done"):
+                        yield {"type": "raw", "data": data}
+                        break
+
+                    if "error" in data:
+                        yield {"type": "error", "message": data.get("error", "Unknown error")}
+                        continue
+
+                    token = (data.get("message") or {}).get("content")
+                    if token:
+                        yield {"type": "token", "text": token}
+        except Exception as exc:  # pragma: no cover - network failure
+            yield {"type": "error", "message": str(exc)}
+
 
 def _fallback_run_local_llm(
     prompt: str,
@@ -193,10 +315,55 @@ def _fallback_run_local_llm(
 
 try:  # Prefer the dedicated golden_pipeline implementation when available.
     OllamaLLMInterface = get_attr("OllamaLLMInterface")
-    local_embeddings = get_attr("local_embeddings")
-    run_local_llm = get_attr("run_local_llm")
+    local_embeddings = CachedEmbeddings(get_attr("local_embeddings"))
+    _run_local_llm = get_attr("run_local_llm")
+    # The legacy adapter may not speak to Ollama directly, so async callers run it in a thread.
+    ASYNC_LLM_AVAILABLE = False
 except (ImportError, FileNotFoundError):
     logger.warning("golden_pipeline local_llm_interface not found; using direct Ollama fallback")
     OllamaLLMInterface = _FallbackOllamaLLMInterface
-    local_embeddings = _FallbackOllamaEmbeddings()
-    run_local_llm = _fallback_run_local_llm
\ No newline at end of file
+    local_embeddings = CachedEmbeddings(_FallbackOllamaEmbeddings())
+    _run_local_llm = _fallback_run_local_llm
+    ASYNC_LLM_AVAILABLE = True
+
+
+def run_local_llm(
+    prompt: str,
+    *,
+    temperature: float = 0.2,
+    max_tokens: Optional[int] = None,
+    model: Optional[str] = None,
+    priority: int = ANSWER,
+) -> str:
+    """Generate with the local LLM once the admission scheduler grants a slot."""
+
+    with llm_scheduler.slot(priority):
+        return _run_local_llm(prompt, temperature=temperature, max_tokens=max_tokens, model=model)
+
+
+async def arun_llm(
+    prompt: str,
+    *,
+    temperature: float = 0.2,
+    max_tokens: Optional[int] = None,
+    model: Optional[str] = None,
+    priority: int = ANSWER,
+) -> str:
+    """Async ``run_local_llm``: native httpx when available, otherwise a worker thread."""
+
+    if ASYNC_LLM_AVAILABLE:
+        async with llm_scheduler.aslot(priority):
+            return await arun_local_llm(prompt, temperature=temperature, max_tokens=max_tokens, model=model)
+    return await asyncio.to_thread(
+        run_local_llm, prompt, temperature=temperature, max_tokens=max_tokens, model=model, priority=priority
+    )
+
+
+def embedding_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters of the shared embedding cache."""
+    return local_embeddings.cache.stats()
+
+def embedding_batcher_stats() -> Optional[Dict[str, Any]]:
+    """Micro-batching counters of the fallback embeddings client (``None`` when disabled)."""
+    batcher = getattr(local_embeddings.inner, "_batcher", None)
+    return batcher.stats() if batcher is not None else None
@@ -0,0 +1,96 @@
+"""Canonical metadata schema shared by the Golden and PoPs Chroma collections.
+
+Every document carries the same filterable keys regardless of how it was
+ingested:
+
+* ``state`` – lower-cased canonical state name, or ``"general"`` for
+  nationwide content. Retrievers filter on this key with a single query.
+* ``State`` – human-readable canonical state name used for display.
+* ``crop`` – lower-cased crop label (``"general"`` when not crop specific).
+* ``doc_type`` – ``golden_qa`` or ``package_of_practices``.
+* ``content_hash`` – sha256 of the page content.
+* ``schema_version`` – bumped whenever this layout changes.
+
+The collection itself records the schema version its documents follow under
+``SCHEMA_VERSION_KEY`` and how its stored vectors are normalized under
+``EMBEDDING_NORMALIZATION_KEY``; ``scripts/migrate_collection_metadata.py``
+stamps both.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from .state_utils import normalize_state_name
+
+METADATA_SCHEMA_VERSION = 1
+
+SCHEMA_VERSION_KEY = "agrichat:schema_version"
+EMBEDDING_NORMALIZATION_KEY = "agrichat:embedding_normalization"
+
+GENERAL_STATE = "general"
+GENERAL_CROP = "general"
+
+DOC_TYPE_GOLDEN = "golden_qa"
+DOC_TYPE_POPS = "package_of_practices"
+
+_GENERAL_STATE_TOKENS = {"", "general", "india", "nationwide", "all", "pan-india", "pan india", "all india"}
+
+
+def collection_markers(embedding_normalization: Optional[str]) -> Dict[str, Any]:
+    """Collection-level metadata declaring a collection canonical, for builders and the migration."""
+
+    markers: Dict[str, Any] = {SCHEMA_VERSION_KEY: METADATA_SCHEMA_VERSION}
+    if embedding_normalization:
+        markers[EMBEDDING_NORMALIZATION_KEY] = embedding_normalization
+    return markers
+
+
+def canonical_state_display(value: Optional[str]) -> str:
+    """Human-readable canonical state name (``"General"`` for nationwide content)."""
+
+    raw = (value or "").strip()
+    if raw.lower() in _GENERAL_STATE_TOKENS:
+        return "General"
+    return normalize_state_name(raw) or raw.title()
+
+
+def canonical_state(value: Optional[str]) -> str:
+    """Filter key for a state name: lower-cased canonical name or ``"general"``."""
+
+    display = canonical_state_display(value)
+    if display == "General":
+        return GENERAL_STATE
+    return display.lower()
+
+
+def canonical_crop(value: Optional[str]) -> str:
+    normalized = " ".join((value or "").replace("_", " ").split()).lower()
+    return normalized or GENERAL_CROP
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def canonicalize_metadata(metadata: Optional[Dict[str, Any]], content: str, doc_type: str) -> Dict[str, Any]:
+    """Return ``metadata`` with the canonical keys filled in; unrelated keys are preserved."""
+
+    source = dict(metadata or {})
+    raw_state = source.get("State")
+    if raw_state is None:
+        raw_state = source.get("state")
+    if doc_type == DOC_TYPE_POPS:
+        raw_crop = source.get("Crop") or source.get("crop") or source.get("name")
+    else:
+        raw_crop = source.get("Crop") or source.get("crop")
+
+    canonical = dict(source)
+    canonical["State"] = canonical_state_display(raw_state)
+    canonical["state"] = canonical_state(raw_state)
+    canonical["crop"] = canonical_crop(raw_crop)
+    canonical["doc_type"] = doc_type
+    canonical["content_hash"] = content_hash(content)
+    canonical["schema_version"] = METADATA_SCHEMA_VERSION
+    return canonical
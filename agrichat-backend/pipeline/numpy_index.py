@@ -0,0 +1,252 @@
+"""In-memory exact-search vector index backed by a memory-mapped snapshot.
+
+The Golden collection is small enough to sit in RAM. A snapshot directory
+holds the vectors as one contiguous float32 ``.npy`` matrix (memory-mapped
+read-only, so every gunicorn worker shares the same pages), precomputed row
+norms, and a JSON file with ids, documents and metadata. Top-k is one
+matrix-vector product plus a boolean metadata mask.
+
+Build a snapshot with ``scripts/build_golden_snapshot.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .types import VectorMatch
+
+logger = logging.getLogger("agrichat.pipeline.numpy_index")
+
+VECTORS_FILE = "vectors.npy"
+NORMS_FILE = "norms.npy"
+RECORDS_FILE = "records.json"
+
+_SUPPORTED_SPACES = {"l2", "cosine", "ip"}
+
+
+def collection_space(collection: Any) -> str:
+    """Distance space of a Chroma collection (``l2`` unless configured otherwise)."""
+
+    configuration = getattr(collection, "configuration_json", None) or {}
+    space = (configuration.get("hnsw") or {}).get("space") if isinstance(configuration, dict) else None
+    if not space:
+        space = (getattr(collection, "metadata", None) or {}).get("hnsw:space")
+    return space or "l2"
+
+
+def build_snapshot(collection: Any, path: str, batch_size: int = 1000) -> Dict[str, Any]:
+    """Export every vector, document and metadata row of ``collection`` into ``path``."""
+
+    space = collection_space(collection)
+    if space not in _SUPPORTED_SPACES:
+        raise ValueError(f"Unsupported distance space for snapshot: {space}")
+
+    total = collection.count()
+    ids: List[str] = []
+    documents: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+    vectors: List[np.ndarray] = []
+    for offset in range(0, total, batch_size):
+        page = collection.get(
+            include=["embeddings", "documents", "metadatas"],
+            limit=batch_size,
+            offset=offset,
+        )
+        ids.extend(str(doc_id) for doc_id in page.get("ids") or [])
+        documents.extend(document or "" for document in page.get("documents") or [])
+        metadatas.extend(metadata or {} for metadata in page.get("metadatas") or [])
+        embeddings = page.get("embeddings")
+        if embeddings is not None and len(embeddings):
+            vectors.append(np.asarray(embeddings, dtype=np.float32))
+
+    matrix = np.concatenate(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+    if len(matrix) != len(ids):
+        raise ValueError(f"Snapshot mismatch: {len(matrix)} vectors for {len(ids)} ids")
+
+    target = Path(path)
+    target.mkdir(parents=True, exist_ok=True)
+    # Write to temporary names first so running workers never map a half-written file.
+    for name, array in ((VECTORS_FILE, matrix), (NORMS_FILE, np.linalg.norm(matrix, axis=1).astype(np.float32))):
+        tmp = target / f".{name}.tmp"
+        with tmp.open("wb") as handle:
+            np.save(handle, np.ascontiguousarray(array))
+        os.replace(tmp, target / name)
+    records_tmp = target / f".{RECORDS_FILE}.tmp"
+    records_tmp.write_text(
+        json.dumps(
+            {
+                "space": space,
+                "collection_metadata": dict(getattr(collection, "metadata", None) or {}),
+                "ids": ids,
+                "documents": documents,
+                "metadatas": metadatas,
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    os.replace(records_tmp, target / RECORDS_FILE)
+
+    return {"path": str(target), "documents": len(ids), "dimensions": int(matrix.shape[1]) if matrix.size else 0, "space": space}
+
+
+def space_distances(space: str, vectors: np.ndarray, norms: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Distances from ``query`` to each row of ``vectors`` as Chroma reports them in ``space``."""
+
+    dots = vectors @ query
+    if space == "ip":
+        return 1.0 - dots
+    query_norm = float(np.linalg.norm(query))
+    if space == "cosine":
+        denominator = norms * query_norm
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 1.0 - np.where(denominator > 0, dots / denominator, 0.0)
+    # Squared L2, matching Chroma's default "l2" space.
+    return np.maximum(norms * norms + query_norm * query_norm - 2.0 * dots, 0.0)
+
+
+class NumpyVectorIndex:
+    """Exact nearest-neighbour search over a memory-mapped snapshot."""
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        norms: np.ndarray,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        space: str = "l2",
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        if space not in _SUPPORTED_SPACES:
+            raise ValueError(f"Unsupported distance space: {space}")
+        self.metadata = dict(metadata or {})
+        self.vectors = vectors
+        self.norms = norms
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = list(metadatas)
+        self.space = space
+        self._field_rows: Dict[str, Dict[Any, np.ndarray]] = {}
+        self._id_rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyVectorIndex":
+        base = Path(path)
+        records = json.loads((base / RECORDS_FILE).read_text(encoding="utf-8"))
+        vectors = np.load(base / VECTORS_FILE, mmap_mode="r")
+        norms = np.load(base / NORMS_FILE, mmap_mode="r")
+        index = cls(
+            vectors,
+            norms,
+            records["ids"],
+            records["documents"],
+            records["metadatas"],
+            space=records.get("space", "l2"),
+            metadata=records.get("collection_metadata"),
+        )
+        logger.info("Loaded numpy vector index from %s (%d documents)", path, len(index))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _rows_by_value(self, field: str) -> Dict[Any, np.ndarray]:
+        rows = self._field_rows.get(field)
+        if rows is None:
+            grouped: Dict[Any, List[int]] = {}
+            for row, metadata in enumerate(self.metadatas):
+                grouped.setdefault(metadata.get(field), []).append(row)
+            rows = {value: np.asarray(indices, dtype=np.intp) for value, indices in grouped.items()}
+            self._field_rows[field] = rows
+        return rows
+
+    def _mask(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        if not where:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        for field, condition in where.items():
+            if isinstance(condition, dict):
+                if set(condition) == {"$in"}:
+                    allowed = list(condition["$in"])
+                elif set(condition) == {"$eq"}:
+                    allowed = [condition["$eq"]]
+                else:
+                    raise ValueError(f"Unsupported filter operator for {field}: {condition}")
+            else:
+                allowed = [condition]
+            rows = self._rows_by_value(field)
+            field_mask = np.zeros(len(self), dtype=bool)
+            for value in allowed:
+                matched = rows.get(value)
+                if matched is not None:
+                    field_mask[matched] = True
+            mask &= field_mask
+        return mask
+
+    def _distances(self, query: np.ndarray) -> np.ndarray:
+        return space_distances(self.space, self.vectors, self.norms, query)
+
+    def query_by_vector(
+        self,
+        vector: Sequence[float],
+        k: int,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[VectorMatch]:
+        if not len(self) or k <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        distances = self._distances(query)
+        mask = self._mask(where)
+        if mask is not None:
+            candidates = np.flatnonzero(mask)
+            if not len(candidates):
+                return []
+            distances = distances[candidates]
+        else:
+            candidates = np.arange(len(self))
+
+        top = min(k, len(candidates))
+        order = np.argpartition(distances, top - 1)[:top] if top < len(candidates) else np.arange(len(candidates))
+        order = order[np.argsort(distances[order], kind="stable")]
+
+        matches: List[VectorMatch] = []
+        for position in order:
+            row = int(candidates[position])
+            matches.append(
+                VectorMatch(
+                    doc_id=self.ids[row],
+                    content=self.documents[row],
+                    metadata=dict(self.metadatas[row]),
+                    distance=float(distances[position]),
+                    embedding=self.vectors[row],
+                )
+            )
+        return matches
+
+    def get_by_ids(self, ids: Sequence[str], vector: Sequence[float]) -> List[VectorMatch]:
+        """Rows for ``ids`` (unknown ids are skipped) with distances to ``vector``."""
+
+        rows = [self._id_rows[doc_id] for doc_id in ids if doc_id in self._id_rows]
+        if not rows:
+            return []
+        selected = np.asarray(rows, dtype=np.intp)
+        distances = space_distances(
+            self.space, self.vectors[selected], self.norms[selected], np.asarray(vector, dtype=np.float32)
+        )
+        return [
+            VectorMatch(
+                doc_id=self.ids[row],
+                content=self.documents[row],
+                metadata=dict(self.metadatas[row]),
+                distance=float(distance),
+                embedding=self.vectors[row],
+            )
+            for row, distance in zip(rows, distances.tolist())
+        ]
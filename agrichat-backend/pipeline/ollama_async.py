@@ -0,0 +1,318 @@
+"""Native asyncio Ollama clients.
+
+Counterparts of the fallback ``requests`` clients in ``llm_adapter`` built on
+``httpx.AsyncClient``. A generation awaited here holds no thread while Ollama
+works, so the FastAPI event loop can keep many slow generations in flight.
+Timeouts, pool size and retry budget follow the same ``OLLAMA_*`` settings as
+:mod:`pipeline.ollama_transport`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from .ollama_transport import _env_float, _env_int, ollama_base_url, ollama_keep_alive, timeout_profiles
+
+logger = logging.getLogger("agrichat.pipeline.ollama_async")
+
+
+def _httpx_timeout(profile: Tuple[float, float]) -> httpx.Timeout:
+    connect, read = profile
+    return httpx.Timeout(read, connect=connect)
+
+
+class AsyncOllamaTransport:
+    """One pooled ``httpx.AsyncClient`` per event loop and process."""
+
+    def __init__(self) -> None:
+        self.pool_size = max(1, _env_int("OLLAMA_POOL_SIZE", 16))
+        self.max_retries = max(0, _env_int("OLLAMA_MAX_RETRIES", 2))
+        self.backoff = max(0.0, _env_float("OLLAMA_RETRY_BACKOFF_MS", 100.0)) / 1000.0
+        self.timeouts = timeout_profiles()
+        self._clients: Dict[Tuple[int, int], httpx.AsyncClient] = {}
+        self._stats = {"requests": 0, "retries": 0, "connection_errors": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    def _client(self) -> httpx.AsyncClient:
+        # Clients are bound to the loop that created them and must not cross a fork.
+        key = (os.getpid(), id(asyncio.get_running_loop()))
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=ollama_base_url(),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                timeout=_httpx_timeout(self.timeouts["generate"]),
+            )
+            self._clients[key] = client
+        return client
+
+    def _track(self, delta: int) -> None:
+        self._stats["in_flight"] += delta
+        if delta > 0:
+            self._stats["requests"] += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+
+    async def _with_retries(self, method: str, path: str, send):
+        attempt = 0
+        while True:
+            try:
+                return await send()
+            except (httpx.ConnectError, httpx.RemoteProtocolError) as exc:
+                self._stats["connection_errors"] += 1
+                if attempt >= self.max_retries:
+                    raise
+                delay = random.uniform(0.0, self.backoff * (2 ** attempt))
+                attempt += 1
+                self._stats["retries"] += 1
+                logger.warning("Ollama %s %s failed (%s); retry %d/%d in %.0fms", method, path, exc, attempt, self.max_retries, delay * 1000)
+                await asyncio.sleep(delay)
+
+    async def post(self, path: str, *, profile: str = "generate", json_body: Dict[str, Any]) -> httpx.Response:
+        client = self._client()
+        timeout = _httpx_timeout(self.timeouts[profile])
+        self._track(1)
+        try:
+            return await self._with_retries(
+                "POST", path, lambda: client.post(path, json=json_body, timeout=timeout)
+            )
+        finally:
+            self._track(-1)
+
+    @asynccontextmanager
+    async def stream(self, path: str, *, json_body: Dict[str, Any]) -> AsyncIterator[httpx.Response]:
+        client = self._client()
+        timeout = _httpx_timeout(self.timeouts["stream"])
+        self._track(1)
+        try:
+            request = client.build_request("POST", path, json=json_body, timeout=timeout)
+            response = await self._with_retries("POST", path, lambda: client.send(request, stream=True))
+            try:
+                yield response
+            finally:
+                await response.aclose()
+        finally:
+            self._track(-1)
+
+    async def aclose(self) -> None:
+        pid = os.getpid()
+        for key, client in list(self._clients.items()):
+            if key[0] == pid:
+                await client.aclose()
+            self._clients.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = dict(self._stats)
+        snapshot["pool_size"] = self.pool_size
+        snapshot["clients"] = sum(1 for key in self._clients if key[0] == os.getpid())
+        return snapshot
+
+
+async_ollama_transport = AsyncOllamaTransport()
+
+# Vectors from every embeddings client are scaled to unit length: ``/api/embed``
+# already returns them that way, ``/api/embeddings`` does not.
+EMBEDDING_NORMALIZATION = "l2"
+
+
+def normalize_embedding(vector: List[float]) -> List[float]:
+    """``vector`` scaled to unit L2 norm (zero vectors are returned unchanged)."""
+
+    norm = math.sqrt(sum(value * value for value in vector))
+    if not norm:
+        return list(vector)
+    return [value / norm for value in vector]
+
+
+class AsyncOllamaEmbeddings:
+    """Async embeddings client using the multi-input ``/api/embed`` endpoint."""
+
+    normalization = EMBEDDING_NORMALIZATION
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+        self._batch_supported = True
+
+    async def _aembed_single(self, text: str) -> List[float]:
+        response = await async_ollama_transport.post(
+            "/api/embeddings", profile="embed", json_body={"model": self.model, "prompt": text}
+        )
+        response.raise_for_status()
+        embedding = response.json().get("embedding")
+        if isinstance(embedding, list):
+            return normalize_embedding(embedding)
+        raise ValueError("Embedding response missing 'embedding' list")
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        if not self._batch_supported:
+            return list(await asyncio.gather(*(self._aembed_single(text) for text in texts)))
+        try:
+            response = await async_ollama_transport.post(
+                "/api/embed", profile="embed", json_body={"model": self.model, "input": texts}
+            )
+            if response.status_code == 404:
+                logger.warning("Ollama /api/embed unavailable; falling back to per-text /api/embeddings")
+                self._batch_supported = False
+                return await self.aembed(texts)
+            response.raise_for_status()
+            embeddings = response.json().get("embeddings")
+            if isinstance(embeddings, list) and len(embeddings) == len(texts):
+                return [normalize_embedding(embedding) for embedding in embeddings]
+            raise ValueError("Embedding response missing 'embeddings' list")
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.error("Ollama async embedding request failed: %s", exc)
+            raise
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed([text]))[0]
+
+
+class AsyncOllamaLLMInterface:
+    """Async text generation client with the same payloads as the sync fallback."""
+
+    def __init__(self, model_name: Optional[str] = None):
+        self.model_name = model_name or os.getenv("PIPELINE_LLM_MODEL", "gpt-oss:latest")
+
+    def _generate_payload(
+        self,
+        prompt: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+    ) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"temperature": float(temperature)}
+        if max_tokens is not None:
+            options["num_predict"] = max_tokens
+        return {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": stream,
+            "options": options,
+            "keep_alive": ollama_keep_alive(),
+        }
+
+    def _chat_payload(
+        self,
+        system: str,
+        user: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+    ) -> Dict[str, Any]:
+        payload = self._generate_payload("", temperature=temperature, max_tokens=max_tokens, stream=stream)
+        del payload["prompt"]
+        payload["messages"] = [{"role": "system", "content": system}, {"role": "user", "content": user}]
+        return payload
+
+    async def agenerate_content(
+        self,
+        prompt: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        payload = self._generate_payload(prompt, temperature=temperature, max_tokens=max_tokens)
+        try:
+            response = await async_ollama_transport.post("/api/generate", json_body=payload)
+            response.raise_for_status()
+            return response.json().get("response", "").strip()
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.error("Ollama async generate request failed: %s", exc)
+            raise
+
+    async def _astream(self, path: str, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the same ``token``/``raw``/``error`` events as ``stream_generate``."""
+
+        try:
+            async with async_ollama_transport.stream(path, json_body=payload) as response:
+                response.raise_for_status()
+                async for raw_line in response.aiter_lines():
+                    if not raw_line:
+                        continue
+                    try:
+                        data = json.loads(raw_line)
+                    except json.JSONDecodeError:
+                        yield {"type": "raw", "data": raw_line}
+                        continue
+
+                    if data.get("done"):
+                        yield {"type": "raw", "data": data}
+                        break
+
+                    if "error" in data:
+                        yield {"type": "error", "message": data.get("error", "Unknown error")}
+                        continue
+
+                    token = data.get("response") if "response" in data else (data.get("message") or {}).get("content")
+                    if token:
+                        yield {"type": "token", "text": token}
+        except Exception as exc:  # pragma: no cover - network failure
+            yield {"type": "error", "message": str(exc)}
+
+    async def astream_generate(
+        self,
+        prompt: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        payload = self._generate_payload(prompt, temperature=temperature, max_tokens=max_tokens, stream=True)
+        async for event in self._astream("/api/generate", payload):
+            yield event
+
+    async def achat(
+        self,
+        system: str,
+        user: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """One ``/api/chat`` turn; returns Ollama's response including its timing fields."""
+
+        payload = self._chat_payload(system, user, temperature=temperature, max_tokens=max_tokens)
+        try:
+            response = await async_ollama_transport.post("/api/chat", json_body=payload)
+            response.raise_for_status()
+            return response.json()
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.error("Ollama async chat request failed: %s", exc)
+            raise
+
+    async def astream_chat(
+        self,
+        system: str,
+        user: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        payload = self._chat_payload(system, user, temperature=temperature, max_tokens=max_tokens, stream=True)
+        async for event in self._astream("/api/chat", payload):
+            yield event
+
+
+async def arun_local_llm(
+    prompt: str,
+    *,
+    temperature: float = 0.2,
+    max_tokens: Optional[int] = None,
+    model: Optional[str] = None,
+) -> str:
+    interface = AsyncOllamaLLMInterface(model_name=model)
+    return await interface.agenerate_content(prompt, temperature=temperature, max_tokens=max_tokens)
+
+
+def async_transport_stats() -> Dict[str, Any]:
+    return async_ollama_transport.stats()
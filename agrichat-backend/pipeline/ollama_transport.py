@@ -0,0 +1,210 @@
+"""Shared keep-alive HTTP transport for every Ollama call.
+
+Each worker process owns one ``requests.Session`` whose connection pool is
+reused by embeddings, generation, streaming and health probes. Calls pick a
+timeout profile so a slow generation never shares the budget of a quick
+embedding, and connection-level failures (resets, refused connects) are
+retried a bounded number of times with jittered exponential backoff.
+
+Settings (all optional):
+
+* ``OLLAMA_POOL_SIZE`` – connections kept per worker (default 16).
+* ``OLLAMA_CONNECT_TIMEOUT`` – seconds to establish a connection (default 5).
+* ``OLLAMA_EMBED_TIMEOUT`` – read timeout for embeddings (default 60).
+* ``OLLAMA_GENERATE_TIMEOUT`` – read timeout for generation (default ``OLLAMA_TIMEOUT`` or 180).
+* ``OLLAMA_STREAM_TIMEOUT`` – max silence between streamed chunks (default ``OLLAMA_TIMEOUT`` or 180).
+* ``OLLAMA_MAX_RETRIES`` / ``OLLAMA_RETRY_BACKOFF_MS`` – retry budget (default 2 / 100ms).
+* ``OLLAMA_KEEP_ALIVE`` – how long Ollama keeps the model (and its prompt cache) loaded after a
+  generation (default ``30m``; ``-1`` keeps it loaded indefinitely).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("agrichat.pipeline.ollama_transport")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def ollama_base_url() -> str:
+    host = os.getenv("OLLAMA_HOST", "localhost:11434")
+    if host.startswith("http://") or host.startswith("https://"):
+        return host.rstrip("/")
+    return f"http://{host}"
+
+
+def ollama_keep_alive() -> Any:
+    value = os.getenv("OLLAMA_KEEP_ALIVE", "30m").strip()
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def timeout_profiles() -> Dict[str, Tuple[float, float]]:
+    connect = _env_float("OLLAMA_CONNECT_TIMEOUT", 5.0)
+    legacy = _env_float("OLLAMA_TIMEOUT", 180.0)
+    return {
+        "embed": (connect, _env_float("OLLAMA_EMBED_TIMEOUT", 60.0)),
+        "generate": (connect, _env_float("OLLAMA_GENERATE_TIMEOUT", legacy)),
+        "stream": (connect, _env_float("OLLAMA_STREAM_TIMEOUT", legacy)),
+        "health": (min(connect, 2.0), 2.0),
+    }
+
+
+class OllamaTransport:
+    """Per-process pooled session with timeout profiles and bounded retries."""
+
+    def __init__(
+        self,
+        *,
+        pool_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_ms: Optional[float] = None,
+    ):
+        self.pool_size = max(1, pool_size if pool_size is not None else _env_int("OLLAMA_POOL_SIZE", 16))
+        self.max_retries = max(0, max_retries if max_retries is not None else _env_int("OLLAMA_MAX_RETRIES", 2))
+        self.backoff = max(0.0, backoff_ms if backoff_ms is not None else _env_float("OLLAMA_RETRY_BACKOFF_MS", 100.0)) / 1000.0
+        self.timeouts = timeout_profiles()
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._adapter: Optional[HTTPAdapter] = None
+        self._owner_pid: Optional[int] = None
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "connection_errors": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+        }
+
+    def _get_session(self) -> requests.Session:
+        pid = os.getpid()
+        if self._session is not None and self._owner_pid == pid:
+            return self._session
+        with self._lock:
+            if self._session is None or self._owner_pid != pid:
+                # Pooled sockets must not be shared across a fork, so each worker builds its own pool.
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=0)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session, self._adapter, self._owner_pid = session, adapter, pid
+        return self._session
+
+    def _track(self, delta: int) -> None:
+        with self._lock:
+            self._stats["in_flight"] += delta
+            if delta > 0:
+                self._stats["requests"] += 1
+                self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+
+    def _send(self, method: str, path: str, profile: str, retries: int, **kwargs: Any) -> requests.Response:
+        session = self._get_session()
+        url = f"{ollama_base_url()}{path}"
+        attempt = 0
+        while True:
+            try:
+                return session.request(method, url, timeout=self.timeouts[profile], **kwargs)
+            except requests.ConnectionError as exc:
+                with self._lock:
+                    self._stats["connection_errors"] += 1
+                if attempt >= retries:
+                    raise
+                delay = random.uniform(0.0, self.backoff * (2 ** attempt))
+                attempt += 1
+                with self._lock:
+                    self._stats["retries"] += 1
+                logger.warning("Ollama %s %s failed (%s); retry %d/%d in %.0fms", method, path, exc, attempt, retries, delay * 1000)
+                time.sleep(delay)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        profile: str = "generate",
+        retries: Optional[int] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a non-streaming request; the response body is read before returning."""
+
+        self._track(1)
+        try:
+            response = self._send(method, path, profile, self.max_retries if retries is None else retries, **kwargs)
+            _ = response.content  # read the body so the connection returns to the pool
+            return response
+        finally:
+            self._track(-1)
+
+    def post(self, path: str, *, profile: str = "generate", **kwargs: Any) -> requests.Response:
+        return self.request("POST", path, profile=profile, **kwargs)
+
+    def get(self, path: str, *, profile: str = "health", **kwargs: Any) -> requests.Response:
+        return self.request("GET", path, profile=profile, **kwargs)
+
+    @contextmanager
+    def stream(self, path: str, **kwargs: Any) -> Iterator[requests.Response]:
+        """POST with a streamed body; the connection returns to the pool on exit."""
+
+        self._track(1)
+        try:
+            response = self._send("POST", path, "stream", self.max_retries, stream=True, **kwargs)
+            try:
+                yield response
+            finally:
+                response.close()
+        finally:
+            self._track(-1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._stats)
+        snapshot["pool_size"] = self.pool_size
+        snapshot["utilisation"] = round(snapshot["in_flight"] / self.pool_size, 3)
+        snapshot["timeouts"] = {name: list(value) for name, value in self.timeouts.items()}
+
+        opened = idle = 0
+        adapter = self._adapter if self._owner_pid == os.getpid() else None
+        if adapter is not None:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened += getattr(pool, "num_connections", 0)
+                queue = getattr(pool, "pool", None)
+                idle += sum(1 for conn in list(getattr(queue, "queue", [])) if conn is not None)
+        snapshot["connections_opened"] = opened
+        snapshot["idle_connections"] = idle
+        return snapshot
+
+
+ollama_transport = OllamaTransport()
+
+
+def ollama_transport_stats() -> Dict[str, Any]:
+    """Pool utilisation and retry counters of the shared Ollama transport."""
+    return ollama_transport.stats()
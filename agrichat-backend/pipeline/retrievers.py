@@ -1,13 +1,19 @@
 import re
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from langchain_community.vectorstores import Chroma
 
 from .llm_adapter import local_embeddings
 
 from .config import PipelineConfig
-from .types import RetrieverHit
+from .lexical import LexicalIndex, reciprocal_rank_fusion
+from .metadata_schema import GENERAL_STATE, canonical_state, canonical_state_display
+from .numpy_index import NumpyVectorIndex
+from .tracing import span
+from .types import QueryVector, RetrieverHit, VectorMatch
+from .vectorstores import fetch_by_ids, query_by_vector, uses_legacy_metadata
 
 
 @dataclass
@@ -16,7 +22,6 @@ class RetrieverConfig:
     thresholds: float
 
 
-GENERAL_STATE_TOKENS = {"general", "india", "nationwide", "all", "pan-india"}
 GENERAL_CROP_TOKENS = {
     "general",
     "all",
@@ -30,32 +35,211 @@ GENERAL_CROP_TOKENS = {
 }
 
 
-def _normalize_state(value: Optional[str]) -> str:
-    return (value or "").strip().lower()
-
-
-def _is_general_state(value: Optional[str]) -> bool:
-    normalized = _normalize_state(value)
-    return normalized in GENERAL_STATE_TOKENS or normalized == ""
-
-
-def _compute_cosine(text_a: str, text_b: str) -> float:
-    query_vec = local_embeddings.embed_query(text_a)
-    doc_vec = local_embeddings.embed_query(text_b)
-    dot = sum(a * b for a, b in zip(query_vec, doc_vec))
-    norm_q = sum(a * a for a in query_vec) ** 0.5
-    norm_d = sum(a * a for a in doc_vec) ** 0.5
-    if norm_q == 0 or norm_d == 0:
-        return 0.0
-    return dot / (norm_q * norm_d)
+def _state_keys(states: Sequence[str]) -> List[str]:
+    """Canonical ``state`` filter keys in priority order, without duplicates."""
+
+    keys: List[str] = []
+    for state in states:
+        key = canonical_state(state)
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def _cosine_scores(query_vector: Sequence[float], matches: Sequence[VectorMatch]) -> List[Optional[float]]:
+    """Cosine similarity of the query against each match's stored embedding."""
+
+    scores: List[Optional[float]] = [None] * len(matches)
+    rows = [index for index, match in enumerate(matches) if match.embedding is not None]
+    if not rows:
+        return scores
+
+    query = np.asarray(query_vector, dtype=np.float32)
+    docs = np.asarray([matches[index].embedding for index in rows], dtype=np.float32)
+    query_norm = float(np.linalg.norm(query))
+    doc_norms = np.linalg.norm(docs, axis=1)
+    if query_norm == 0:
+        for index in rows:
+            scores[index] = 0.0
+        return scores
+
+    dots = docs @ query
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosines = np.where(doc_norms > 0, dots / (doc_norms * query_norm), 0.0)
+    for index, cosine in zip(rows, cosines.tolist()):
+        scores[index] = float(cosine)
+    return scores
+
+
+def _safe_query(store: Union[Chroma, NumpyVectorIndex], query_vector: Sequence[float], k: int, where=None) -> List[VectorMatch]:
+    try:
+        return query_by_vector(store, query_vector, k, where)
+    except Exception:
+        return []
+
+
+def _legacy_state_where(state_key: str) -> Optional[Dict[str, Any]]:
+    """``State`` filter matching the casings older collections stored for ``state_key``."""
+
+    if state_key == GENERAL_STATE:
+        return None
+    variants = [state_key, state_key.title(), state_key.upper(), canonical_state_display(state_key)]
+    return {"State": {"$in": list(dict.fromkeys(variants))}}
+
+
+def _query_legacy_states(
+    store: Union[Chroma, NumpyVectorIndex],
+    query_vector: Sequence[float],
+    state_keys: Sequence[str],
+    k: int,
+) -> Dict[str, List[VectorMatch]]:
+    """Per-state queries for collections without the canonical ``state`` key.
+
+    Filters on the raw ``State`` values and falls back to an unfiltered query,
+    keeping only matches whose ``State`` normalizes to the requested key.
+    """
+
+    partitions: Dict[str, List[VectorMatch]] = {}
+    for state_key in state_keys:
+        where = _legacy_state_where(state_key)
+        matches = _safe_query(store, query_vector, k, where)
+        if not matches and where is not None:
+            matches = _safe_query(store, query_vector, k)
+        partitions[state_key] = [
+            match for match in matches if canonical_state(match.metadata.get("State")) == state_key
+        ][:k]
+    return partitions
+
+
+def _query_states(
+    store: Union[Chroma, NumpyVectorIndex],
+    query_vector: Sequence[float],
+    state_keys: Sequence[str],
+    k: int,
+    collection: str,
+    legacy: bool = False,
+) -> Dict[str, List[VectorMatch]]:
+    """Probe the index once for all states and partition the matches by state key.
+
+    The query over-fetches ``k`` per state, but one dense state can still crowd
+    the others out of it (and filtered HNSW search may return short), so every
+    partition left with fewer than ``k`` matches is re-read with its own
+    ``{"state": key}`` query. Partitions keep the
+    index's distance ordering. ``legacy`` collections are queried state by
+    state on their raw ``State`` values.
+    """
+
+    if not state_keys:
+        return {}
+    if legacy:
+        with span("retrieval", collection=collection):
+            return _query_legacy_states(store, query_vector, state_keys, k)
+    if len(state_keys) == 1:
+        where: Dict[str, Any] = {"state": state_keys[0]}
+    else:
+        where = {"state": {"$in": list(state_keys)}}
+
+    partitions: Dict[str, List[VectorMatch]] = {key: [] for key in state_keys}
+    with span("retrieval", collection=collection):
+        matches = _safe_query(store, query_vector, k * len(state_keys), where)
+        for match in matches:
+            bucket = partitions.get(match.metadata.get("state"))
+            if bucket is not None and len(bucket) < k:
+                bucket.append(match)
+        if len(state_keys) > 1:
+            for key, bucket in partitions.items():
+                if len(bucket) < k:
+                    partitions[key] = [
+                        match for match in _safe_query(store, query_vector, k, {"state": key})
+                        if match.metadata.get("state") == key
+                    ]
+    return partitions
+
+
+def _fuse_lexical(
+    store: Union[Chroma, NumpyVectorIndex],
+    lexical: LexicalIndex,
+    question: str,
+    query_vector: Sequence[float],
+    partitions: Dict[str, List[VectorMatch]],
+    k: int,
+    rrf_k: int,
+) -> Dict[str, List[Tuple[VectorMatch, float]]]:
+    """Merge BM25 candidates into each state partition with reciprocal rank fusion.
+
+    Returns, per state key, up to ``k`` matches ordered by fused score.
+    Candidates found only lexically are loaded from the store so they carry a
+    distance and embedding like any vector match.
+    """
+
+    lexical_ranked: Dict[str, List[str]] = {key: [] for key in partitions}
+    for doc_id, state_key, _score in lexical.search(question, k, list(partitions)):
+        lexical_ranked[state_key].append(doc_id)
+
+    known = {match.doc_id: match for matches in partitions.values() for match in matches}
+    missing = [doc_id for ranked in lexical_ranked.values() for doc_id in ranked if doc_id not in known]
+    if missing:
+        try:
+            for match in fetch_by_ids(store, missing, query_vector):
+                known[match.doc_id] = match
+        except Exception:
+            pass
+
+    fused: Dict[str, List[Tuple[VectorMatch, float]]] = {}
+    for state_key, matches in partitions.items():
+        scores = reciprocal_rank_fusion(
+            [[match.doc_id for match in matches], lexical_ranked[state_key]],
+            k=rrf_k,
+        )
+        ranked = sorted(
+            (doc_id for doc_id in scores if doc_id in known),
+            key=lambda doc_id: -scores[doc_id],
+        )
+        fused[state_key] = [(known[doc_id], scores[doc_id]) for doc_id in ranked[:k]]
+    return fused
+
+
+def _ranked_partitions(
+    store: Union[Chroma, NumpyVectorIndex],
+    lexical: Optional[LexicalIndex],
+    question: str,
+    query_vector: Sequence[float],
+    state_keys: Sequence[str],
+    k: int,
+    config: PipelineConfig,
+    collection: str,
+    legacy: bool = False,
+) -> Dict[str, List[Tuple[VectorMatch, Optional[float]]]]:
+    partitions = _query_states(store, query_vector, state_keys, k, collection, legacy)
+    if config.hybrid_retrieval and lexical is not None and state_keys:
+        with span("lexical_fusion", collection=collection):
+            return _fuse_lexical(store, lexical, question, query_vector, partitions, k, config.rrf_k)
+    return {key: [(match, None) for match in matches] for key, matches in partitions.items()}
+
+
+def _sort_hits(hits: List[RetrieverHit]) -> None:
+    if any(hit.fusion_score is not None for hit in hits):
+        hits.sort(key=lambda h: (-(h.fusion_score or 0.0), -(h.cosine or 0.0)))
+    else:
+        hits.sort(key=lambda h: (-(h.cosine or 0.0), h.distance or 9999.0))
 
 
 class GoldenRetriever:
-    def __init__(self, store: Chroma, config: PipelineConfig):
+    def __init__(
+        self,
+        store: Optional[Union[Chroma, NumpyVectorIndex]],
+        config: PipelineConfig,
+        lexical: Optional[LexicalIndex] = None,
+    ):
         self.store = store
         self.config = config
+        self.lexical = lexical
+        self.legacy_metadata = store is not None and uses_legacy_metadata(store)
         self._question_cache: dict[str, str] = {}
 
+    def available(self) -> bool:
+        return self.store is not None
+
     def _question_lower(self, question: str) -> str:
         cached = self._question_cache.get(question)
         if cached is not None:
@@ -86,169 +270,120 @@ class GoldenRetriever:
                 return True
         return False
 
-    def _iter_results(
+    def search(
         self,
         question: str,
-        enforce_match: bool,
-        state: str,
-    ) -> Iterable[tuple]:
-        """Yield (doc, distance) pairs with graceful fallbacks for metadata casing mismatches."""
-
-        if not enforce_match:
-            try:
-                yield from self.store.similarity_search_with_score(question, k=self.config.golden_k)
-            except Exception:
-                return
-            return
-
-        candidate_filters = [state]
-        upper_state = state.upper()
-        if upper_state not in candidate_filters:
-            candidate_filters.append(upper_state)
-        title_state = state.title()
-        if title_state not in candidate_filters:
-            candidate_filters.append(title_state)
-
-        for candidate in candidate_filters:
-            try:
-                results = self.store.similarity_search_with_score(
-                    question,
-                    k=self.config.golden_k,
-                    filter={"State": candidate},
-                )
-            except Exception:
-                results = []
-            if results:
-                for item in results:
-                    yield item
-                return
-
-        try:
-            results = self.store.similarity_search_with_score(question, k=self.config.golden_k)
-        except Exception:
-            results = []
-        for item in results:
-            yield item
+        states: Sequence[str],
+        query: Optional[QueryVector] = None,
+    ) -> List[RetrieverHit]:
+        if not self.available():
+            return []
 
-    def search(self, question: str, states: Sequence[str]) -> List[RetrieverHit]:
         hits: List[RetrieverHit] = []
         question_lower = self._question_lower(question)
-        for state in states:
-            normalized_state = _normalize_state(state)
-            filter_dict = None
-            enforce_match = normalized_state not in GENERAL_STATE_TOKENS and normalized_state != ""
-            results_iter = self._iter_results(question, enforce_match, state)
-            state_hits: List[RetrieverHit] = []
-            for doc, distance in results_iter:
-                metadata = getattr(doc, "metadata", {}) or {}
-                doc_state = metadata.get("State")
-                normalized_doc_state = _normalize_state(doc_state)
-
-                if enforce_match and normalized_doc_state != normalized_state:
-                    continue
-
-                if not enforce_match and not _is_general_state(normalized_doc_state):
-                    continue
-
-                crop_label = metadata.get("Crop") or metadata.get("crop")
+        query_vector = (query or QueryVector(question, local_embeddings.embed_query)).vector
+        state_keys = _state_keys(states)
+        partitions = _ranked_partitions(
+            self.store,
+            self.lexical,
+            question,
+            query_vector,
+            state_keys,
+            self.config.golden_k,
+            self.config,
+            "golden",
+            self.legacy_metadata,
+        )
+        for state_key in state_keys:
+            candidates: List[VectorMatch] = []
+            fusion_scores: List[Optional[float]] = []
+            for match, fusion_score in partitions[state_key]:
+                crop_label = match.metadata.get("Crop") or match.metadata.get("crop")
                 if not self._question_mentions_phrase(question_lower, crop_label):
                     continue
 
-                cosine = _compute_cosine(question, doc.page_content)
-                state_hits.append(
-                    RetrieverHit(
-                        source="Golden Database",
-                        content=doc.page_content,
-                        metadata=metadata,
-                        distance=distance,
-                        cosine=cosine,
-                        state_used=doc_state or state,
-                    )
+                candidates.append(match)
+                fusion_scores.append(fusion_score)
+
+            if not candidates:
+                continue
+
+            with span("cosine_scoring", collection="golden"):
+                cosines = _cosine_scores(query_vector, candidates)
+            state_hits = [
+                RetrieverHit(
+                    source="Golden Database",
+                    content=match.content,
+                    metadata=match.metadata,
+                    distance=match.distance,
+                    cosine=cosine,
+                    state_used=match.metadata.get("State") or state_key,
+                    doc_id=match.doc_id,
+                    fusion_score=fusion_score,
                 )
-
-            if state_hits:
-                state_hits.sort(key=lambda h: (-(h.cosine or 0.0), h.distance or 9999.0))
-                return state_hits
+                for match, cosine, fusion_score in zip(candidates, cosines, fusion_scores)
+            ]
+            _sort_hits(state_hits)
+            return state_hits
 
         return hits
 
 
 class PopsRetriever:
-    def __init__(self, store: Optional[Chroma], config: PipelineConfig):
+    def __init__(self, store: Optional[Chroma], config: PipelineConfig, lexical: Optional[LexicalIndex] = None):
         self.store = store
         self.config = config
+        self.lexical = lexical
+        self.legacy_metadata = store is not None and uses_legacy_metadata(store)
 
     def available(self) -> bool:
         return self.store is not None
 
-    def search(self, question: str, states: Sequence[str]) -> List[RetrieverHit]:
+    def search(
+        self,
+        question: str,
+        states: Sequence[str],
+        query: Optional[QueryVector] = None,
+    ) -> List[RetrieverHit]:
         if not self.available():
             return []
 
         hits: List[RetrieverHit] = []
-        question_lower = question.lower()
-        for state in states:
-            normalized_state = _normalize_state(state)
-            enforce_match = normalized_state not in GENERAL_STATE_TOKENS and normalized_state != ""
-            candidate_filters = [state]
-            if enforce_match:
-                upper_state = state.upper()
-                if upper_state not in candidate_filters:
-                    candidate_filters.append(upper_state)
-                title_state = state.title()
-                if title_state not in candidate_filters:
-                    candidate_filters.append(title_state)
-            else:
-                candidate_filters = [None]
-
-            results = []
-            for candidate in candidate_filters:
-                try:
-                    results = self.store.similarity_search_with_score(
-                        question,
-                        k=self.config.pops_k,
-                        filter=None if candidate is None else {"State": candidate},
-                    )
-                except Exception:
-                    results = []
-                if results:
-                    break
-            if not results and enforce_match:
-                try:
-                    results = self.store.similarity_search_with_score(question, k=self.config.pops_k)
-                except Exception:
-                    results = []
-
-            state_hits: List[RetrieverHit] = []
-            for doc, distance in results:
-                cosine = _compute_cosine(question, doc.page_content)
-                metadata = getattr(doc, "metadata", {}) or {}
-                doc_state = metadata.get("State")
-                normalized_doc_state = _normalize_state(doc_state)
-
-                if enforce_match and normalized_doc_state != normalized_state:
-                    continue
-
-                if not enforce_match and not _is_general_state(normalized_doc_state):
-                    continue
-
-                crop_label = metadata.get("Crop") or metadata.get("crop")
-                if not GoldenRetriever._question_mentions_phrase(question_lower, crop_label):
-                    continue
-
+        query_vector = (query or QueryVector(question, local_embeddings.embed_query)).vector
+        state_keys = _state_keys(states)
+        partitions = _ranked_partitions(
+            self.store,
+            self.lexical,
+            question,
+            query_vector,
+            state_keys,
+            self.config.pops_k,
+            self.config,
+            "pops",
+            self.legacy_metadata,
+        )
+        for state_key in state_keys:
+            # PoPs documents cover a whole crop package, so only the state gate applies here.
+            state_matches = [match for match, _ in partitions[state_key]]
+            fusion_scores = [fusion_score for _, fusion_score in partitions[state_key]]
+
+            with span("cosine_scoring", collection="pops"):
+                cosines = _cosine_scores(query_vector, state_matches)
+            for match, cosine, fusion_score in zip(state_matches, cosines, fusion_scores):
                 hits.append(
                     RetrieverHit(
                         source="PoPs Database",
-                        content=doc.page_content,
-                        metadata=metadata,
-                        distance=distance,
+                        content=match.content,
+                        metadata=match.metadata,
+                        distance=match.distance,
                         cosine=cosine,
-                        state_used=doc_state or state,
+                        state_used=match.metadata.get("State") or state_key,
+                        doc_id=match.doc_id,
+                        fusion_score=fusion_score,
                     )
                 )
-                state_hits.append(hits[-1])
 
-            if state_hits and enforce_match:
+            if state_matches and state_key != GENERAL_STATE:
                 break
-        hits.sort(key=lambda h: (-(h.cosine or 0.0), h.distance or 9999.0))
+        _sort_hits(hits)
         return hits
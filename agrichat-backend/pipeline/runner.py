@@ -1,21 +1,33 @@
+import asyncio
 import csv
+import functools
 import logging
 import os
 import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from copy import deepcopy
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
 
 import requests
 
+from .answer_cache import SemanticAnswerCache, override_signature
 from .config import DEFAULT_CONFIG, PipelineConfig
+from .intent_classifier import IntentClassifier
 from .intent_dictionary import AGRICULTURE_KEYWORDS
 from .llm import GENERAL_REFUSAL, LLMResponder
+from .llm_adapter import local_embeddings
 from .state_utils import prioritize_states
-from .types import PipelineResult, RetrievalDiagnostics, RetrieverHit
+from .types import PipelineResult, QueryVector, RetrievalDiagnostics, RetrieverHit
+from .lexical import LexicalIndex, document_terms
 from .vectorstores import VectorStores
 from .retrievers import GoldenRetriever, PopsRetriever
+from .scheduler import LLMOverloadedError
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -42,12 +54,85 @@ def _is_agricultural_question(question: str) -> bool:
     return any(re.search(pattern, q) for pattern in patterns)
 
 
+def _timed_call(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000.0
+
+
+def _discard_speculative(future: Future, started: float, golden_ms: float) -> Dict[str, Any]:
+    """Drop a speculative PoPs search once Golden answered and report the wasted work."""
+
+    if future.cancel():
+        return {"used": False, "golden_ms": round(golden_ms, 2), "wasted_ms": 0.0, "cancelled": True}
+    if future.done():
+        try:
+            _, pops_ms = future.result()
+        except Exception:
+            pops_ms = (time.perf_counter() - started) * 1000.0
+        return {"used": False, "golden_ms": round(golden_ms, 2), "wasted_ms": round(pops_ms, 2)}
+    # Still running: it finishes in the background and its result is ignored.
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return {"used": False, "golden_ms": round(golden_ms, 2), "wasted_ms": round(elapsed_ms, 2), "still_running": True}
+
+
+def _resolve_clarifications(
+    future: Optional[Future],
+    wait_ms: float,
+    callback: Optional[Callable[[List[str]], None]],
+) -> Tuple[List[str], bool]:
+    """Clarifications ready within ``wait_ms``, and whether they were deferred.
+
+    Late suggestions are handed to ``callback`` when they arrive; without a
+    callback they are dropped so they never delay the answer.
+    """
+
+    if future is None:
+        return [], False
+    try:
+        return future.result(timeout=max(0.0, wait_ms) / 1000.0), False
+    except FutureTimeoutError:
+        if callback is None:
+            future.cancel()
+            return [], False
+        future.add_done_callback(functools.partial(_forward_clarifications, callback))
+        return [], True
+    except Exception as exc:  # pragma: no cover - network/runtime failure
+        logger.warning("Clarification suggestions failed: %s", exc)
+        return [], False
+
+
+def _forward_clarifications(callback: Callable[[List[str]], None], future: Future) -> None:
+    # Always report back, even with nothing, so a waiting stream can close promptly.
+    if future.cancelled() or future.exception() is not None:
+        callback([])
+    else:
+        callback(future.result() or [])
+
+
+LLM_UNAVAILABLE_MESSAGE = (
+    "The AI reasoning engine is currently unavailable. Please confirm the Ollama service is running "
+    "and retry your question shortly."
+)
+
+
+@dataclass
+class _PendingGeneration:
+    """Pipeline state handed from retrieval to LLM generation."""
+
+    question: str
+    history: Optional[List[Dict[str, str]]]
+    context: str
+    responder: LLMResponder
+    finish: Callable[[str, Optional[str], Optional[Dict[str, float]]], PipelineResult]
+
+
 class PipelineRunner:
     def __init__(self, config: PipelineConfig = DEFAULT_CONFIG):
         self.config = config
-        self.stores = VectorStores()
-        self.golden = GoldenRetriever(self.stores.golden, config)
-        self.pops = PopsRetriever(self.stores.pops, config)
+        self.stores = VectorStores(golden_backend=config.golden_backend)
+        self.golden = GoldenRetriever(self.stores.golden, config, self.stores.golden_lexical)
+        self.pops = PopsRetriever(self.stores.pops, config, self.stores.pops_lexical)
         self.llm = LLMResponder(config)
 
         fallback_path = os.environ.get("FALLBACK_LOG_PATH")
@@ -57,6 +142,38 @@ class PipelineRunner:
             default_root = Path(__file__).resolve().parent.parent
             self._fallback_log_path = (default_root / "fallback_queries.csv").resolve()
 
+        self.answer_cache = SemanticAnswerCache(threshold=config.answer_cache_threshold)
+        self.intent = IntentClassifier(
+            _is_agricultural_question,
+            training_log=self._fallback_log_path,
+            accept_threshold=config.local_intent_accept,
+            reject_threshold=config.local_intent_reject,
+        )
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._clarification_pool: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _speculative_executor(self, config: PipelineConfig) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max(1, config.speculative_max_workers),
+                        thread_name_prefix="speculative-retrieval",
+                    )
+        return self._executor
+
+    def _clarification_executor(self, config: PipelineConfig) -> ThreadPoolExecutor:
+        if self._clarification_pool is None:
+            with self._executor_lock:
+                if self._clarification_pool is None:
+                    self._clarification_pool = ThreadPoolExecutor(
+                        max_workers=max(1, config.clarification_max_workers),
+                        thread_name_prefix="clarifications",
+                    )
+        return self._clarification_pool
+
     @staticmethod
     def _clamp_threshold(value: float) -> float:
         return max(0.0, min(1.0, value))
@@ -179,7 +296,6 @@ class PipelineRunner:
         self,
         golden_hits: List[RetrieverHit],
         pops_hits: List[RetrieverHit],
-        clarifying_questions: List[str],
     ) -> Tuple[str, Dict[str, List[Dict[str, Optional[float]]]]]:
         sections: List[str] = []
         meta: Dict[str, List[Dict[str, Optional[float]]]] = {}
@@ -194,11 +310,6 @@ class PipelineRunner:
             sections.append(pops_section)
             meta["pops"] = pops_meta
 
-        if clarifying_questions:
-            sections.append(
-                "Clarifying prompts:\n" + "\n".join(f"- {question}" for question in clarifying_questions)
-            )
-
         context = "\n\n".join(sections).strip()
         return context, meta
 
@@ -311,30 +422,37 @@ class PipelineRunner:
         return list(variants)
 
     @classmethod
-    def _keyword_in_text(cls, keyword: str, text: str) -> bool:
-        for variant in cls._keyword_variants(keyword):
-            if not variant:
-                continue
-            if re.search(rf"\b{re.escape(variant)}\b", text):
-                return True
-        return False
+    def _keyword_variant_sets(cls, keywords: List[str]) -> List[FrozenSet[str]]:
+        """Variant set of each distinct keyword, in first-seen order."""
 
-    @classmethod
-    def _hit_has_keyword_overlap(cls, keywords: List[str], content: str) -> bool:
-        if not keywords:
-            return True
-        text = content.lower()
-        unique_keywords: List[str] = []
         seen: set[str] = set()
+        variant_sets: List[FrozenSet[str]] = []
         for keyword in keywords:
             if keyword in seen:
                 continue
             seen.add(keyword)
-            unique_keywords.append(keyword)
-        if not unique_keywords:
+            variant_sets.append(frozenset(variant for variant in cls._keyword_variants(keyword) if variant))
+        return variant_sets
+
+    @classmethod
+    def _hit_has_keyword_overlap(
+        cls,
+        keywords: List[str],
+        content: str,
+        terms: Optional[FrozenSet[str]] = None,
+        variant_sets: Optional[List[FrozenSet[str]]] = None,
+    ) -> bool:
+        if not keywords:
+            return True
+        if variant_sets is None:
+            variant_sets = cls._keyword_variant_sets(keywords)
+        if not variant_sets:
             return True
-        matches = sum(1 for keyword in unique_keywords if cls._keyword_in_text(keyword, text))
-        total = len(unique_keywords)
+        if terms is None:
+            terms = document_terms(content)
+        # Document terms are the \w+ tokens of the lowered text, i.e. exactly what \b<variant>\b matches.
+        matches = sum(1 for variants in variant_sets if not variants.isdisjoint(terms))
+        total = len(variant_sets)
         if total == 1:
             required = 1
         elif total == 2:
@@ -363,76 +481,131 @@ class PipelineRunner:
         keywords: List[str],
         *,
         dynamic_multiplier: float = 1.0,
+        lexical: Optional[LexicalIndex] = None,
     ) -> Tuple[Optional[RetrieverHit], bool]:
         filtered_for_context = False
+        variant_sets = self._keyword_variant_sets(keywords)
         for hit in hits:
             if not self._hit_passes_threshold(hit, thresholds, dynamic_multiplier):
                 continue
-            if not self._hit_has_keyword_overlap(keywords, hit.content):
+            row = lexical.row_for(hit.doc_id, (hit.metadata or {}).get("content_hash")) if lexical else None
+            terms = lexical.terms_for(row) if row is not None else None
+            if not self._hit_has_keyword_overlap(keywords, hit.content, terms, variant_sets):
                 filtered_for_context = True
                 continue
             return hit, filtered_for_context
         return None, filtered_for_context
 
-    def classify_question_intent(self, question: str) -> Dict[str, Optional[bool]]:
-        """Determine whether a question is agricultural using dictionary + LLM."""
-        heuristic_intent = _is_agricultural_question(question)
-        intent_metadata: Dict[str, Optional[bool]] = {
-            "heuristic": heuristic_intent,
-            "llm_used": False,
-            "llm_result": None,
-        }
+    @staticmethod
+    def _classification_text(question: str, conversation_history: Optional[List[Dict[str, str]]]) -> str:
+        """Prefix a follow-up with the recent user questions so it is judged in context."""
+
+        recent = [
+            (entry.get("question") or entry.get("content") or "").strip()
+            for entry in (conversation_history or [])
+            if entry.get("question") or entry.get("role") == "user"
+        ]
+        recent_context = " \n".join(message for message in recent[-3:] if message)
+        if recent_context:
+            return f"{recent_context}\nFollow-up: {question}"
+        return question
 
-        intent_allowed = heuristic_intent
-        if not heuristic_intent and self.config.use_llm_intent_classifier and self.config.enable_llm:
-            intent_metadata["llm_used"] = True
-            llm_result = self.llm.classify_question_intent(question)
-            intent_metadata["llm_result"] = llm_result
-            if llm_result is not None:
-                intent_allowed = llm_result
+    def _request_config(self, config_overrides: Optional[Dict[str, Any]]) -> PipelineConfig:
+        config = deepcopy(self.config)
+        if config_overrides:
+            config = self._apply_config_overrides(config, config_overrides)
+        return config
 
-        intent_metadata["final"] = bool(intent_allowed)
-        return intent_metadata
+    def _classify_intent(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        config: PipelineConfig,
+        llm_responder: LLMResponder,
+    ) -> Dict[str, Any]:
+        llm_classify = (
+            llm_responder.classify_question_intent
+            if config.use_llm_intent_classifier and config.enable_llm
+            else None
+        )
+        with span("intent") as labels:
+            metadata = self.intent.classify(
+                self._classification_text(question, conversation_history),
+                llm_classify,
+                use_local=config.local_intent_classifier,
+            )
+            labels["tier"] = metadata.get("tier")
+        return metadata
 
-    def answer(
+    def classify_question_intent(
+        self, question: str, conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Optional[bool]]:
+        """Determine whether a question is agricultural (cache, dictionary, local model, then LLM)."""
+        return self._classify_intent(question, conversation_history, self.config, self.llm)
+
+    async def aclassify_intent(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        *,
+        config_overrides: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Intent stage of :meth:`aanswer`; an LLM verdict is awaited, never blocking the loop."""
+
+        config = self._request_config(config_overrides)
+        llm_responder = self.llm if not config_overrides else LLMResponder(config)
+        llm_classify = (
+            llm_responder.aclassify_question_intent
+            if config.use_llm_intent_classifier and config.enable_llm
+            else None
+        )
+        with span("intent") as labels:
+            metadata = await self.intent.aclassify(
+                self._classification_text(question, conversation_history),
+                llm_classify,
+                use_local=config.local_intent_classifier,
+            )
+            labels["tier"] = metadata.get("tier")
+        return metadata
+
+    def _prepare_answer(
         self,
         question: str,
         conversation_history: Optional[List[Dict[str, str]]] = None,
         user_state: Optional[str] = None,
         *,
-        stream: bool = False,
-        token_callback: Optional[Callable[[str], None]] = None,
         intent_metadata: Optional[Dict[str, Optional[bool]]] = None,
         config_overrides: Optional[Dict[str, Any]] = None,
-    ) -> PipelineResult:
+        query_vector: Optional[QueryVector] = None,
+        clarifications_callback: Optional[Callable[[List[str]], None]] = None,
+    ) -> Union[PipelineResult, "_PendingGeneration"]:
+        """Run intent, retrieval and every non-LLM exit of the pipeline.
+
+        Returns a finished :class:`PipelineResult`, or a :class:`_PendingGeneration`
+        when the answer still has to be generated by the LLM. Clarifications that
+        miss ``clarification_wait_ms`` are passed to ``clarifications_callback``
+        when they arrive (and dropped if there is none).
+        """
         diagnostics = RetrievalDiagnostics()
-        config = deepcopy(self.config)
+        config = self._request_config(config_overrides)
         overrides_payload = config_overrides or {}
-        if overrides_payload:
-            config = self._apply_config_overrides(config, overrides_payload)
         raw_config_metadata = overrides_payload.get("raw_database_config") if overrides_payload else None
 
-        golden_retriever = self.golden if not overrides_payload else GoldenRetriever(self.stores.golden, config)
-        pops_retriever = self.pops if not overrides_payload else PopsRetriever(self.stores.pops, config)
+        golden_retriever = (
+            self.golden
+            if not overrides_payload
+            else GoldenRetriever(self.stores.golden, config, self.stores.golden_lexical)
+        )
+        pops_retriever = (
+            self.pops
+            if not overrides_payload
+            else PopsRetriever(self.stores.pops, config, self.stores.pops_lexical)
+        )
         llm_responder = self.llm if not overrides_payload else LLMResponder(config)
 
         if intent_metadata is None:
-            heuristic_intent = _is_agricultural_question(question)
-            intent_metadata = {
-                "heuristic": heuristic_intent,
-                "llm_used": False,
-                "llm_result": None,
-            }
-            intent_allowed = heuristic_intent
-            if not heuristic_intent and config.use_llm_intent_classifier and config.enable_llm:
-                intent_metadata["llm_used"] = True
-                llm_result = llm_responder.classify_question_intent(question)
-                intent_metadata["llm_result"] = llm_result
-                if llm_result is not None:
-                    intent_allowed = llm_result
-            intent_metadata["final"] = bool(intent_allowed)
-        else:
-            intent_allowed = bool(intent_metadata.get("final"))
+            intent_metadata = self._classify_intent(question, conversation_history, config, llm_responder)
+        intent_allowed = bool(intent_metadata.get("final"))
 
         if not intent_allowed:
             logger.debug("Question classified as non-agricultural", extra={"intent_metadata": intent_metadata})
@@ -449,6 +622,26 @@ class PipelineRunner:
         states = prioritize_states(question, user_state)
         diagnostics.state_attempts = states
         keywords = self._extract_keywords(question)
+        query_vector = query_vector or QueryVector(question, local_embeddings.embed_query)
+
+        # Follow-ups depend on earlier turns, so only standalone questions share cached answers.
+        cache_key: Optional[Tuple[Any, ...]] = None
+        if config.answer_cache and self.answer_cache.enabled and not conversation_history:
+            cache_key = (
+                (tuple(states), override_signature(config_overrides)),
+                self.stores.data_version(),
+            )
+            cached = self.answer_cache.lookup(query_vector.vector, *cache_key)
+            if cached is not None:
+                cached_result, cache_cosine, cached_question = cached
+                cached_result.metadata["cache_hit"] = True
+                cached_result.metadata.pop("clarifications_pending", None)
+                cached_result.metadata["answer_cache"] = {
+                    "cosine": round(cache_cosine, 4),
+                    "question": cached_question,
+                }
+                cached_result.metadata["intent_classification"] = intent_metadata
+                return cached_result
 
         golden_hits: List[RetrieverHit] = []
         pops_hits: List[RetrieverHit] = []
@@ -457,31 +650,65 @@ class PipelineRunner:
         golden_context_filtered = False
         pops_context_filtered = False
 
+        # Speculative mode starts PoPs alongside Golden; its result is only used on a Golden miss.
+        pops_future: Optional[Future] = None
+        speculative_meta: Optional[Dict[str, Any]] = None
+        retrieval_started = time.perf_counter()
+        if (
+            config.speculative_retrieval
+            and config.enable_golden
+            and config.enable_pops
+            and pops_retriever.available()
+        ):
+            pops_future = self._speculative_executor(config).submit(
+                _timed_call, pops_retriever.search, question, states, query_vector
+            )
+            speculative_meta = {"enabled": True}
+
+        golden_ms = 0.0
         if config.enable_golden:
-            golden_hits = golden_retriever.search(question, states)
+            golden_hits, golden_ms = _timed_call(golden_retriever.search, question, states, query_vector)
             diagnostics.golden_hits = golden_hits
             golden_hit, golden_context_filtered = self._evaluate_hits(
                 golden_hits,
                 config.golden_thresholds,
                 keywords,
+                lexical=golden_retriever.lexical,
             )
 
         # Priority logic: If Golden Database has relevant content, skip PoPs search
         pops_dynamic = config.pops_dynamic_distance_multiplier
         if config.enable_pops and not golden_hit:
             # Only search PoPs if Golden Database didn't provide relevant content
-            pops_hits = pops_retriever.search(question, states)
+            if pops_future is not None:
+                pops_hits, pops_ms = pops_future.result()
+                wall_ms = (time.perf_counter() - retrieval_started) * 1000.0
+                speculative_meta.update(
+                    {
+                        "used": True,
+                        "golden_ms": round(golden_ms, 2),
+                        "pops_ms": round(pops_ms, 2),
+                        "wall_ms": round(wall_ms, 2),
+                        "saved_ms": round(max(0.0, golden_ms + pops_ms - wall_ms), 2),
+                        "wasted_ms": 0.0,
+                    }
+                )
+            else:
+                pops_hits = pops_retriever.search(question, states, query_vector)
             diagnostics.pops_hits = pops_hits
             pops_hit, pops_context_filtered = self._evaluate_hits(
                 pops_hits,
                 config.pops_thresholds,
                 keywords,
                 dynamic_multiplier=pops_dynamic,
+                lexical=pops_retriever.lexical,
             )
         elif golden_hit:
             # Golden Database has relevant content, skip PoPs entirely
             logger.info("Golden Database provided relevant content, skipping PoPs search")
             diagnostics.pops_hits = []  # Empty list since we didn't search
+            if pops_future is not None:
+                speculative_meta.update(_discard_speculative(pops_future, retrieval_started, golden_ms))
 
         golden_context_hits: List[RetrieverHit] = [golden_hit] if golden_hit else []
         pops_context_hits: List[RetrieverHit] = [pops_hit] if pops_hit else []
@@ -494,6 +721,8 @@ class PipelineRunner:
                 "states_tried": diagnostics.state_attempts,
                 "intent_classification": intent_metadata,
                 "keywords": keywords,
+                "embedding_calls": query_vector.embed_calls,
+                **({"speculative_retrieval": speculative_meta} if speculative_meta else {}),
                 "golden": {
                     "hit_count": len(golden_hits),
                     "filtered_for_context": golden_context_filtered,
@@ -503,6 +732,7 @@ class PipelineRunner:
                             "state": hit.state_used,
                             "cosine": hit.cosine,
                             "distance": hit.distance,
+                            "fusion_score": hit.fusion_score,
                             "preview": hit.content[:160],
                         }
                         for hit in golden_hits[:3]
@@ -517,6 +747,7 @@ class PipelineRunner:
                             "state": hit.state_used,
                             "cosine": hit.cosine,
                             "distance": hit.distance,
+                            "fusion_score": hit.fusion_score,
                             "preview": hit.content[:160],
                         }
                         for hit in pops_hits[:3]
@@ -531,13 +762,16 @@ class PipelineRunner:
             "context_provided": context_provided,
         }
 
-        clarifying_questions: List[str] = []
+        # Clarifications are an extra LLM round trip, so they run beside the answer instead of before it;
+        # the scheduler keeps a slot for answers so a clarification in flight never delays one.
+        clarify_future: Optional[Future] = None
         if config.enable_llm and config.clarify_with_llm:
-            clarifying_questions = llm_responder.suggest_clarifications(
-                question, [hit.source for hit in golden_hits + pops_hits]
+            clarify_future = self._clarification_executor(config).submit(
+                llm_responder.suggest_clarifications, question, [hit.source for hit in golden_hits + pops_hits]
             )
 
         if not config.enable_llm:
+            clarifying_questions: List[str] = []
             if context_provided:
                 primary_hit = golden_hit or pops_hit
                 assert primary_hit is not None  # for type checkers
@@ -593,6 +827,9 @@ class PipelineRunner:
                 direct_answer = raw_content
             
             direct_reasoning = ["Golden Database"]
+            clarifying_questions, clarifications_pending = _resolve_clarifications(
+                clarify_future, config.clarification_wait_ms, clarifications_callback
+            )
             
             direct_metadata: Dict[str, Any] = {
                 "clarifications": clarifying_questions,
@@ -601,6 +838,8 @@ class PipelineRunner:
                 "context_provided": True,
                 "direct_golden_match": True,
             }
+            if clarifications_pending:
+                direct_metadata["clarifications_pending"] = True
             diag = _diag_payload()
             if diag:
                 direct_metadata["diagnostics"] = diag
@@ -626,129 +865,244 @@ class PipelineRunner:
                 clarifying_questions=clarifying_questions,
             )
 
-        llm_context, context_meta = self._build_llm_context(
-            golden_context_hits,
-            pops_context_hits,
-            clarifying_questions,
+        with span("context_build"):
+            llm_context, context_meta = self._build_llm_context(
+                golden_context_hits,
+                pops_context_hits,
+            )
+
+        def _finish(answer: str, llm_error: Optional[str], timings: Optional[Dict[str, float]] = None) -> PipelineResult:
+            clarifying_questions, clarifications_pending = _resolve_clarifications(
+                clarify_future, config.clarification_wait_ms, clarifications_callback
+            )
+            reasoning: List[str] = []
+            if config.enable_golden:
+                if golden_hit:
+                    reasoning.append("Golden database supplied context for the LLM")
+                elif not golden_hits:
+                    reasoning.append("Golden database returned no results")
+                else:
+                    if golden_context_filtered:
+                        reasoning.append("Golden hits filtered due to low keyword overlap")
+                    else:
+                        reasoning.append("Golden database did not meet thresholds")
+            else:
+                reasoning.append("Golden database disabled")
+
+            if config.enable_pops:
+                if pops_hit:
+                    reasoning.append("PoPs database supplied context for the LLM")
+                elif not pops_hits:
+                    reasoning.append("PoPs database returned no results")
+                else:
+                    if pops_context_filtered:
+                        reasoning.append("PoPs hits filtered due to low keyword overlap")
+                    else:
+                        reasoning.append("PoPs database did not meet thresholds")
+            else:
+                reasoning.append("PoPs database disabled")
+
+            if clarifying_questions:
+                reasoning.append("Clarification suggested to user")
+
+            metadata: Dict[str, Any] = {
+                "clarifications": clarifying_questions,
+                "intent_classification": intent_metadata,
+                "retrieval_keyword_overlap": keyword_meta,
+                "context_provided": context_provided,
+                "cache_hit": False,
+            }
+            if clarifications_pending:
+                metadata["clarifications_pending"] = True
+            if context_meta:
+                metadata["llm_context_sources"] = context_meta
+            diag = _diag_payload()
+            if diag:
+                metadata["diagnostics"] = diag
+            if llm_error:
+                metadata["llm_error"] = llm_error
+            if timings:
+                metadata["llm_timings"] = timings
+            if raw_config_metadata:
+                metadata["database_config"] = raw_config_metadata
+
+            metadata["retrieved_sources"] = [
+                {
+                    "source": "Golden Database",
+                    "state": golden_hit.state_used if golden_hit else None,
+                    "cosine": golden_hit.cosine if golden_hit else None,
+                    "distance": golden_hit.distance if golden_hit else None,
+                }
+                if golden_hit
+                else None,
+                {
+                    "source": "PoPs Database",
+                    "state": pops_hit.state_used if pops_hit else None,
+                    "cosine": pops_hit.cosine if pops_hit else None,
+                    "distance": pops_hit.distance if pops_hit else None,
+                }
+                if pops_hit
+                else None,
+            ]
+            metadata["retrieved_sources"] = [item for item in metadata["retrieved_sources"] if item]
+
+            if user_state:
+                metadata["request_state"] = user_state
+            if states:
+                metadata["state_candidates"] = states
+
+            if not context_provided:
+                metadata["context_note"] = "LLM invoked without retrieval context"
+
+            reason_parts: List[str] = []
+            if reasoning:
+                reason_parts.append("; ".join(reasoning))
+            if llm_error:
+                reason_parts.append(f"LLM error: {llm_error}")
+            self._log_fallback(
+                question,
+                answer,
+                reason=" ; ".join(reason_parts) if reason_parts else "LLM fallback invoked",
+                state=user_state or (states[0] if states else None),
+            )
+
+            actual_source = "AI Reasoning Engine (gpt-oss)" 
+            if golden_hit and pops_hit:
+                actual_source = "Package of Practices + Agricultural Database"
+            elif pops_hit:
+                actual_source = "Package of Practices (PoPs)"
+            elif golden_hit:
+                actual_source = "Agricultural Database (Golden)"
+            elif context_provided:
+                actual_source = "AI Reasoning Engine with Agricultural Context"
+
+            result = PipelineResult(
+                answer=answer,
+                source=actual_source,
+                metadata=metadata,
+                reasoning=reasoning,
+                clarifying_questions=clarifying_questions,
+            )
+            if cache_key is not None and not llm_error and answer.strip():
+                self.answer_cache.store(question, query_vector.vector, cache_key[0], cache_key[1], result)
+            return result
+
+        return _PendingGeneration(
+            question=question,
+            history=conversation_history,
+            context=llm_context if context_provided else "",
+            responder=llm_responder,
+            finish=_finish,
+        )
+
+    def answer(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        user_state: Optional[str] = None,
+        *,
+        stream: bool = False,
+        token_callback: Optional[Callable[[str], None]] = None,
+        intent_metadata: Optional[Dict[str, Optional[bool]]] = None,
+        config_overrides: Optional[Dict[str, Any]] = None,
+        clarifications_callback: Optional[Callable[[List[str]], None]] = None,
+    ) -> PipelineResult:
+        prepared = self._prepare_answer(
+            question,
+            conversation_history,
+            user_state,
+            intent_metadata=intent_metadata,
+            config_overrides=config_overrides,
+            clarifications_callback=clarifications_callback,
         )
+        if isinstance(prepared, PipelineResult):
+            return prepared
 
         llm_error: Optional[str] = None
+        timings: Dict[str, float] = {}
         try:
-            answer = llm_responder.generate_answer(
-                question,
-                conversation_history,
-                context=llm_context if context_provided else "",
+            answer = prepared.responder.generate_answer(
+                prepared.question,
+                prepared.history,
+                context=prepared.context,
                 stream=stream,
                 token_callback=token_callback,
+                timings=timings,
             )
+        except LLMOverloadedError:
+            raise
         except Exception as exc:  # pragma: no cover - network/runtime failure
             logger.exception("LLM fallback generation failed")
-            answer = (
-                "The AI reasoning engine is currently unavailable. Please confirm the Ollama service is running "
-                "and retry your question shortly."
-            )
+            answer = LLM_UNAVAILABLE_MESSAGE
             llm_error = str(exc)
+        return prepared.finish(answer, llm_error, timings)
 
-        reasoning: List[str] = []
-        if config.enable_golden:
-            if golden_hit:
-                reasoning.append("Golden database supplied context for the LLM")
-            elif not golden_hits:
-                reasoning.append("Golden database returned no results")
-            else:
-                if golden_context_filtered:
-                    reasoning.append("Golden hits filtered due to low keyword overlap")
-                else:
-                    reasoning.append("Golden database did not meet thresholds")
-        else:
-            reasoning.append("Golden database disabled")
+    async def aanswer(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        user_state: Optional[str] = None,
+        *,
+        stream: bool = False,
+        token_callback: Optional[Callable[[str], None]] = None,
+        intent_metadata: Optional[Dict[str, Optional[bool]]] = None,
+        config_overrides: Optional[Dict[str, Any]] = None,
+        clarifications_callback: Optional[Callable[[List[str]], None]] = None,
+    ) -> PipelineResult:
+        """Async :meth:`answer`.
 
-        if config.enable_pops:
-            if pops_hit:
-                reasoning.append("PoPs database supplied context for the LLM")
-            elif not pops_hits:
-                reasoning.append("PoPs database returned no results")
-            else:
-                if pops_context_filtered:
-                    reasoning.append("PoPs hits filtered due to low keyword overlap")
-                else:
-                    reasoning.append("PoPs database did not meet thresholds")
-        else:
-            reasoning.append("PoPs database disabled")
+        Intent classification runs first unless ``intent_metadata`` is given.
+        Retrieval runs in the default executor; LLM calls (intent and the
+        answer itself) are awaited on the event loop so they hold no thread.
+        """
 
-        if clarifying_questions:
-            reasoning.append("Clarification suggested to user")
+        if intent_metadata is None:
+            intent_metadata = await self.aclassify_intent(
+                question, conversation_history, config_overrides=config_overrides
+            )
 
-        metadata: Dict[str, Any] = {
-            "clarifications": clarifying_questions,
-            "intent_classification": intent_metadata,
-            "retrieval_keyword_overlap": keyword_meta,
-            "context_provided": context_provided,
-        }
-        if context_meta:
-            metadata["llm_context_sources"] = context_meta
-        diag = _diag_payload()
-        if diag:
-            metadata["diagnostics"] = diag
-        if llm_error:
-            metadata["llm_error"] = llm_error
-        if raw_config_metadata:
-            metadata["database_config"] = raw_config_metadata
-
-        metadata["retrieved_sources"] = [
-            {
-                "source": "Golden Database",
-                "state": golden_hit.state_used if golden_hit else None,
-                "cosine": golden_hit.cosine if golden_hit else None,
-                "distance": golden_hit.distance if golden_hit else None,
-            }
-            if golden_hit
-            else None,
-            {
-                "source": "PoPs Database",
-                "state": pops_hit.state_used if pops_hit else None,
-                "cosine": pops_hit.cosine if pops_hit else None,
-                "distance": pops_hit.distance if pops_hit else None,
-            }
-            if pops_hit
-            else None,
-        ]
-        metadata["retrieved_sources"] = [item for item in metadata["retrieved_sources"] if item]
-
-        if user_state:
-            metadata["request_state"] = user_state
-        if states:
-            metadata["state_candidates"] = states
-
-        if not context_provided:
-            metadata["context_note"] = "LLM invoked without retrieval context"
-
-        reason_parts: List[str] = []
-        if reasoning:
-            reason_parts.append("; ".join(reasoning))
-        if llm_error:
-            reason_parts.append(f"LLM error: {llm_error}")
-        self._log_fallback(
-            question,
-            answer,
-            reason=" ; ".join(reason_parts) if reason_parts else "LLM fallback invoked",
-            state=user_state or (states[0] if states else None),
+        query_vector: Optional[QueryVector] = None
+        if intent_metadata.get("final") and hasattr(local_embeddings, "aembed_query"):
+            try:
+                with span("embed_query"):
+                    vector = await local_embeddings.aembed_query(question)
+                query_vector = QueryVector.from_vector(question, vector)
+            except Exception as exc:  # pragma: no cover - network failure
+                logger.warning("Async question embedding failed; retrieval will embed it: %s", exc)
+
+        loop = asyncio.get_running_loop()
+        prepared = await loop.run_in_executor(
+            None,
+            functools.partial(
+                self._prepare_answer,
+                question,
+                conversation_history,
+                user_state,
+                intent_metadata=intent_metadata,
+                config_overrides=config_overrides,
+                query_vector=query_vector,
+                clarifications_callback=clarifications_callback,
+            ),
         )
+        if isinstance(prepared, PipelineResult):
+            return prepared
 
-        actual_source = "AI Reasoning Engine (gpt-oss)" 
-        if golden_hit and pops_hit:
-            actual_source = "Package of Practices + Agricultural Database"
-        elif pops_hit:
-            actual_source = "Package of Practices (PoPs)"
-        elif golden_hit:
-            actual_source = "Agricultural Database (Golden)"
-        elif context_provided:
-            actual_source = "AI Reasoning Engine with Agricultural Context"
-        
-        return PipelineResult(
-            answer=answer,
-            source=actual_source,
-            metadata=metadata,
-            reasoning=reasoning,
-            clarifying_questions=clarifying_questions,
-        )
+        llm_error: Optional[str] = None
+        timings: Dict[str, float] = {}
+        try:
+            answer = await prepared.responder.agenerate_answer(
+                prepared.question,
+                prepared.history,
+                context=prepared.context,
+                stream=stream,
+                token_callback=token_callback,
+                timings=timings,
+            )
+        except LLMOverloadedError:
+            raise
+        except Exception as exc:  # pragma: no cover - network/runtime failure
+            logger.exception("LLM fallback generation failed")
+            answer = LLM_UNAVAILABLE_MESSAGE
+            llm_error = str(exc)
+        # Finishing writes the fallback log and may POST to the review API.
+        return await loop.run_in_executor(None, prepared.finish, answer, llm_error, timings)
@@ -0,0 +1,320 @@
+"""Admission control for LLM calls.
+
+Ollama runs at most ``OLLAMA_NUM_PARALLEL`` generations at once; anything sent
+beyond that waits inside Ollama, where every request slows down together until
+they all hit the timeout. Each worker therefore admits a bounded number of LLM
+calls and holds the rest in a bounded priority queue: answers first, then
+intent checks, then clarification suggestions. When the queue is full a new
+call displaces a queued call of lower priority or is rejected straight away
+(HTTP 429); a call that waits longer than the queue timeout is rejected with
+HTTP 503. One slot is reserved for answers: intent checks and clarification
+suggestions together hold at most ``LLM_MAX_CONCURRENCY - 1`` slots, so a
+suggestion started beside an answer can never keep that answer waiting. With
+a single slot nothing can be reserved, so clarification suggestions bypass the
+limit instead. Callers that registered a listener with :func:`queue_position_listener`
+are told their position while they wait, and ``0`` once they are admitted.
+
+Settings (all optional):
+
+* ``LLM_MAX_CONCURRENCY`` – LLM calls in flight per worker (default 4).
+* ``LLM_MAX_QUEUE`` – calls waiting per worker before new ones are rejected (default 32).
+* ``LLM_QUEUE_TIMEOUT`` – seconds a call may wait for a slot (default 30).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .ollama_transport import _env_float, _env_int
+from .tracing import record
+
+logger = logging.getLogger("agrichat.pipeline.scheduler")
+
+ANSWER = 0
+INTENT = 1
+CLARIFICATION = 2
+PRIORITY_NAMES = {ANSWER: "answer", INTENT: "intent", CLARIFICATION: "clarification"}
+
+QueueListener = Callable[[int], None]
+
+_queue_listener: ContextVar[Optional[QueueListener]] = ContextVar("llm_queue_listener", default=None)
+
+
+class LLMOverloadedError(RuntimeError):
+    """An LLM call was not admitted; ``status_code`` is 429 (queue full) or 503 (waited too long)."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@contextmanager
+def queue_position_listener(listener: Optional[QueueListener]) -> Iterator[None]:
+    """Report queue positions of LLM calls made in this context to ``listener``.
+
+    The listener may be called from any thread.
+    """
+
+    token = _queue_listener.set(listener)
+    try:
+        yield
+    finally:
+        _queue_listener.reset(token)
+
+
+class _Waiter:
+    __slots__ = ("key", "priority", "wake", "listener", "state", "position", "enqueued")
+
+    def __init__(self, key: Tuple[int, int], wake: Callable[[], None], listener: Optional[QueueListener]):
+        self.key = key
+        self.priority = key[0]
+        self.wake = wake
+        self.listener = listener
+        self.state = "waiting"
+        self.position = 0
+        self.enqueued = time.perf_counter()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return self.key < other.key
+
+
+class LLMScheduler:
+    """Per-worker concurrency limit with a bounded priority queue, for threads and coroutines."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ):
+        self.max_concurrency = max(1, _env_int("LLM_MAX_CONCURRENCY", 4) if max_concurrency is None else max_concurrency)
+        self.max_queue = max(0, _env_int("LLM_MAX_QUEUE", 32) if max_queue is None else max_queue)
+        self.queue_timeout = max(0.0, _env_float("LLM_QUEUE_TIMEOUT", 30.0) if queue_timeout is None else queue_timeout)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._active_background = 0
+        self._waiting: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._stats: Dict[str, Any] = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_full": 0,
+            "rejected_timeout": 0,
+            "displaced": 0,
+            "ungated": 0,
+            "peak_waiting": 0,
+            "wait_ms_total": 0.0,
+            "by_priority": {name: {"admitted": 0, "rejected": 0} for name in PRIORITY_NAMES.values()},
+        }
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, int(self.queue_timeout / 2))
+
+    def _overloaded(self, message: str, status_code: int) -> LLMOverloadedError:
+        return LLMOverloadedError(message, status_code, self.retry_after)
+
+    def _positions_locked(self) -> List[Tuple[QueueListener, int]]:
+        updates = []
+        for index, waiter in enumerate(self._waiting, start=1):
+            if waiter.position != index:
+                waiter.position = index
+                if waiter.listener is not None:
+                    updates.append((waiter.listener, index))
+        return updates
+
+    @property
+    def background_limit(self) -> int:
+        """Slots that calls other than answers may hold at once."""
+        return max(1, self.max_concurrency - 1)
+
+    def _ungated(self, priority: int) -> bool:
+        return priority == CLARIFICATION and self.max_concurrency == 1
+
+    def _can_admit_locked(self, priority: int) -> bool:
+        if self._active >= self.max_concurrency:
+            return False
+        return priority == ANSWER or self._active_background < self.background_limit
+
+    def _admit_locked(self, waiter: Optional[_Waiter], priority: int) -> None:
+        self._active += 1
+        if priority != ANSWER:
+            self._active_background += 1
+        self._stats["admitted"] += 1
+        self._stats["by_priority"][PRIORITY_NAMES[priority]]["admitted"] += 1
+        waited = 0.0
+        if waiter is not None:
+            waiter.state = "granted"
+            waited = time.perf_counter() - waiter.enqueued
+            self._stats["wait_ms_total"] += waited * 1000.0
+        record("llm_queue_wait", waited, priority=PRIORITY_NAMES[priority])
+
+    def _grant_locked(self) -> List[_Waiter]:
+        granted = []
+        # The queue is sorted by priority, so a head that may not run means no answer is waiting either.
+        while self._waiting and self._can_admit_locked(self._waiting[0].priority):
+            waiter = self._waiting.pop(0)
+            self._admit_locked(waiter, waiter.priority)
+            granted.append(waiter)
+        return granted
+
+    @staticmethod
+    def _notify(updates: List[Tuple[QueueListener, int]], woken: List[_Waiter]) -> None:
+        for listener, position in updates:
+            try:
+                listener(position)
+            except Exception:  # pragma: no cover - a listener must not break scheduling
+                logger.debug("Queue position listener failed", exc_info=True)
+        for waiter in woken:
+            if waiter.state == "granted" and waiter.listener is not None:
+                try:
+                    waiter.listener(0)
+                except Exception:  # pragma: no cover
+                    logger.debug("Queue position listener failed", exc_info=True)
+            waiter.wake()
+
+    def _enqueue(self, priority: int, wake: Callable[[], None]) -> Optional[_Waiter]:
+        """``None`` when admitted immediately, otherwise the queued waiter."""
+
+        listener = _queue_listener.get()
+        displaced: Optional[_Waiter] = None
+        with self._lock:
+            if self._can_admit_locked(priority) and (not self._waiting or self._waiting[0].priority > priority):
+                self._admit_locked(None, priority)
+                return None
+            if len(self._waiting) >= self.max_queue:
+                lowest = self._waiting[-1] if self._waiting else None
+                if lowest is None or lowest.priority <= priority:
+                    self._stats["rejected_full"] += 1
+                    self._stats["by_priority"][PRIORITY_NAMES[priority]]["rejected"] += 1
+                    raise self._overloaded("LLM queue is full", 429)
+                # A full queue makes room for more important work by dropping its least important call.
+                displaced = self._waiting.pop()
+                displaced.state = "displaced"
+                self._stats["displaced"] += 1
+                self._stats["by_priority"][PRIORITY_NAMES[displaced.priority]]["rejected"] += 1
+            waiter = _Waiter((priority, next(self._sequence)), wake, listener)
+            bisect.insort(self._waiting, waiter)
+            self._stats["queued"] += 1
+            self._stats["peak_waiting"] = max(self._stats["peak_waiting"], len(self._waiting))
+            updates = self._positions_locked()
+        self._notify(updates, [displaced] if displaced is not None else [])
+        return waiter
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Leave the queue; ``True`` if the slot was granted in the meantime."""
+
+        with self._lock:
+            if waiter.state == "granted":
+                return True
+            if waiter in self._waiting:
+                self._waiting.remove(waiter)
+            waiter.state = "abandoned"
+            updates = self._positions_locked()
+        self._notify(updates, [])
+        return False
+
+    def _timed_out(self, waiter: _Waiter) -> bool:
+        if self._abandon(waiter):
+            return False
+        with self._lock:
+            self._stats["rejected_timeout"] += 1
+            self._stats["by_priority"][PRIORITY_NAMES[waiter.priority]]["rejected"] += 1
+        return True
+
+    def _check_displaced(self, waiter: _Waiter) -> None:
+        if waiter.state == "displaced":
+            raise self._overloaded("LLM queue is full", 429)
+
+    def release(self, priority: int = ANSWER) -> None:
+        with self._lock:
+            self._active = max(0, self._active - 1)
+            if priority != ANSWER:
+                self._active_background = max(0, self._active_background - 1)
+            woken = self._grant_locked()
+            updates = self._positions_locked()
+        self._notify(updates, woken)
+
+    @contextmanager
+    def slot(self, priority: int = ANSWER) -> Iterator[None]:
+        """Hold one LLM slot for the block, waiting in the queue if necessary."""
+
+        if self._ungated(priority):
+            with self._lock:
+                self._stats["ungated"] += 1
+            yield
+            return
+        event = threading.Event()
+        waiter = self._enqueue(priority, event.set)
+        if waiter is not None:
+            if not event.wait(self.queue_timeout) and self._timed_out(waiter):
+                raise self._overloaded("Timed out waiting for the LLM", 503)
+            self._check_displaced(waiter)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    @asynccontextmanager
+    async def aslot(self, priority: int = ANSWER) -> AsyncIterator[None]:
+        """Async :meth:`slot`; waiting does not block the event loop."""
+
+        if self._ungated(priority):
+            with self._lock:
+                self._stats["ungated"] += 1
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+
+        def _set_ready() -> None:
+            if not ready.done():
+                ready.set_result(None)
+
+        waiter = self._enqueue(priority, lambda: loop.call_soon_threadsafe(_set_ready))
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(ready, self.queue_timeout)
+            except asyncio.TimeoutError:
+                if self._timed_out(waiter):
+                    raise self._overloaded("Timed out waiting for the LLM", 503) from None
+            except asyncio.CancelledError:
+                if self._abandon(waiter):
+                    self.release(priority)
+                raise
+            self._check_displaced(waiter)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._stats)
+            snapshot["by_priority"] = {name: dict(counts) for name, counts in self._stats["by_priority"].items()}
+            snapshot["active"] = self._active
+            snapshot["waiting"] = len(self._waiting)
+        wait_ms_total = snapshot.pop("wait_ms_total")
+        snapshot["avg_wait_ms"] = round(wait_ms_total / snapshot["queued"], 2) if snapshot["queued"] else 0.0
+        snapshot["max_concurrency"] = self.max_concurrency
+        snapshot["background_limit"] = self.background_limit
+        snapshot["max_queue"] = self.max_queue
+        snapshot["queue_timeout"] = self.queue_timeout
+        return snapshot
+
+
+llm_scheduler = LLMScheduler()
+
+
+def llm_scheduler_stats() -> Dict[str, Any]:
+    """Admission counters and current occupancy of the LLM scheduler."""
+    return llm_scheduler.stats()
@@ -0,0 +1,159 @@
+"""Per-stage latency spans aggregated into histograms.
+
+Stages time themselves with :func:`span` (or :func:`record` when the duration
+is measured elsewhere) and every observation lands in one per-worker histogram
+family, ``agrichat_stage_duration_seconds``, labelled by ``stage`` plus a few
+low-cardinality labels (``tier``, ``collection``, ``priority``, ``mode``, ``op``).
+:func:`render_openmetrics` serialises the histograms, together with any other
+metric families the caller adds, in the OpenMetrics text format served at
+``/metrics``.
+
+Stages recorded by the backend:
+
+* ``intent`` – classification, labelled with the deciding ``tier``.
+* ``embed_query`` – embedding the question.
+* ``retrieval`` / ``lexical_fusion`` / ``cosine_scoring`` – per ``collection``.
+* ``context_build`` – assembling the LLM context.
+* ``llm_queue_wait`` – time an LLM call waited for admission, per ``priority``.
+* ``llm_ttft`` / ``llm_generation`` – time to first token and the whole generation.
+* ``pipeline`` – one full ``run_pipeline_answer`` execution.
+* ``markdown_render`` and ``mongo_write`` (per ``op``) in the API layer.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+STAGE_METRIC = "agrichat_stage_duration_seconds"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label set (thread-safe)."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelSet, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: LabelSet) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # One counter per finite bucket, then +Inf, count and sum.
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def snapshot(self) -> Dict[LabelSet, List[float]]:
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+stage_durations = Histogram(STAGE_METRIC, "Latency of pipeline and API stages.")
+
+
+def _label_set(stage: str, labels: Dict[str, Optional[str]]) -> LabelSet:
+    pairs = [("stage", stage)]
+    pairs.extend((key, str(value)) for key, value in sorted(labels.items()) if value is not None)
+    return tuple(pairs)
+
+
+def record(stage: str, seconds: float, **labels: Optional[str]) -> None:
+    """Add one observation of ``stage`` lasting ``seconds``."""
+
+    stage_durations.observe(max(0.0, seconds), _label_set(stage, labels))
+
+
+@contextmanager
+def span(stage: str, **labels: Optional[str]) -> Iterator[Dict[str, Optional[str]]]:
+    """Time the block as ``stage``; labels may still be filled in through the yielded dict."""
+
+    started = time.perf_counter()
+    try:
+        yield labels
+    finally:
+        record(stage, time.perf_counter() - started, **labels)
+
+
+class MetricFamily:
+    """A non-histogram metric family (``gauge`` or ``counter``) for :func:`render_openmetrics`."""
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.samples: List[Tuple[LabelSet, float]] = []
+
+    def add(self, value: Optional[float], **labels: str) -> "MetricFamily":
+        if value is not None:
+            self.samples.append((tuple(sorted(labels.items())), float(value)))
+        return self
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _render_histogram(histogram: Histogram) -> List[str]:
+    lines = [
+        f"# TYPE {histogram.name} histogram",
+        f"# UNIT {histogram.name} seconds",
+        f"# HELP {histogram.name} {histogram.help_text}",
+    ]
+    for labels, series in sorted(histogram.snapshot().items()):
+        cumulative = 0.0
+        for bound, count in zip(histogram.buckets + (math.inf,), series[:-2]):
+            cumulative += count
+            bucket_labels = labels + (("le", _format_value(bound) if math.isinf(bound) else repr(bound)),)
+            lines.append(f"{histogram.name}_bucket{_format_labels(bucket_labels)} {_format_value(cumulative)}")
+        lines.append(f"{histogram.name}_count{_format_labels(labels)} {_format_value(series[-2])}")
+        lines.append(f"{histogram.name}_sum{_format_labels(labels)} {repr(series[-1])}")
+    return lines
+
+
+def render_openmetrics(families: Iterable[MetricFamily] = ()) -> str:
+    """Stage histograms plus ``families`` as an OpenMetrics exposition ending in ``# EOF``."""
+
+    lines = _render_histogram(stage_durations)
+    for family in families:
+        lines.append(f"# TYPE {family.name} {family.metric_type}")
+        lines.append(f"# HELP {family.name} {family.help_text}")
+        suffix = "_total" if family.metric_type == "counter" else ""
+        for labels, value in family.samples:
+            lines.append(f"{family.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -1,5 +1,8 @@
+import threading
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .tracing import span
 
 
 @dataclass
@@ -10,6 +13,48 @@ class RetrieverHit:
     distance: Optional[float]
     cosine: Optional[float]
     state_used: Optional[str] = None
+    doc_id: Optional[str] = None
+    fusion_score: Optional[float] = None
+
+
+@dataclass
+class VectorMatch:
+    """Raw nearest-neighbour row returned by a vector store query."""
+
+    doc_id: str
+    content: str
+    metadata: Dict[str, Any]
+    distance: Optional[float]
+    embedding: Optional[Sequence[float]] = None
+
+
+@dataclass
+class QueryVector:
+    """Question embedding computed at most once per request and shared by all retrieval calls."""
+
+    text: str
+    embed: Callable[[str], Sequence[float]]
+    embed_calls: int = 0
+    _vector: Optional[Sequence[float]] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @classmethod
+    def from_vector(cls, text: str, vector: Sequence[float]) -> "QueryVector":
+        """Wrap a vector that was already computed for this request (e.g. by an async embed)."""
+
+        query = cls(text, lambda _text: vector, embed_calls=1)
+        query._vector = vector
+        return query
+
+    @property
+    def vector(self) -> Sequence[float]:
+        if self._vector is None:
+            with self._lock:
+                if self._vector is None:
+                    self.embed_calls += 1
+                    with span("embed_query"):
+                        self._vector = self.embed(self.text)
+        return self._vector
 
 
 @dataclass
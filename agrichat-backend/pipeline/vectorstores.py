@@ -1,10 +1,29 @@
+import logging
 import os
+import time
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 from langchain_community.vectorstores import Chroma
 
+import numpy as np
+
+from .lexical import INDEX_FILE, LexicalIndex, lexical_index_path, load_lexical_index
 from .llm_adapter import local_embeddings
+from .metadata_schema import EMBEDDING_NORMALIZATION_KEY, METADATA_SCHEMA_VERSION, SCHEMA_VERSION_KEY
+from .numpy_index import RECORDS_FILE, NumpyVectorIndex, collection_space, space_distances
+from .types import VectorMatch
+
+logger = logging.getLogger("agrichat.pipeline.vectorstores")
+
+GOLDEN_BACKENDS = {"chroma", "numpy"}
+
+
+def _data_version_refresh_seconds() -> float:
+    try:
+        return max(0.0, float(os.getenv("DATA_VERSION_REFRESH_SECONDS", "5")))
+    except ValueError:
+        return 5.0
 
 
 @lru_cache(maxsize=1)
@@ -14,33 +33,281 @@ def _resolve_chroma_path() -> str:
     return "/home/ubuntu/agrichat-annam/agrichat-backend/chromaDb"
 
 
+def golden_snapshot_path(chroma_path: Optional[str] = None) -> str:
+    configured = os.getenv("GOLDEN_SNAPSHOT_PATH")
+    if configured:
+        return configured
+    return os.path.join(chroma_path or _resolve_chroma_path(), "golden_snapshot")
+
+
+def _first_row(value: Any) -> List[Any]:
+    """Return the first query row of a Chroma result field (or an empty list)."""
+
+    if value is None:
+        return []
+    try:
+        if len(value) == 0:
+            return []
+    except TypeError:
+        return []
+    row = value[0]
+    return [] if row is None else list(row)
+
+
+def query_by_vector(
+    store: Union[Chroma, NumpyVectorIndex],
+    vector: Sequence[float],
+    k: int,
+    where: Optional[Dict[str, Any]] = None,
+) -> List[VectorMatch]:
+    """Query the underlying collection with a precomputed vector.
+
+    Unlike ``similarity_search_with_score`` this never re-embeds the question and
+    returns the stored document embeddings so callers can score hits locally.
+    """
+
+    if isinstance(store, NumpyVectorIndex):
+        return store.query_by_vector(vector, k, where)
+
+    kwargs: Dict[str, Any] = {
+        "query_embeddings": [list(vector)],
+        "n_results": k,
+        "include": ["documents", "metadatas", "distances", "embeddings"],
+    }
+    if where:
+        kwargs["where"] = where
+    results = store._collection.query(**kwargs)
+
+    ids = _first_row(results.get("ids"))
+    documents = _first_row(results.get("documents"))
+    metadatas = _first_row(results.get("metadatas"))
+    distances = _first_row(results.get("distances"))
+    embeddings = _first_row(results.get("embeddings"))
+
+    matches: List[VectorMatch] = []
+    for index, doc_id in enumerate(ids):
+        matches.append(
+            VectorMatch(
+                doc_id=str(doc_id),
+                content=documents[index] if index < len(documents) else "",
+                metadata=(metadatas[index] if index < len(metadatas) else None) or {},
+                distance=float(distances[index]) if index < len(distances) else None,
+                embedding=embeddings[index] if index < len(embeddings) else None,
+            )
+        )
+    return matches
+
+
+def fetch_by_ids(
+    store: Union[Chroma, NumpyVectorIndex],
+    ids: Sequence[str],
+    vector: Sequence[float],
+) -> List[VectorMatch]:
+    """Load documents by id with their distance to ``vector`` in the collection's space.
+
+    Used for candidates that only the lexical index returned, so they can be
+    scored exactly like vector matches.
+    """
+
+    if not ids:
+        return []
+    if isinstance(store, NumpyVectorIndex):
+        return store.get_by_ids(ids, vector)
+
+    collection = store._collection
+    results = collection.get(ids=list(ids), include=["documents", "metadatas", "embeddings"])
+    found = [str(doc_id) for doc_id in results.get("ids") or []]
+    embeddings = results.get("embeddings")
+    if not found or embeddings is None or len(embeddings) != len(found):
+        return []
+    documents = results.get("documents") or []
+    metadatas = results.get("metadatas") or []
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    distances = space_distances(
+        collection_space(collection),
+        matrix,
+        np.linalg.norm(matrix, axis=1),
+        np.asarray(vector, dtype=np.float32),
+    )
+    return [
+        VectorMatch(
+            doc_id=doc_id,
+            content=documents[index] if index < len(documents) else "",
+            metadata=(metadatas[index] if index < len(metadatas) else None) or {},
+            distance=float(distances[index]),
+            embedding=matrix[index],
+        )
+        for index, doc_id in enumerate(found)
+    ]
+
+
+def collection_metadata(store: Union[Chroma, NumpyVectorIndex]) -> Dict[str, Any]:
+    """Collection-level metadata of a store (the snapshot keeps a copy of the collection's)."""
+
+    if isinstance(store, NumpyVectorIndex):
+        return store.metadata
+    try:
+        return dict(store._collection.metadata or {})
+    except Exception:  # pragma: no cover - defensive
+        return {}
+
+
+def _store_size(store: Union[Chroma, NumpyVectorIndex]) -> int:
+    if isinstance(store, NumpyVectorIndex):
+        return len(store)
+    try:
+        return store._collection.count()
+    except Exception:  # pragma: no cover - defensive
+        return 0
+
+
+def uses_legacy_metadata(store: Union[Chroma, NumpyVectorIndex]) -> bool:
+    """Whether the collection predates the canonical metadata schema (no schema marker)."""
+
+    try:
+        version = int(collection_metadata(store).get(SCHEMA_VERSION_KEY) or 0)
+    except (TypeError, ValueError):
+        version = 0
+    return version < METADATA_SCHEMA_VERSION
+
+
+def _check_collection_markers(name: str, store: Union[Chroma, NumpyVectorIndex]) -> bool:
+    """Log collections that need the migration; return False when the store must not be served.
+
+    Stored vectors with a different normalization than the queries make every
+    distance (and so the ``max_distance`` gates) meaningless, so such a
+    collection is refused rather than served with wrong gate decisions.
+    """
+
+    if not _store_size(store):
+        return True
+    if uses_legacy_metadata(store):
+        logger.error(
+            "Collection %r has not been migrated to metadata schema v%d; retrieval falls back to the slower "
+            "legacy 'State' filters. Run scripts/migrate_collection_metadata.py",
+            name,
+            METADATA_SCHEMA_VERSION,
+        )
+    expected = getattr(local_embeddings, "normalization", None)
+    stored = collection_metadata(store).get(EMBEDDING_NORMALIZATION_KEY)
+    if expected and stored != expected:
+        logger.error(
+            "Collection %r stores %s embeddings but queries are %s-normalized; it is not served until it is "
+            "migrated with scripts/migrate_collection_metadata.py and the backend is restarted",
+            name,
+            stored or "unnormalized",
+            expected,
+        )
+        return False
+    return True
+
+
 class VectorStores:
-    """Lazy-initialized handles to Golden and PoPs Chroma collections."""
+    """Lazy-initialized handles to the Golden and PoPs vector stores.
 
-    def __init__(self, chroma_path: Optional[str] = None):
+    The Golden store is a Chroma collection by default; ``golden_backend="numpy"``
+    serves it from a memory-mapped snapshot instead. A collection whose stored
+    vectors are not normalized like the queries is refused (the property
+    returns ``None``) until it is migrated.
+    """
+
+    def __init__(self, chroma_path: Optional[str] = None, golden_backend: str = "chroma"):
         self._chroma_path = chroma_path or _resolve_chroma_path()
+        self._golden_backend = golden_backend if golden_backend in GOLDEN_BACKENDS else "chroma"
+        if golden_backend not in GOLDEN_BACKENDS:
+            logger.warning("Unknown golden backend %r; using chroma", golden_backend)
         self._golden = None
         self._pops = None
+        # Collections refused by _check_collection_markers stay refused until restart.
+        self._refused: Set[str] = set()
+        self._lexical: Dict[str, Optional[LexicalIndex]] = {}
+        self._data_version_refresh = _data_version_refresh_seconds()
+        self._data_version: Optional[Tuple[float, ...]] = None
+        self._data_version_checked = 0.0
+
+    def _load_golden_snapshot(self) -> Optional[NumpyVectorIndex]:
+        path = golden_snapshot_path(self._chroma_path)
+        try:
+            return NumpyVectorIndex.load(path)
+        except Exception as exc:
+            logger.warning("Golden snapshot unavailable at %s (%s); falling back to Chroma", path, exc)
+            return None
 
     @property
-    def golden(self) -> Chroma:
-        if self._golden is None:
-            self._golden = Chroma(
+    def golden(self) -> Optional[Union[Chroma, NumpyVectorIndex]]:
+        if self._golden is None and "langchain" not in self._refused:
+            if self._golden_backend == "numpy":
+                snapshot = self._load_golden_snapshot()
+                if snapshot is not None and _check_collection_markers("langchain", snapshot):
+                    self._golden = snapshot
+                elif snapshot is not None:
+                    logger.warning("Golden snapshot predates the migration; rebuild it. Falling back to Chroma")
+        if self._golden is None and "langchain" not in self._refused:
+            store = Chroma(
                 collection_name="langchain",
                 persist_directory=self._chroma_path,
                 embedding_function=local_embeddings,
             )
+            if _check_collection_markers("langchain", store):
+                self._golden = store
+            else:
+                self._refused.add("langchain")
         return self._golden
 
     @property
     def pops(self) -> Optional[Chroma]:
-        if self._pops is None:
+        if self._pops is None and "package_of_practices" not in self._refused:
             try:
-                self._pops = Chroma(
+                store = Chroma(
                     collection_name="package_of_practices",
                     persist_directory=self._chroma_path,
                     embedding_function=local_embeddings,
                 )
             except Exception:
-                self._pops = None
+                return None
+            if _check_collection_markers("package_of_practices", store):
+                self._pops = store
+            else:
+                self._refused.add("package_of_practices")
         return self._pops
+
+    def _lexical_index(self, collection_name: str) -> Optional[LexicalIndex]:
+        if collection_name not in self._lexical:
+            self._lexical[collection_name] = load_lexical_index(collection_name, self._chroma_path)
+        return self._lexical[collection_name]
+
+    @property
+    def golden_lexical(self) -> Optional[LexicalIndex]:
+        return self._lexical_index("langchain")
+
+    @property
+    def pops_lexical(self) -> Optional[LexicalIndex]:
+        return self._lexical_index("package_of_practices")
+
+    def data_version(self) -> Tuple[float, ...]:
+        """Modification times of the persisted collections; they change when a collection is rebuilt.
+
+        The files are stat'ed at most once per ``DATA_VERSION_REFRESH_SECONDS``;
+        calls in between return the last version read.
+        """
+
+        now = time.monotonic()
+        if self._data_version is not None and now - self._data_version_checked < self._data_version_refresh:
+            return self._data_version
+        paths = [
+            os.path.join(self._chroma_path, "chroma.sqlite3"),
+            os.path.join(self._chroma_path, "chroma.sqlite3-wal"),
+            os.path.join(golden_snapshot_path(self._chroma_path), RECORDS_FILE),
+            os.path.join(lexical_index_path("langchain", self._chroma_path), INDEX_FILE),
+            os.path.join(lexical_index_path("package_of_practices", self._chroma_path), INDEX_FILE),
+        ]
+        version: List[float] = []
+        for path in paths:
+            try:
+                version.append(os.path.getmtime(path))
+            except OSError:
+                version.append(0.0)
+        self._data_version = tuple(version)
+        self._data_version_checked = now
+        return self._data_version
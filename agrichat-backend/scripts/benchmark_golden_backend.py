@@ -0,0 +1,144 @@
+"""Compare Golden retrieval latency between the Chroma and NumPy backends.
+
+Query vectors are sampled from the stored Golden embeddings (with a little
+Gaussian noise) so the benchmark needs neither Ollama nor a question set.
+Each backend answers the same queries with the same state filters the
+retrievers use, and the script reports latency percentiles plus how often
+the exact NumPy top-k agrees with Chroma's approximate HNSW top-k.
+
+    python scripts/build_golden_snapshot.py
+    python scripts/benchmark_golden_backend.py --queries 500 --k 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline.numpy_index import NumpyVectorIndex  # noqa: E402
+from pipeline.vectorstores import VectorStores, golden_snapshot_path, query_by_vector  # noqa: E402
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as exc:  # pragma: no cover - argparse message handles it
+        raise argparse.ArgumentTypeError("Value must be an integer") from exc
+    if number <= 0:
+        raise argparse.ArgumentTypeError("Value must be greater than zero")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark Golden vector backends (Chroma vs NumPy).")
+    parser.add_argument("--chroma-path", default=None, help="Chroma persist directory")
+    parser.add_argument("--snapshot", default=None, help="Snapshot directory (default: backend setting)")
+    parser.add_argument("--queries", type=_positive_int, default=300, help="Queries per backend (default: %(default)s)")
+    parser.add_argument("--k", type=_positive_int, default=5, help="Results per state (default: %(default)s)")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed warmup queries (default: %(default)s)")
+    parser.add_argument("--noise", type=float, default=0.05, help="Relative query noise (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed (default: %(default)s)")
+    return parser
+
+
+def _percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    values = np.asarray(samples_ms)
+    return {
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def _build_workload(index: NumpyVectorIndex, count: int, noise: float, rng: np.random.Generator) -> List[Dict[str, Any]]:
+    states = sorted({str(metadata.get("state")) for metadata in index.metadatas if metadata.get("state")})
+    specific = [state for state in states if state != "general"]
+    workload: List[Dict[str, Any]] = []
+    for _ in range(count):
+        row = int(rng.integers(len(index)))
+        base = np.asarray(index.vectors[row], dtype=np.float32)
+        scale = float(np.linalg.norm(base)) or 1.0
+        vector = base + rng.normal(0.0, noise * scale / np.sqrt(len(base)), size=base.shape).astype(np.float32)
+
+        keys: List[str] = []
+        if specific:
+            keys.append(str(rng.choice(specific)))
+        if "general" in states:
+            keys.append("general")
+        where: Optional[Dict[str, Any]]
+        if not keys:
+            where = None
+        elif len(keys) == 1:
+            where = {"state": keys[0]}
+        else:
+            where = {"state": {"$in": keys}}
+        workload.append({"vector": vector.tolist(), "where": where, "n_results": max(1, len(keys))})
+    return workload
+
+
+def _run(store: Any, workload: List[Dict[str, Any]], k: int, warmup: int) -> Dict[str, Any]:
+    run_query: Callable[[Dict[str, Any]], List[Any]] = lambda item: query_by_vector(
+        store, item["vector"], k * item["n_results"], item["where"]
+    )
+    for item in workload[:warmup]:
+        run_query(item)
+
+    timings: List[float] = []
+    results: List[List[str]] = []
+    for item in workload:
+        start = time.perf_counter()
+        matches = run_query(item)
+        timings.append((time.perf_counter() - start) * 1000.0)
+        results.append([match.doc_id for match in matches])
+    return {"latency": _percentiles(timings), "results": results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(args.seed)
+
+    stores = VectorStores(args.chroma_path, golden_backend="chroma")
+    snapshot = args.snapshot or golden_snapshot_path(args.chroma_path)
+    numpy_index = NumpyVectorIndex.load(snapshot)
+    if not len(numpy_index):
+        print("Snapshot is empty; build it with scripts/build_golden_snapshot.py first.")
+        return 1
+
+    if stores.golden is None:
+        print("The Golden collection is not migrated; run scripts/migrate_collection_metadata.py first.")
+        return 1
+
+    workload = _build_workload(numpy_index, args.queries, args.noise, rng)
+    chroma_run = _run(stores.golden, workload, args.k, args.warmup)
+    numpy_run = _run(numpy_index, workload, args.k, args.warmup)
+
+    overlaps = []
+    for chroma_ids, numpy_ids in zip(chroma_run["results"], numpy_run["results"]):
+        if numpy_ids:
+            overlaps.append(len(set(chroma_ids) & set(numpy_ids)) / len(numpy_ids))
+
+    report = {
+        "documents": len(numpy_index),
+        "queries": len(workload),
+        "k": args.k,
+        "chroma": chroma_run["latency"],
+        "numpy": numpy_run["latency"],
+        "p99_speedup": round(chroma_run["latency"]["p99_ms"] / max(numpy_run["latency"]["p99_ms"], 1e-6), 2),
+        "topk_agreement": round(float(np.mean(overlaps)), 4) if overlaps else None,
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
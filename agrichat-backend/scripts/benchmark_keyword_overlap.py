@@ -0,0 +1,142 @@
+"""Microbenchmark the keyword-overlap gate on PoPs-sized documents.
+
+Compares the previous per-request regex scan (one ``\\b<variant>\\b`` search
+per keyword variant over the whole text) with the set-intersection check
+against precomputed document terms, and verifies both give the same verdict.
+Documents are synthetic ~5,000 character pages unless ``--chroma-path`` is
+given, in which case PoPs pages are sampled from the collection:
+
+    python scripts/benchmark_keyword_overlap.py --documents 200 --checks 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline.lexical import LexicalIndex  # noqa: E402
+from pipeline.runner import PipelineRunner  # noqa: E402
+
+_VOCABULARY = (
+    "paddy rice wheat maize cotton sugarcane groundnut fertilizer fertilizers nitrogen urea potash "
+    "phosphorus irrigation irrigating sowing seedlings nursery transplanting weeding harvest harvesting "
+    "varieties variety yield pests insects stem borer blast disease diseases spraying fungicide "
+    "insecticide hectare kharif rabi tillering flowering manure compost organic seeds spacing plots"
+).split()
+_FILLER = "the of and in to for with per at by is are be on as from".split()
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as exc:  # pragma: no cover - argparse message handles it
+        raise argparse.ArgumentTypeError("Value must be an integer") from exc
+    if number <= 0:
+        raise argparse.ArgumentTypeError("Value must be greater than zero")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark regex vs term-set keyword overlap checks.")
+    parser.add_argument("--chroma-path", default=None, help="Sample real PoPs pages from this Chroma directory")
+    parser.add_argument("--documents", type=_positive_int, default=200, help="Documents (default: %(default)s)")
+    parser.add_argument("--chars", type=_positive_int, default=5000, help="Synthetic page size (default: %(default)s)")
+    parser.add_argument("--checks", type=_positive_int, default=20, help="Keyword sets per document (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed (default: %(default)s)")
+    return parser
+
+
+def _synthetic_page(rng: random.Random, chars: int) -> str:
+    words: List[str] = []
+    size = 0
+    while size < chars:
+        word = rng.choice(_VOCABULARY) if rng.random() < 0.35 else rng.choice(_FILLER)
+        if rng.random() < 0.05:
+            word = word.capitalize() + rng.choice([",", ".", ":"])
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:chars]
+
+
+def _load_pages(chroma_path: str, limit: int) -> List[str]:
+    import chromadb
+
+    collection = chromadb.PersistentClient(path=chroma_path).get_collection("package_of_practices")
+    return [document or "" for document in collection.get(include=["documents"], limit=limit).get("documents") or []]
+
+
+def _regex_overlap(keywords: List[str], content: str) -> bool:
+    """The gate as it was before term sets: regexes compiled per variant per document."""
+
+    text = content.lower()
+    unique_keywords = list(dict.fromkeys(keywords))
+    matches = 0
+    for keyword in unique_keywords:
+        for variant in PipelineRunner._keyword_variants(keyword):
+            if variant and re.search(rf"\b{re.escape(variant)}\b", text):
+                matches += 1
+                break
+    total = len(unique_keywords)
+    required = 1 if total == 1 else 2 if total <= 5 else 3
+    return matches >= min(required, total)
+
+
+def _time(label: str, func, cases) -> Dict[str, object]:
+    start = time.perf_counter()
+    verdicts = [func(*case) for case in cases]
+    elapsed = time.perf_counter() - start
+    return {"label": label, "total_ms": round(elapsed * 1000.0, 2), "us_per_check": round(elapsed * 1e6 / len(cases), 2), "verdicts": verdicts}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    if args.chroma_path:
+        pages = _load_pages(args.chroma_path, args.documents)
+    else:
+        pages = [_synthetic_page(rng, args.chars) for _ in range(args.documents)]
+    if not pages:
+        print("No documents to benchmark.")
+        return 1
+
+    ids = [str(index) for index in range(len(pages))]
+    index = LexicalIndex.from_documents(ids, pages, [{} for _ in pages])
+    keyword_sets = [
+        [rng.choice(_VOCABULARY) for _ in range(rng.randint(1, 6))] for _ in range(args.checks)
+    ]
+
+    regex_cases = [(keywords, page) for page in pages for keywords in keyword_sets]
+    set_cases = [
+        (keywords, page, index.terms_for(row), PipelineRunner._keyword_variant_sets(keywords))
+        for row, page in enumerate(pages)
+        for keywords in keyword_sets
+    ]
+
+    regex_run = _time("regex", _regex_overlap, regex_cases)
+    set_run = _time("term_set", PipelineRunner._hit_has_keyword_overlap, set_cases)
+    mismatches = sum(a != b for a, b in zip(regex_run.pop("verdicts"), set_run.pop("verdicts")))
+
+    report = {
+        "documents": len(pages),
+        "avg_chars": round(sum(len(page) for page in pages) / len(pages)),
+        "checks": len(regex_cases),
+        "regex": regex_run,
+        "term_set": set_run,
+        "speedup": round(regex_run["total_ms"] / max(set_run["total_ms"], 1e-6), 1),
+        "verdict_mismatches": mismatches,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if mismatches == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Export the Golden Chroma collection into a memory-mapped NumPy snapshot.
+
+The snapshot backs the in-memory exact-search backend selected with
+``GOLDEN_VECTOR_BACKEND=numpy``. Rebuild it whenever the Golden collection
+changes:
+
+    python scripts/build_golden_snapshot.py --chroma-path /app/chromaDb
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+import chromadb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline.numpy_index import build_snapshot  # noqa: E402
+from pipeline.vectorstores import _resolve_chroma_path, golden_snapshot_path  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Export the Golden collection into a NumPy snapshot for the in-memory backend.",
+    )
+    parser.add_argument(
+        "--chroma-path",
+        default=None,
+        help="Chroma persist directory (default: the path used by the backend)",
+    )
+    parser.add_argument(
+        "--collection",
+        default="langchain",
+        help="Collection to export (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Snapshot directory (default: GOLDEN_SNAPSHOT_PATH or <chroma-path>/golden_snapshot)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    chroma_path = args.chroma_path or _resolve_chroma_path()
+    output = args.output or golden_snapshot_path(chroma_path)
+    client = chromadb.PersistentClient(path=chroma_path)
+    collection = client.get_collection(args.collection)
+
+    summary = build_snapshot(collection, output)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
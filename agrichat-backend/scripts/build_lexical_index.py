@@ -0,0 +1,67 @@
+"""Build the persisted BM25 lexical index for the Golden and PoPs collections.
+
+The retrievers fuse BM25 candidates with vector results when
+``PIPELINE_HYBRID_RETRIEVAL`` is enabled, and the keyword-overlap gate uses
+the posting lists whenever an index is present. Rebuild after re-ingesting a
+collection (``chroma_pops_builder.py`` already does this for PoPs):
+
+    python scripts/build_lexical_index.py --chroma-path /app/chromaDb
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict
+
+import chromadb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline.lexical import build_lexical_index, lexical_index_path  # noqa: E402
+from pipeline.vectorstores import _resolve_chroma_path  # noqa: E402
+
+COLLECTIONS = ("langchain", "package_of_practices")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build BM25 lexical indexes for the Chroma collections.")
+    parser.add_argument(
+        "--chroma-path",
+        default=None,
+        help="Chroma persist directory (default: the path used by the backend)",
+    )
+    parser.add_argument(
+        "--collection",
+        choices=COLLECTIONS,
+        action="append",
+        help="Collection to index; repeat for several (default: all)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    chroma_path = args.chroma_path or _resolve_chroma_path()
+    client = chromadb.PersistentClient(path=chroma_path)
+    existing = {getattr(collection, "name", collection) for collection in client.list_collections()}
+
+    summary: Dict[str, Any] = {"chroma_path": chroma_path, "collections": {}}
+    for name in args.collection or COLLECTIONS:
+        if name not in existing:
+            summary["collections"][name] = {"skipped": "collection not found"}
+            continue
+        summary["collections"][name] = build_lexical_index(
+            client.get_collection(name),
+            lexical_index_path(name, chroma_path),
+        )
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Rewrite Golden and PoPs Chroma metadata into the canonical schema.
+
+The retrievers filter on the canonical lower-case ``state`` key with exactly
+one query per state, so collections built before the schema existed must be
+migrated once:
+
+    python scripts/migrate_collection_metadata.py --chroma-path /app/chromaDb
+
+The same pass scales stored embeddings to unit length, matching the vectors
+the embeddings clients now return for queries, and stamps the collection with
+``SCHEMA_VERSION_KEY`` and ``EMBEDDING_NORMALIZATION_KEY``. Until a
+collection carries the schema marker the retrievers fall back to the legacy
+``State`` filters. Ollama's ``/api/embed`` is the normalized
+form of ``/api/embeddings``, so no text is re-embedded. Rebuild the Golden
+snapshot afterwards when ``GOLDEN_VECTOR_BACKEND=numpy``.
+
+The migration is idempotent; documents are left as they are. Use
+``--dry-run`` to preview the changes.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import chromadb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from pipeline.metadata_schema import (  # noqa: E402
+    DOC_TYPE_GOLDEN,
+    DOC_TYPE_POPS,
+    canonicalize_metadata,
+    collection_markers,
+)
+from pipeline.ollama_async import EMBEDDING_NORMALIZATION  # noqa: E402
+from pipeline.vectorstores import _resolve_chroma_path  # noqa: E402
+
+COLLECTIONS = {
+    "langchain": DOC_TYPE_GOLDEN,
+    "package_of_practices": DOC_TYPE_POPS,
+}
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as exc:  # pragma: no cover - argparse message handles it
+        raise argparse.ArgumentTypeError("Batch size must be an integer") from exc
+    if number <= 0:
+        raise argparse.ArgumentTypeError("Batch size must be greater than zero")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Migrate Golden/PoPs Chroma metadata to the canonical schema.",
+    )
+    parser.add_argument(
+        "--chroma-path",
+        default=None,
+        help="Chroma persist directory (default: the path used by the backend)",
+    )
+    parser.add_argument(
+        "--collection",
+        choices=sorted(COLLECTIONS),
+        action="append",
+        help="Collection to migrate; repeat for several (default: all)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=_positive_int,
+        default=500,
+        help="Documents fetched and updated per round trip (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would change without writing anything.",
+    )
+    return parser
+
+
+def _normalized_rows(embeddings: Any) -> Optional[np.ndarray]:
+    """Unit-length copy of ``embeddings``, or ``None`` when every row already is."""
+
+    if embeddings is None or not len(embeddings):
+        return None
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1)
+    if np.allclose(norms[norms > 0], 1.0, atol=1e-3):
+        return None
+    return matrix / np.where(norms > 0, norms, 1.0)[:, None]
+
+
+def _stamp_collection(collection: Any, dry_run: bool) -> bool:
+    metadata = dict(collection.metadata or {})
+    markers = collection_markers(EMBEDDING_NORMALIZATION)
+    if all(metadata.get(key) == value for key, value in markers.items()):
+        return False
+    if not dry_run:
+        # Chroma refuses "hnsw:*" keys on modify; the distance space is kept regardless.
+        metadata = {key: value for key, value in metadata.items() if not key.startswith("hnsw:")}
+        metadata.update(markers)
+        collection.modify(metadata=metadata)
+    return True
+
+
+def migrate_collection(collection: Any, doc_type: str, batch_size: int, dry_run: bool) -> Dict[str, Any]:
+    total = collection.count()
+    updated = 0
+    normalized = 0
+    states: Counter = Counter()
+
+    for offset in range(0, total, batch_size):
+        page = collection.get(
+            include=["metadatas", "documents", "embeddings"],
+            limit=batch_size,
+            offset=offset,
+        )
+        ids: List[str] = page.get("ids") or []
+        documents = page.get("documents") or []
+        metadatas = page.get("metadatas") or []
+
+        unit_rows = _normalized_rows(page.get("embeddings"))
+        if unit_rows is not None:
+            if not dry_run:
+                collection.update(ids=ids, embeddings=unit_rows.tolist())
+            normalized += len(ids)
+
+        changed_ids: List[str] = []
+        changed_metadatas: List[Dict[str, Any]] = []
+        for index, doc_id in enumerate(ids):
+            current = (metadatas[index] if index < len(metadatas) else None) or {}
+            content = documents[index] if index < len(documents) else ""
+            canonical = canonicalize_metadata(current, content or "", doc_type)
+            states[canonical["state"]] += 1
+            if canonical != current:
+                changed_ids.append(doc_id)
+                changed_metadatas.append(canonical)
+
+        if changed_ids and not dry_run:
+            collection.update(ids=changed_ids, metadatas=changed_metadatas)
+        updated += len(changed_ids)
+
+    return {
+        "documents": total,
+        "updated": updated,
+        "normalized": normalized,
+        "stamped": _stamp_collection(collection, dry_run),
+        "states": dict(states.most_common()),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    chroma_path = args.chroma_path or _resolve_chroma_path()
+    client = chromadb.PersistentClient(path=chroma_path)
+    existing = {getattr(collection, "name", collection) for collection in client.list_collections()}
+
+    summary: Dict[str, Any] = {"chroma_path": chroma_path, "dry_run": args.dry_run, "collections": {}}
+    for name in args.collection or sorted(COLLECTIONS):
+        if name not in existing:
+            summary["collections"][name] = {"skipped": "collection not found"}
+            continue
+        collection = client.get_collection(name)
+        summary["collections"][name] = migrate_collection(
+            collection,
+            COLLECTIONS[name],
+            args.batch_size,
+            args.dry_run,
+        )
+
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
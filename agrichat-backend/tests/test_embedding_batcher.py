@@ -0,0 +1,52 @@
+"""A cancelled async caller must not strand the rest of its embedding batch."""
+
+import asyncio
+import threading
+import time
+
+from pipeline.embedding_batcher import EmbeddingMicroBatcher
+
+
+def _slow_batch(texts):
+    time.sleep(0.1)
+    return [[float(len(text))] for text in texts]
+
+
+def test_cancelled_async_caller_does_not_strand_batch():
+    batcher = EmbeddingMicroBatcher(_slow_batch, window_ms=50, result_timeout=5)
+    results = {}
+
+    def sync_caller():
+        results["sync"] = batcher.embed("second")
+
+    async def cancelled_caller():
+        task = asyncio.create_task(batcher.aembed("first"))
+        await asyncio.sleep(0.01)
+        thread.start()
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            results["cancelled"] = True
+
+    thread = threading.Thread(target=sync_caller)
+    asyncio.run(cancelled_caller())
+    thread.join(timeout=2)
+
+    assert results == {"cancelled": True, "sync": [6.0]}
+    assert batcher.stats()["batches"] == 1
+    assert batcher.embed("after") == [5.0]
+
+
+def test_failed_batch_reaches_every_caller():
+    def failing_batch(texts):
+        raise RuntimeError("ollama down")
+
+    batcher = EmbeddingMicroBatcher(failing_batch, window_ms=1, result_timeout=5)
+    try:
+        batcher.embed("question")
+    except RuntimeError as exc:
+        assert str(exc) == "ollama down"
+    else:  # pragma: no cover
+        raise AssertionError("embed() should raise the batch error")
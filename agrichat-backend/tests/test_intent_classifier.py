@@ -0,0 +1,89 @@
+"""Intent tiers: cached verdicts respect the enabled tiers, and the LLM tier is awaited off the loop."""
+
+import asyncio
+import time
+
+from pipeline.intent_classifier import IntentClassifier
+
+QUESTION = "What is the capital of France?"
+
+
+class FixedModel:
+    def __init__(self, probability: float):
+        self.score = probability
+        self.examples = 0
+
+    def probability(self, normalized: str) -> float:
+        return self.score
+
+    def update(self, normalized: str, label: bool) -> None:
+        pass
+
+
+def _classifier(probability: float = 0.5) -> IntentClassifier:
+    classifier = IntentClassifier(lambda question: False, cache_size=16)
+    classifier._model = FixedModel(probability)
+    return classifier
+
+
+def test_llm_verdict_is_not_served_when_llm_tier_is_disabled():
+    classifier = _classifier()
+    assert classifier.classify(QUESTION, lambda question: True)["tier"] == "llm"
+    assert classifier.classify(QUESTION, lambda question: True)["tier"] == "cache"
+
+    metadata = classifier.classify(QUESTION, None)
+    assert metadata["tier"] == "undecided"
+    assert metadata["final"] is False
+
+
+def test_local_verdict_is_not_served_when_local_tier_is_disabled():
+    classifier = _classifier(probability=0.99)
+    assert classifier.classify(QUESTION, None)["tier"] == "local"
+
+    metadata = classifier.classify(QUESTION, lambda question: False, use_local=False)
+    assert metadata["tier"] == "llm"
+    assert metadata["final"] is False
+    assert classifier.classify(QUESTION, lambda question: True)["cached_tier"] == "llm"
+
+
+def test_verdict_without_llm_does_not_replace_llm_verdict():
+    classifier = _classifier()
+    classifier.classify(QUESTION, lambda question: False)
+    classifier._model.score = 0.99
+    assert classifier.classify(QUESTION, None)["tier"] == "local"
+
+    metadata = classifier.classify(QUESTION, lambda question: True)
+    assert metadata["tier"] == "cache"
+    assert metadata["final"] is False
+
+
+def test_llm_tier_does_not_block_the_event_loop():
+    classifier = _classifier()
+
+    async def slow_llm_tier(question):
+        await asyncio.sleep(0.5)
+        return False
+
+    async def measure():
+        gaps = []
+        stop = asyncio.Event()
+
+        async def heartbeat():
+            last = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        beat = asyncio.create_task(heartbeat())
+        await asyncio.sleep(0.05)
+        metadata = await classifier.aclassify(QUESTION, slow_llm_tier)
+        stop.set()
+        await beat
+        return metadata, gaps
+
+    metadata, gaps = asyncio.run(measure())
+    assert metadata["tier"] == "llm"
+    assert len(gaps) >= 40
+    assert max(gaps) < 0.1
@@ -0,0 +1,44 @@
+"""A freshly built PoPs collection carries the canonical schema and normalization markers."""
+
+import os
+import sys
+
+from langchain_community.vectorstores import Chroma
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from chroma_pops_builder import PoPsChromaBuilder  # noqa: E402
+from pipeline.metadata_schema import EMBEDDING_NORMALIZATION_KEY  # noqa: E402
+from pipeline.ollama_async import EMBEDDING_NORMALIZATION  # noqa: E402
+from pipeline.vectorstores import collection_metadata, uses_legacy_metadata  # noqa: E402
+
+
+class UnitEmbeddings:
+    normalization = EMBEDDING_NORMALIZATION
+
+    def embed_documents(self, texts):
+        return [[1.0, 0.0] for _ in texts]
+
+    def embed_query(self, text):
+        return [1.0, 0.0]
+
+
+def test_built_collection_is_canonical(tmp_path):
+    pops_dir = tmp_path / "pops"
+    (pops_dir / "Punjab").mkdir(parents=True)
+    (pops_dir / "Punjab" / "wheat.md").write_text("# Wheat\nSow in the first fortnight of November.\n")
+    chroma_dir = tmp_path / "chroma"
+
+    builder = PoPsChromaBuilder(str(chroma_dir), str(pops_dir))
+    builder.embeddings = UnitEmbeddings()
+    assert builder.build_collection()
+
+    store = Chroma(
+        collection_name=builder.collection_name,
+        persist_directory=str(chroma_dir),
+        embedding_function=builder.embeddings,
+    )
+    metadata = collection_metadata(store)
+    assert not uses_legacy_metadata(store)
+    assert metadata[EMBEDDING_NORMALIZATION_KEY] == EMBEDDING_NORMALIZATION
+    assert metadata["hnsw:space"] == "l2"
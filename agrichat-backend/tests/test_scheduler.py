@@ -0,0 +1,78 @@
+"""LLM admission: a clarification already in flight never keeps an answer waiting."""
+
+import asyncio
+import threading
+import time
+
+from pipeline.scheduler import ANSWER, CLARIFICATION, INTENT, LLMScheduler
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_answer_is_admitted_beside_a_clarification_in_flight():
+    scheduler = LLMScheduler(max_concurrency=2, max_queue=4, queue_timeout=2)
+    second_clarification = threading.Event()
+
+    def clarify():
+        with scheduler.slot(CLARIFICATION):
+            second_clarification.set()
+
+    with scheduler.slot(CLARIFICATION):
+        waiting = threading.Thread(target=clarify)
+        waiting.start()
+        _wait_for(lambda: scheduler.stats()["waiting"] == 1)
+
+        async def answer():
+            async with scheduler.aslot(ANSWER):
+                return scheduler.stats()
+
+        stats = asyncio.run(asyncio.wait_for(answer(), 0.5))
+        assert stats["active"] == 2
+        assert stats["waiting"] == 1
+        assert not second_clarification.is_set()
+
+    waiting.join(2)
+    assert second_clarification.is_set()
+    assert scheduler.stats()["active"] == 0
+
+
+def test_single_slot_is_left_to_answers_and_intent_checks():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=4, queue_timeout=2)
+
+    with scheduler.slot(CLARIFICATION):
+        with scheduler.slot(ANSWER):
+            assert scheduler.stats()["active"] == 1
+        with scheduler.slot(INTENT):
+            assert scheduler.stats()["active"] == 1
+
+    stats = scheduler.stats()
+    assert stats["ungated"] == 1
+    assert stats["by_priority"]["answer"]["admitted"] == 1
+    assert stats["by_priority"]["clarification"]["admitted"] == 0
+
+
+def test_waiting_answer_is_granted_before_waiting_intent():
+    scheduler = LLMScheduler(max_concurrency=2, max_queue=4, queue_timeout=2)
+    order = []
+
+    def call(priority, name):
+        with scheduler.slot(priority):
+            order.append(name)
+
+    with scheduler.slot(ANSWER):
+        with scheduler.slot(INTENT):
+            intent = threading.Thread(target=call, args=(INTENT, "intent"))
+            intent.start()
+            _wait_for(lambda: scheduler.stats()["waiting"] == 1)
+            answer = threading.Thread(target=call, args=(ANSWER, "answer"))
+            answer.start()
+            _wait_for(lambda: scheduler.stats()["waiting"] == 2)
+        answer.join(2)
+        intent.join(2)
+
+    assert order == ["answer", "intent"]
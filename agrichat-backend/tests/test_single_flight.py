@@ -0,0 +1,38 @@
+"""Late clarifications are only promised to requests that can receive them."""
+
+import asyncio
+
+from app_core.pipeline_service import SingleFlight
+
+
+def _factory(seen):
+    async def factory(token_callback, clarifications_callback):
+        seen.append(clarifications_callback)
+        await asyncio.sleep(0.01)
+        return {"answer": "ok", "metadata": {"clarifications_pending": clarifications_callback is not None}}
+
+    return factory
+
+
+def test_json_request_gets_no_clarification_callback():
+    seen = []
+    result = asyncio.run(SingleFlight().run("key", _factory(seen)))
+    assert seen == [None]
+    assert "clarifications_pending" not in result["metadata"]
+
+
+def test_stream_request_gets_callback_and_json_joiner_drops_pending_flag():
+    seen = []
+    flights = SingleFlight()
+    received = []
+
+    async def both():
+        stream = asyncio.create_task(flights.run("key", _factory(seen), lambda delta: None, received.append))
+        await asyncio.sleep(0)
+        joined = await flights.run("key", _factory(seen))
+        return await stream, joined
+
+    streamed, joined = asyncio.run(both())
+    assert len(seen) == 1 and seen[0] is not None
+    assert streamed["metadata"]["clarifications_pending"] is True
+    assert "clarifications_pending" not in joined["metadata"]
@@ -0,0 +1,63 @@
+"""The streaming sanitizer must emit exactly what the batch sanitizer returns, however tokens are split."""
+
+import random
+
+import pytest
+
+from pipeline.llm import LLMResponder
+
+FRAGMENTS = [
+    "a",
+    "wheat",
+    " ",
+    "\t",
+    "\n",
+    "\n\n",
+    "  \n",
+    "\r",
+    "\r\n",
+    "\x0b",
+    "\x85",
+    "sow in November",
+    "We need to answer: ",
+    "we should answer",
+    "Task: ",
+    "analysis:",
+    "They want",
+    "let's provide",
+    "**Irrigation**",
+    "1. Apply urea",
+    "- spray neem oil",
+    "नमस्ते",
+]
+
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 40)))
+
+
+def _random_chunks(rng: random.Random, text: str) -> list:
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 12))))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_streamed_deltas_match_batch_sanitizer(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        text = _random_text(rng)
+        chunks = _random_chunks(rng, text)
+        sanitizer = LLMResponder._stream_sanitizer()
+        deltas = [sanitizer.feed(chunk) for chunk in chunks]
+        deltas.append(sanitizer.finish())
+
+        expected = LLMResponder._sanitize_output(text)
+        assert "".join(deltas) == expected, (text, chunks)
+        assert sanitizer.text == expected
+
+
+def test_single_character_tokens():
+    text = "We need to answer: sowing\r\n\r\nSow wheat\x85in November.\x0b\n\n\nUse certified seed.\r"
+    sanitizer = LLMResponder._stream_sanitizer()
+    streamed = "".join(sanitizer.feed(char) for char in text) + sanitizer.finish()
+    assert streamed == LLMResponder._sanitize_output(text)
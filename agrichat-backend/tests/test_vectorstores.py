@@ -0,0 +1,43 @@
+"""Collections whose stored vectors are not normalized like the queries are not served."""
+
+import chromadb
+
+from pipeline.config import PipelineConfig
+from pipeline.metadata_schema import collection_markers
+from pipeline.ollama_async import EMBEDDING_NORMALIZATION
+from pipeline.retrievers import GoldenRetriever, PopsRetriever
+from pipeline.vectorstores import VectorStores
+
+
+def _collection(path, name, metadata):
+    client = chromadb.PersistentClient(path=str(path))
+    collection = client.create_collection(name, metadata=metadata)
+    collection.add(
+        ids=["doc-1"],
+        embeddings=[[3.0, 4.0]],
+        documents=["Sow wheat in November."],
+        metadatas=[{"state": "punjab"}],
+    )
+
+
+def test_unnormalized_collections_are_refused(tmp_path):
+    _collection(tmp_path, "langchain", {"hnsw:space": "l2"})
+    _collection(tmp_path, "package_of_practices", {"hnsw:space": "l2"})
+
+    stores = VectorStores(str(tmp_path))
+    assert stores.golden is None
+    assert stores.pops is None
+
+    config = PipelineConfig()
+    assert GoldenRetriever(stores.golden, config).search("When to sow wheat?", ["Punjab"]) == []
+    assert not PopsRetriever(stores.pops, config).available()
+
+
+def test_migrated_collections_are_served(tmp_path):
+    markers = {"hnsw:space": "l2", **collection_markers(EMBEDDING_NORMALIZATION)}
+    _collection(tmp_path, "langchain", markers)
+    _collection(tmp_path, "package_of_practices", markers)
+
+    stores = VectorStores(str(tmp_path))
+    assert stores.golden is not None
+    assert stores.pops is not None
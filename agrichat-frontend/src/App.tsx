@@ -13,6 +13,7 @@ import type {
   DatabaseToggleConfig,
   SessionDocument,
   SessionMessage,
+  SessionSummary,
   ThinkingStreamEvent,
 } from "./types/chat";
 import { DEFAULT_LANGUAGE, DEFAULT_STATE } from "./config";
@@ -34,17 +35,30 @@ interface StreamingDraft {
   question: string;
   thinking?: string;
   answer?: string;
+  queuePosition?: number;
 }
 
-function mergeSessionLists(newSession: SessionDocument, sessions: SessionDocument[]): SessionDocument[] {
+function summarizeSession(session: SessionDocument): SessionSummary {
+  return {
+    session_id: session.session_id,
+    title: session.title ?? session.messages[0]?.question,
+    created_at: session.created_at,
+    timestamp: session.timestamp,
+    status: session.status,
+    has_unread: session.has_unread,
+  };
+}
+
+function mergeSessionLists(newSession: SessionDocument, sessions: SessionSummary[]): SessionSummary[] {
   const filtered = sessions.filter((item) => item.session_id !== newSession.session_id);
-  return [newSession, ...filtered].slice(0, 50);
+  return [summarizeSession(newSession), ...filtered];
 }
 
 function App() {
   // Core state
   const [deviceId] = useState(() => ensureDeviceId());
-  const [sessions, setSessions] = useState<SessionDocument[]>([]);
+  const [sessions, setSessions] = useState<SessionSummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [currentSession, setCurrentSession] = useState<SessionDocument | null>(null);
   const [selectedSessionId, setSelectedSessionId] = useState<string | null>(null);
   const [isNewChatMode, setIsNewChatMode] = useState(false);
@@ -135,12 +149,30 @@ function App() {
     try {
       const data = await fetchSessions(deviceId);
       setSessions(data.sessions);
+      setNextCursor(data.next_cursor ?? null);
     } catch (err) {
       console.error(err);
       setError((err as Error).message ?? "Failed to fetch sessions");
     }
   }, [deviceId]);
 
+  const loadMoreSessions = useCallback(async () => {
+    if (!nextCursor) {
+      return;
+    }
+    try {
+      const data = await fetchSessions(deviceId, nextCursor);
+      setSessions((prev) => {
+        const known = new Set(prev.map((item) => item.session_id));
+        return [...prev, ...data.sessions.filter((item) => !known.has(item.session_id))];
+      });
+      setNextCursor(data.next_cursor ?? null);
+    } catch (err) {
+      console.error(err);
+      setError((err as Error).message ?? "Failed to fetch sessions");
+    }
+  }, [deviceId, nextCursor]);
+
   useEffect(() => {
     void loadSessions();
   }, [loadSessions]);
@@ -187,6 +219,15 @@ function App() {
         case "thinking_complete":
           setStreamDraft((prev) => (prev ? { ...prev, thinking: event.thinking ?? prev.thinking } : prev));
           break;
+        case "queue":
+          setStreamDraft((prev) => (prev ? { ...prev, queuePosition: event.position } : prev));
+          break;
+        case "answer_start":
+          setStreamDraft((prev) => (prev ? { ...prev, answer: "", queuePosition: 0 } : prev));
+          break;
+        case "answer_delta":
+          setStreamDraft((prev) => (prev ? { ...prev, answer: (prev.answer ?? "") + event.delta } : prev));
+          break;
         case "answer":
           setStreamDraft((prev) => (prev ? { ...prev, answer: event.answer } : prev));
           break;
@@ -198,6 +239,15 @@ function App() {
           setQuestion("");
           setIsSending(false);
           break;
+        case "clarifications":
+          setCurrentSession((prev) => {
+            if (!prev || prev.messages.length === 0) return prev;
+            const messages = [...prev.messages];
+            const lastIndex = messages.length - 1;
+            messages[lastIndex] = { ...messages[lastIndex], clarifying_questions: event.clarifications };
+            return { ...prev, messages };
+          });
+          break;
         case "error":
           setError(event.message);
           setIsSending(false);
@@ -257,10 +307,17 @@ function App() {
 
   useEffect(() => {
     if (!selectedSessionId && sessions.length > 0 && !isNewChatMode) {
-      setSelectedSessionId(sessions[0].session_id);
-      setCurrentSession(sessions[0]);
+      // The list only carries summaries; the messages are fetched for the session that is shown.
+      const sessionId = sessions[0].session_id;
+      setSelectedSessionId(sessionId);
+      fetchSession(sessionId, deviceId)
+        .then((response) => setCurrentSession(response.session))
+        .catch((err) => {
+          console.error(err);
+          setError((err as Error).message ?? "Failed to load session");
+        });
     }
-  }, [selectedSessionId, sessions, isNewChatMode]);
+  }, [deviceId, selectedSessionId, sessions, isNewChatMode]);
 
   const messages: SessionMessage[] = currentSession?.messages ?? [];
 
@@ -417,7 +474,7 @@ function App() {
                     <MessageSquare className="h-4 w-4 mt-0.5 flex-shrink-0" />
                     <div className="min-w-0 flex-1">
                       <p className="truncate text-sm font-medium">
-                        {session.messages[0]?.question || "New Chat"}
+                        {session.title || "New Chat"}
                       </p>
                       <p className="text-xs text-gray-500 group-hover:text-gray-400">
                         {new Date(session.timestamp).toLocaleDateString()}
@@ -439,6 +496,14 @@ function App() {
                 </button>
               </div>
             ))}
+            {nextCursor && (
+              <button
+                onClick={() => void loadMoreSessions()}
+                className="w-full p-3 text-center text-sm rounded-lg text-gray-400 hover:bg-gray-700 hover:text-white transition-colors"
+              >
+                Load more
+              </button>
+            )}
           </div>
         </div>
       </div>
@@ -578,6 +643,7 @@ function App() {
               question={streamDraft.question} 
               thinking={streamDraft.thinking} 
               answer={streamDraft.answer} 
+              queuePosition={streamDraft.queuePosition}
             />
           )}
         </div>
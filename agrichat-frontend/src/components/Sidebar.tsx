@@ -1,14 +1,16 @@
 import clsx from "clsx";
-import type { SessionDocument } from "../types/chat";
+import type { SessionSummary } from "../types/chat";
 
 interface SidebarProps {
-  sessions: SessionDocument[];
+  sessions: SessionSummary[];
   currentSessionId?: string;
+  hasMore?: boolean;
   onSelectSession: (sessionId: string) => void;
   onNewChat: () => void;
+  onLoadMore?: () => void;
 }
 
-export function Sidebar({ sessions, currentSessionId, onSelectSession, onNewChat }: SidebarProps) {
+export function Sidebar({ sessions, currentSessionId, hasMore, onSelectSession, onNewChat, onLoadMore }: SidebarProps) {
   return (
     <aside className="sidebar">
       <div className="sidebar__header">
@@ -20,8 +22,7 @@ export function Sidebar({ sessions, currentSessionId, onSelectSession, onNewChat
       <div className="sidebar__list">
         {sessions.length === 0 && <p className="muted">No sessions yet. Start a new conversation!</p>}
         {sessions.map((session) => {
-          const lastMessage = session.messages.at(-1);
-          const preview = lastMessage?.question ?? "New conversation";
+          const preview = session.title || "New conversation";
           return (
             <button
               key={session.session_id}
@@ -40,6 +41,11 @@ export function Sidebar({ sessions, currentSessionId, onSelectSession, onNewChat
             </button>
           );
         })}
+        {hasMore && onLoadMore && (
+          <button className="sidebar__item" onClick={onLoadMore} type="button">
+            Load more
+          </button>
+        )}
       </div>
     </aside>
   );
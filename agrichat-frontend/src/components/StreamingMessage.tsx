@@ -2,9 +2,10 @@ interface StreamingMessageProps {
   question: string;
   thinking?: string;
   answer?: string;
+  queuePosition?: number;
 }
 
-export function StreamingMessage({ question, thinking, answer }: StreamingMessageProps) {
+export function StreamingMessage({ question, thinking, answer, queuePosition }: StreamingMessageProps) {
   return (
     <div className="space-y-4 animate-fade-in">
       {/* User Message */}
@@ -40,7 +41,9 @@ export function StreamingMessage({ question, thinking, answer }: StreamingMessag
                   <div className="typing-dot" style={{ animationDelay: '150ms' }}></div>
                   <div className="typing-dot" style={{ animationDelay: '300ms' }}></div>
                 </div>
-                <span className="text-sm">AgriChat is thinking...</span>
+                <span className="text-sm">
+                  {queuePosition ? `Waiting for a free slot (#${queuePosition} in queue)...` : "AgriChat is thinking..."}
+                </span>
               </div>
             )}
           </div>
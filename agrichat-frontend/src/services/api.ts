@@ -53,8 +53,9 @@ async function handleResponse<T>(response: Response): Promise<T> {
   }
 }
 
-export async function fetchSessions(deviceId: string): Promise<SessionListResponse> {
-  const response = await fetch(SESSIONS_ENDPOINT, {
+export async function fetchSessions(deviceId: string, cursor?: string | null): Promise<SessionListResponse> {
+  const url = cursor ? `${SESSIONS_ENDPOINT}?cursor=${encodeURIComponent(cursor)}` : SESSIONS_ENDPOINT;
+  const response = await fetch(url, {
     headers: {
       "X-Device-Id": deviceId,
     },
@@ -43,6 +43,8 @@ export interface SessionMessage {
 
 export interface SessionDocument {
   session_id: string;
+  title?: string;
+  created_at?: string;
   timestamp: string;
   status: "active" | "archived" | string;
   messages: SessionMessage[];
@@ -60,8 +62,18 @@ export interface Recommendation {
   link?: string;
 }
 
+export interface SessionSummary {
+  session_id: string;
+  title?: string;
+  created_at?: string;
+  timestamp: string;
+  status: "active" | "archived" | string;
+  has_unread?: boolean;
+}
+
 export interface SessionListResponse {
-  sessions: SessionDocument[];
+  sessions: SessionSummary[];
+  next_cursor?: string | null;
 }
 
 export interface SessionResponse {
@@ -86,6 +98,25 @@ export interface ThinkingCompleteEvent extends StreamingEventBase {
   thinking?: string;
 }
 
+export interface AnswerStartEvent extends StreamingEventBase {
+  type: "answer_start";
+}
+
+export interface AnswerDeltaEvent extends StreamingEventBase {
+  type: "answer_delta";
+  delta: string;
+}
+
+export interface ClarificationsEvent extends StreamingEventBase {
+  type: "clarifications";
+  clarifications: string[];
+}
+
+export interface QueueEvent extends StreamingEventBase {
+  type: "queue";
+  position: number;
+}
+
 export interface AnswerEvent extends StreamingEventBase {
   type: "answer";
   answer: string;
@@ -110,13 +141,19 @@ export interface StreamEndEvent extends StreamingEventBase {
 export interface ErrorEvent extends StreamingEventBase {
   type: "error";
   message: string;
+  status?: number;
+  retry_after?: number;
 }
 
 export type ThinkingStreamEvent =
   | ThinkingStartEvent
   | ThinkingTokenEvent
   | ThinkingCompleteEvent
+  | AnswerStartEvent
+  | AnswerDeltaEvent
   | AnswerEvent
+  | ClarificationsEvent
+  | QueueEvent
   | SessionCompleteEvent
   | StreamEndEvent
   | ErrorEvent;
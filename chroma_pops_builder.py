@@ -19,6 +19,8 @@ import chromadb
 # Add the backend directory to the path to import local modules
 sys.path.append('/home/ubuntu/agrichat-annam/agrichat-backend')
 from pipeline.llm_adapter import local_embeddings
+from pipeline.lexical import build_lexical_index, lexical_index_path
+from pipeline.metadata_schema import DOC_TYPE_POPS, canonicalize_metadata, collection_markers
 
 
 logger = logging.getLogger(__name__)
@@ -176,12 +178,16 @@ class PoPsChromaBuilder:
                         
                         doc = Document(
                             page_content=content_with_source,
-                            metadata={
-                                'state': state,
-                                'name': name,
-                                'source_file': relative_path,
-                                'content_type': 'package_of_practices'
-                            }
+                            metadata=canonicalize_metadata(
+                                {
+                                    'state': state,
+                                    'name': name,
+                                    'source_file': relative_path,
+                                    'content_type': 'package_of_practices'
+                                },
+                                content_with_source,
+                                DOC_TYPE_POPS,
+                            )
                         )
                         documents.append(doc)
                         processed_files += 1
@@ -222,16 +228,29 @@ class PoPsChromaBuilder:
             
             print(f"\nBuilding ChromaDB collection '{self.collection_name}' with {len(documents)} documents...")
             
+            # Stamp the markers the migration would set, so the retrievers treat the fresh collection as canonical
+            collection_metadata = {
+                "hnsw:space": "l2",
+                **collection_markers(getattr(self.embeddings, "normalization", None)),
+            }
             vectorstore = Chroma.from_documents(
                 documents=documents,
                 embedding=self.embeddings,
                 collection_name=self.collection_name,
-                persist_directory=self.chroma_path
+                persist_directory=self.chroma_path,
+                collection_metadata=collection_metadata,
             )
             
             # Persist the collection
             vectorstore.persist()
             
+            # Keep the BM25 index in step with the collection it was built from
+            lexical_summary = build_lexical_index(
+                vectorstore._collection,
+                lexical_index_path(self.collection_name, self.chroma_path),
+            )
+            print(f"Built lexical index with {lexical_summary['terms']} terms at {lexical_summary['path']}")
+            
             print(f"✅ Successfully created collection '{self.collection_name}' with {len(documents)} documents")
             return True
             